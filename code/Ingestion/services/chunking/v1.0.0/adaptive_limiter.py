@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Adaptive Concurrency Limiter v1.0.0
+AIMD (additive increase / multiplicative decrease) limiter for downstream fan-out
+
+The limit grows by ~1 per round-trip while calls succeed, latency stays near
+the best observed latency and few recent calls failed, and is cut
+multiplicatively when the downstream signals overload (HTTP 429/503, timeouts). Used by the orchestrator to pace
+per-chunk metadata requests instead of firing them all at once.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+
+class Overloaded(Exception):
+    """Raised inside a limiter slot when the downstream signals overload (429/503/timeout)"""
+    pass
+
+
+class CallFailed(Exception):
+    """Raised inside a limiter slot when the downstream call failed for any other reason"""
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable  # False for client errors (4xx) that a retry cannot fix
+
+
+class ConcurrencyMeter:
+    """Tracks in-flight calls of one request (peak and time-weighted average)"""
+
+    def __init__(self):
+        self.inflight = 0
+        self.peak = 0
+        self.calls = 0
+        self._area = 0.0
+        self._busy = 0.0
+        self._last = time.monotonic()
+
+    def _advance(self):
+        now = time.monotonic()
+        elapsed = now - self._last
+        if self.inflight:
+            self._area += self.inflight * elapsed
+            self._busy += elapsed
+        self._last = now
+
+    def enter(self):
+        self._advance()
+        self.inflight += 1
+        self.calls += 1
+        self.peak = max(self.peak, self.inflight)
+
+    def exit(self):
+        self._advance()
+        self.inflight -= 1
+
+    @property
+    def effective(self) -> float:
+        """Average in-flight calls while at least one call was running"""
+        self._advance()
+        return self._area / self._busy if self._busy else 0.0
+
+
+class _Slot:
+    """Async context manager for one limited call; the outcome is derived from the exception"""
+
+    def __init__(self, limiter: "AdaptiveLimiter", meter: Optional[ConcurrencyMeter]):
+        self._limiter = limiter
+        self._meter = meter
+        self._start = 0.0
+
+    async def __aenter__(self):
+        await self._limiter._acquire()
+        if self._meter:
+            self._meter.enter()
+        self._start = time.monotonic()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        latency = time.monotonic() - self._start
+        if self._meter:
+            self._meter.exit()
+        if exc_type is None:
+            outcome = "success"
+        elif issubclass(exc_type, (Overloaded, asyncio.TimeoutError)):
+            outcome = "overload"
+        else:
+            outcome = "error"
+        await self._limiter._release(outcome, latency)
+        return False
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit shared by all requests of the process"""
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int = 16,
+        min_limit: int = 1,
+        max_limit: int = 128,
+        latency_tolerance: float = 2.0,
+        backoff_factor: float = 0.5,
+        max_error_rate: float = 0.1
+    ):
+        """
+        Initialize limiter
+
+        Args:
+            name: Limiter name (used in stats/logging)
+            initial_limit: Starting concurrency
+            min_limit: Lower bound for the limit
+            max_limit: Upper bound for the limit
+            latency_tolerance: Grow only while latency <= tolerance x best observed latency
+            backoff_factor: Multiplier applied to the limit on overload
+            max_error_rate: Grow only while the recent error rate (moving average) is <= this
+        """
+        self.name = name
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+        self.backoff_factor = backoff_factor
+        self.max_error_rate = max_error_rate
+
+        self._inflight = 0
+        self._cond: Optional[asyncio.Condition] = None
+        self._min_latency: Optional[float] = None
+        self._avg_latency: Optional[float] = None
+        self._last_decrease = 0.0
+        self._error_rate = 0.0
+
+        # Stats
+        self.successes = 0
+        self.overloads = 0
+        self.errors = 0
+        self.decreases = 0
+
+    def slot(self, meter: Optional[ConcurrencyMeter] = None) -> _Slot:
+        """
+        Reserve a slot for one downstream call
+
+        Usage:
+            async with limiter.slot(meter):
+                response = await call()  # raise Overloaded on 429/503, CallFailed on other errors
+        """
+        return _Slot(self, meter)
+
+    def _condition(self) -> asyncio.Condition:
+        # Created lazily so the limiter can be instantiated at import time
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        return self._cond
+
+    async def _acquire(self):
+        cond = self._condition()
+        async with cond:
+            await cond.wait_for(lambda: self._inflight < max(int(self.limit), self.min_limit))
+            self._inflight += 1
+
+    async def _release(self, outcome: str, latency: float):
+        cond = self._condition()
+        async with cond:
+            self._inflight -= 1
+            self._record(outcome, latency)
+            cond.notify_all()
+
+    def _record(self, outcome: str, latency: float):
+        now = time.monotonic()
+
+        if outcome == "overload":
+            self.overloads += 1
+            # Cut at most once per round-trip so one burst of 429s counts as one congestion event
+            if now - self._last_decrease >= (self._avg_latency or 0.0):
+                self.limit = max(float(self.min_limit), self.limit * self.backoff_factor)
+                self._last_decrease = now
+                self.decreases += 1
+            return
+
+        if outcome == "error":
+            self.errors += 1
+            self._error_rate = 0.9 * self._error_rate + 0.1
+            return
+
+        self.successes += 1
+        self._error_rate *= 0.9
+        self._avg_latency = latency if self._avg_latency is None else 0.9 * self._avg_latency + 0.1 * latency
+        if self._min_latency is None or latency < self._min_latency:
+            self._min_latency = latency
+        else:
+            # Let the baseline drift up slowly so one lucky fast call doesn't freeze growth forever
+            self._min_latency += (latency - self._min_latency) * 0.01
+
+        if latency <= self._min_latency * self.latency_tolerance and self._error_rate <= self.max_error_rate:
+            # +1 per limit completions ≈ +1 per round-trip
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get limiter statistics"""
+        return {
+            "name": self.name,
+            "limit": round(self.limit, 2),
+            "inflight": self._inflight,
+            "min_latency_ms": round(self._min_latency * 1000, 1) if self._min_latency else None,
+            "avg_latency_ms": round(self._avg_latency * 1000, 1) if self._avg_latency else None,
+            "successes": self.successes,
+            "overloads": self.overloads,
+            "errors": self.errors,
+            "error_rate": round(self._error_rate, 3),
+            "decreases": self.decreases
+        }
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Chunking Benchmark v1.0.0
+Compares the LangChain recursive splitter with the native single-pass chunker
+
+Runs both chunkers over every markdown file in TestingDocuments and reports:
+- throughput (MB/s) and chunk counts
+- peak traced memory and allocated blocks still held after chunking (tracemalloc)
+- offset accuracy (text[start_char:end_char] == chunk text)
+
+Usage:
+  python benchmark_chunking.py
+  python benchmark_chunking.py --max-chunk-size 800 --chunk-overlap 200
+  python benchmark_chunking.py --corpus ../../../../TestingDocuments --repeat 5
+
+Author: CrawlEnginePro
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from chunking_engine import native_chunk_spans, perform_chunking, locate_chunks, is_valid_chunk
+
+DEFAULT_CORPUS = Path(__file__).resolve().parents[4] / "TestingDocuments"
+
+
+def langchain_recursive(text: str, max_chunk_size: int, chunk_overlap: int) -> List[Tuple[int, int, str]]:
+    chunks = perform_chunking(text, {
+        "method": "recursive",
+        "max_chunk_size": max_chunk_size,
+        "chunk_overlap": chunk_overlap,
+        "encoding": "cl100k_base"
+    })
+    return [(start, end, chunk) for chunk, (start, end) in zip(chunks, locate_chunks(text, chunks))]
+
+
+def native(text: str, max_chunk_size: int, chunk_overlap: int) -> List[Tuple[int, int, str]]:
+    return [(start, end, text[start:end]) for start, end in native_chunk_spans(text, max_chunk_size, chunk_overlap)]
+
+
+def run(name: str, chunker: Callable, documents: List[str], max_chunk_size: int, chunk_overlap: int, repeat: int) -> Dict[str, Any]:
+    total_bytes = sum(len(doc.encode("utf-8")) for doc in documents)
+
+    # Throughput (best of N, no tracing overhead)
+    best = float("inf")
+    results = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        results = [chunker(doc, max_chunk_size, chunk_overlap) for doc in documents]
+        best = min(best, time.perf_counter() - start)
+
+    # Memory (single traced run)
+    del results
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    results = [chunker(doc, max_chunk_size, chunk_overlap) for doc in documents]
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename") if stat.count_diff > 0)
+
+    chunks = [chunk for doc_chunks in results for chunk in doc_chunks]
+    exact = sum(
+        1 for doc, doc_chunks in zip(documents, results)
+        for start, end, chunk in doc_chunks if doc[start:end] == chunk
+    )
+    sizes = [len(chunk) for _, _, chunk in chunks]
+
+    return {
+        "name": name,
+        "seconds": best,
+        "mb_per_s": total_bytes / best / 1_000_000 if best else 0.0,
+        "chunks": len(chunks),
+        "avg_chunk": sum(sizes) / len(sizes) if sizes else 0,
+        "max_chunk": max(sizes) if sizes else 0,
+        "invalid": sum(1 for _, _, chunk in chunks if not is_valid_chunk(chunk)),
+        "peak_mb": peak / 1_000_000,
+        "blocks": blocks,
+        "offsets_exact": exact / len(chunks) * 100 if chunks else 100.0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LangChain recursive vs native chunker")
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS, help="Directory of .md documents")
+    parser.add_argument("--max-chunk-size", type=int, default=1000)
+    parser.add_argument("--chunk-overlap", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=3, help="Timing runs per chunker (best is reported)")
+    args = parser.parse_args()
+
+    paths = sorted(args.corpus.rglob("*.md"))
+    documents = [path.read_text(encoding="utf-8") for path in paths]
+    total_mb = sum(len(doc.encode("utf-8")) for doc in documents) / 1_000_000
+    print(f"Corpus: {args.corpus} ({len(documents)} documents, {total_mb:.2f} MB)")
+    print(f"Params: max_chunk_size={args.max_chunk_size}, chunk_overlap={args.chunk_overlap}, repeat={args.repeat}")
+    print()
+
+    rows = [
+        run("langchain-recursive", langchain_recursive, documents, args.max_chunk_size, args.chunk_overlap, args.repeat),
+        run("native", native, documents, args.max_chunk_size, args.chunk_overlap, args.repeat)
+    ]
+
+    header = f"{'chunker':<22}{'time(s)':>9}{'MB/s':>9}{'chunks':>9}{'avg':>8}{'max':>7}{'invalid':>9}{'peak MB':>9}{'blocks':>10}{'exact %':>9}"
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        print(
+            f"{row['name']:<22}{row['seconds']:>9.3f}{row['mb_per_s']:>9.2f}{row['chunks']:>9}"
+            f"{row['avg_chunk']:>8.0f}{row['max_chunk']:>7}{row['invalid']:>9}"
+            f"{row['peak_mb']:>9.2f}{row['blocks']:>10}{row['offsets_exact']:>9.1f}"
+        )
+
+    baseline, candidate = rows
+    print()
+    print(f"Speedup: {baseline['seconds'] / candidate['seconds']:.1f}x")
+    if baseline["peak_mb"]:
+        print(f"Peak memory: {candidate['peak_mb'] / baseline['peak_mb']:.2f}x of LangChain")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Stage Checkpoint Store v1.0.0
+SQLite persistence of orchestration stage outputs, keyed by request id
+
+The orchestrator saves chunks, each slice's metadata + vectors, and a marker
+for each slice it has stored. When a request fails (e.g. a storage insert
+error) and is retried with the same request id, completed stages are loaded
+instead of recomputed - no repeated LLM metadata calls or embeddings, and no
+duplicate inserts for slices that were already stored. Checkpoints are
+deleted once the request succeeds; abandoned ones expire after a TTL.
+"""
+
+import json
+import time
+from typing import Any, Dict, Optional
+
+from sqlite_store import SQLiteStore
+
+
+class CheckpointStore(SQLiteStore):
+    """SQLite checkpoint store (safe to share between asyncio tasks via threads)"""
+
+    def __init__(self, db_path: str, ttl_seconds: float = 86400.0):
+        """
+        Initialize store
+
+        Args:
+            db_path: Path to the SQLite database file (created if missing)
+            ttl_seconds: Checkpoints of requests not touched for this long are garbage-collected
+        """
+        self.ttl_seconds = ttl_seconds
+        super().__init__(db_path)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS requests (
+                request_id TEXT PRIMARY KEY,
+                fingerprint TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                request_id TEXT NOT NULL,
+                name TEXT NOT NULL,
+                data_json TEXT NOT NULL,
+                PRIMARY KEY (request_id, name)
+            );
+        """)
+
+        # Stats
+        self.resumed = 0
+        self.collected = 0
+
+    def begin(self, request_id: str, fingerprint: str) -> bool:
+        """
+        Open (or resume) the checkpoints of a request
+
+        Checkpoints saved under the same request id for a different request body
+        (fingerprint mismatch) are discarded.
+
+        Returns:
+            True if checkpoints from a previous attempt exist and will be reused
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fingerprint FROM requests WHERE request_id = ?", (request_id,)
+            ).fetchone()
+            if row is not None and row["fingerprint"] == fingerprint:
+                self._conn.execute("UPDATE requests SET updated_at = ? WHERE request_id = ?", (now, request_id))
+                resumed = self._conn.execute(
+                    "SELECT 1 FROM checkpoints WHERE request_id = ? LIMIT 1", (request_id,)
+                ).fetchone() is not None
+                if resumed:
+                    self.resumed += 1
+                return resumed
+            self._conn.execute("DELETE FROM checkpoints WHERE request_id = ?", (request_id,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO requests (request_id, fingerprint, created_at, updated_at) VALUES (?, ?, ?, ?)",
+                (request_id, fingerprint, now, now)
+            )
+        return False
+
+    def save(self, request_id: str, name: str, data: Any):
+        """Persist one stage output"""
+        payload = json.dumps(data)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (request_id, name, data_json) VALUES (?, ?, ?)",
+                (request_id, name, payload)
+            )
+            self._conn.execute("UPDATE requests SET updated_at = ? WHERE request_id = ?", (time.time(), request_id))
+
+    def load(self, request_id: str, name: str) -> Optional[Any]:
+        """Load one stage output (None if not checkpointed)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data_json FROM checkpoints WHERE request_id = ? AND name = ?",
+                (request_id, name)
+            ).fetchone()
+        return json.loads(row["data_json"]) if row else None
+
+    def clear(self, request_id: str):
+        """Drop all checkpoints of a request (after it succeeded)"""
+        with self._lock:
+            self._conn.execute("DELETE FROM checkpoints WHERE request_id = ?", (request_id,))
+            self._conn.execute("DELETE FROM requests WHERE request_id = ?", (request_id,))
+
+    def gc(self) -> int:
+        """Drop checkpoints of requests idle for longer than the TTL; returns requests removed"""
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            expired = [row["request_id"] for row in self._conn.execute(
+                "SELECT request_id FROM requests WHERE updated_at < ?", (cutoff,)
+            )]
+            for request_id in expired:
+                self._conn.execute("DELETE FROM checkpoints WHERE request_id = ?", (request_id,))
+                self._conn.execute("DELETE FROM requests WHERE request_id = ?", (request_id,))
+        self.collected += len(expired)
+        return len(expired)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get checkpoint statistics"""
+        with self._lock:
+            pending = self._conn.execute("SELECT COUNT(*) FROM requests").fetchone()[0]
+            checkpoints = self._conn.execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0]
+        return {
+            "pending_requests": pending,
+            "checkpoints": checkpoints,
+            "resumed": self.resumed,
+            "collected": self.collected,
+            "ttl_seconds": self.ttl_seconds
+        }
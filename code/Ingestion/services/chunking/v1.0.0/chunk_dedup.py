@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Exact Chunk Deduplication v1.0.0
+Hash normalized chunk text so identical chunks are computed once
+
+Boilerplate (license headers, repeated tables of contents, shared footers)
+produces byte-identical chunks within and across documents. The orchestrator
+sends only one chunk per normalized-text hash through metadata extraction and
+embeddings and copies the result to its duplicates. With the collection scope,
+hashes of stored chunks are also looked up in a per-tenant/collection index so
+chunks already in the collection reuse the stored metadata and vector.
+"""
+
+import hashlib
+import time
+import unicodedata
+from typing import Any, Dict, Iterable, List, Tuple
+
+from sqlite_store import SQLiteStore
+
+
+def normalize_chunk_text(text: str) -> str:
+    """Unicode NFC with whitespace runs collapsed and ends trimmed"""
+    return unicodedata.normalize("NFC", " ".join(text.split()))
+
+
+def chunk_text_hash(text: str) -> str:
+    """sha256 of the normalized chunk text"""
+    return hashlib.sha256(normalize_chunk_text(text).encode("utf-8")).hexdigest()
+
+
+def plan_dedup_slices(hashes: List[str], slice_size: int, reusable: Dict[str, str]) -> List[Dict[str, Any]]:
+    """
+    Group chunk indices into pipeline slices so each distinct hash is processed once
+
+    Args:
+        hashes: Normalized-text hash per chunk (in chunk order)
+        slice_size: Maximum chunks computed (sent to metadata/embeddings) per slice
+        reusable: hash -> id of an already stored chunk with that hash (collection scope)
+
+    Returns:
+        Slices as dicts:
+        - compute: indices to send through metadata/embeddings (first occurrence of each new hash)
+        - copies: [index, representative index] pairs for in-request duplicates
+        - reuse: [index, stored chunk id] pairs for chunks whose hash is already in the collection
+
+        Duplicates travel in the same slice as their representative, so slices
+        never wait on each other. Pairs (not int-keyed dicts) keep the plan
+        JSON round-trippable for checkpoints.
+    """
+    first_index: Dict[str, int] = {}
+    duplicates: Dict[int, List[int]] = {}
+    reuse_members: List[int] = []
+    for idx, digest in enumerate(hashes):
+        if digest in reusable:
+            reuse_members.append(idx)
+        elif digest in first_index:
+            duplicates.setdefault(first_index[digest], []).append(idx)
+        else:
+            first_index[digest] = idx
+
+    representatives = sorted(first_index.values())
+    slices = []
+    for start in range(0, len(representatives), slice_size):
+        compute = representatives[start:start + slice_size]
+        copies = [[dup, rep] for rep in compute for dup in duplicates.get(rep, [])]
+        slices.append({"compute": compute, "copies": copies, "reuse": []})
+    for start in range(0, len(reuse_members), slice_size):
+        members = reuse_members[start:start + slice_size]
+        slices.append({"compute": [], "copies": [], "reuse": [[idx, reusable[hashes[idx]]] for idx in members]})
+    return slices
+
+
+class ChunkHashIndex(SQLiteStore):
+    """SQLite map of (tenant, collection, normalized-text hash) -> stored chunk id"""
+
+    def __init__(self, db_path: str):
+        """
+        Initialize index
+
+        Args:
+            db_path: Path to the SQLite database file (created if missing)
+        """
+        super().__init__(db_path)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS chunk_hashes (
+                tenant_id TEXT NOT NULL,
+                collection_name TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                chunk_id TEXT NOT NULL,
+                document_id TEXT,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (tenant_id, collection_name, content_hash)
+            );
+        """)
+
+    def lookup(self, tenant_id: str, collection_name: str, hashes: Iterable[str]) -> Dict[str, str]:
+        """hash -> stored chunk id for the hashes present in the collection"""
+        unique = list(set(hashes))
+        found: Dict[str, str] = {}
+        with self._lock:
+            # Stay well under SQLite's bound-parameter limit
+            for start in range(0, len(unique), 500):
+                batch = unique[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                for row in self._conn.execute(
+                    f"SELECT content_hash, chunk_id FROM chunk_hashes WHERE tenant_id = ? AND collection_name = ?"
+                    f" AND content_hash IN ({placeholders})",
+                    (tenant_id, collection_name, *batch)
+                ):
+                    found[row["content_hash"]] = row["chunk_id"]
+        return found
+
+    def record(self, tenant_id: str, collection_name: str, entries: List[Tuple[str, str, str]]):
+        """Register stored chunks as (hash, chunk_id, document_id); the first stored chunk per hash wins"""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO chunk_hashes (tenant_id, collection_name, content_hash, chunk_id, document_id, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                [(tenant_id, collection_name, digest, chunk_id, document_id, now) for digest, chunk_id, document_id in entries]
+            )
+
+    def forget_chunks(self, tenant_id: str, collection_name: str, chunk_ids: List[str]):
+        """Drop entries whose chunk is no longer in storage"""
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM chunk_hashes WHERE tenant_id = ? AND collection_name = ? AND chunk_id = ?",
+                [(tenant_id, collection_name, chunk_id) for chunk_id in chunk_ids]
+            )
@@ -0,0 +1,553 @@
+#!/usr/bin/env python3
+"""
+Chunking Engine v1.0.0
+CPU-bound text splitting and token counting for the Chunking Orchestrator
+
+Splitting a large document (LangChain splitters) and tokenizing every chunk is
+pure CPU work. Running it inside the async request handler blocks the event
+loop for every other request, so documents above a size threshold are chunked
+in a process pool whose workers keep warm tiktoken encoders. Small documents
+are chunked inline where the process hop would cost more than it saves.
+
+This module must stay importable without the service config (worker processes
+import it directly).
+"""
+
+import asyncio
+import time
+from bisect import bisect_left
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import tiktoken
+from langchain_text_splitters import (
+    RecursiveCharacterTextSplitter,
+    MarkdownHeaderTextSplitter,
+    TokenTextSplitter
+)
+
+from models import ChunkingMethod
+
+# Markdown-aware separators (non-regex version for compatibility)
+# Priority: Headers > Horizontal rules > Paragraphs > Lines > Words > Chars
+DEFAULT_SEPARATORS = [
+    '\n### ',    # H3 headers
+    '\n## ',     # H2 headers
+    '\n# ',      # H1 headers
+    '\n---\n',   # Horizontal rule (---) - Fixes section mixing!
+    '\n***\n',   # Horizontal rule (***)
+    '\n___\n',   # Horizontal rule (___)
+    '\n\n',      # Double newline (paragraphs)
+    '\n',        # Single newline
+    ' ',         # Space
+    ''           # Empty (character-by-character)
+]
+
+# ============================================================================
+# Tokenization
+# ============================================================================
+
+@lru_cache(maxsize=8)
+def get_encoding(encoding_name: str):
+    """Load a tiktoken encoding once per process"""
+    return tiktoken.get_encoding(encoding_name)
+
+def count_tokens(text: str, encoding_name: str = "cl100k_base") -> int:
+    """Count tokens using tiktoken"""
+    try:
+        return len(get_encoding(encoding_name).encode_ordinary(text))
+    except Exception:
+        return len(text) // 4
+
+def count_tokens_batch(texts: List[str], encoding_name: str = "cl100k_base") -> List[int]:
+    """Count tokens for many texts with one encoder lookup"""
+    try:
+        encoding = get_encoding(encoding_name)
+    except Exception:
+        return [len(text) // 4 for text in texts]
+    return [len(tokens) for tokens in encoding.encode_ordinary_batch(texts)]
+
+# ============================================================================
+# Splitting
+# ============================================================================
+
+def is_valid_chunk(chunk_text: str) -> bool:
+    """Check if chunk contains meaningful content"""
+    # Strip whitespace
+    stripped = chunk_text.strip()
+
+    # Empty or whitespace-only
+    if not stripped:
+        return False
+
+    # Just separator characters (---, ***, ___, etc.)
+    if all(c in '-*_ \t\n' for c in stripped):
+        return False
+
+    # Keep headers (start with #)
+    if stripped.startswith('#'):
+        return True
+
+    # Keep if has at least 5 alphanumeric characters (stop counting at 5)
+    alphanum_count = 0
+    for c in stripped:
+        if c.isalnum():
+            alphanum_count += 1
+            if alphanum_count >= 5:
+                return True
+
+    return False
+
+def perform_chunking(text: str, params: Dict[str, Any]) -> List[str]:
+    """
+    Chunk text using specified method
+
+    Args:
+        text: Document text
+        params: Chunking parameters (method, max_chunk_size, chunk_overlap,
+                separators, markdown_headers, encoding) - see chunking_params()
+    """
+    method = params["method"]
+    if method == ChunkingMethod.recursive:
+        splitter = RecursiveCharacterTextSplitter(
+            chunk_size=params["max_chunk_size"],
+            chunk_overlap=params["chunk_overlap"],
+            separators=params.get("separators") or DEFAULT_SEPARATORS
+        )
+
+    elif method == ChunkingMethod.markdown:
+        headers = params.get("markdown_headers") or ["#", "##", "###"]
+        splitter = MarkdownHeaderTextSplitter(
+            headers_to_split_on=[(h, h) for h in headers]
+        )
+
+    elif method == ChunkingMethod.token:
+        splitter = TokenTextSplitter(
+            chunk_size=params["max_chunk_size"],
+            chunk_overlap=params["chunk_overlap"],
+            encoding_name=params["encoding"]
+        )
+
+    else:
+        raise ValueError(f"Unsupported chunking method: {method}")
+
+    # Split text
+    if method == ChunkingMethod.markdown:
+        docs = splitter.split_text(text)
+        chunks = [doc.page_content if hasattr(doc, 'page_content') else str(doc) for doc in docs]
+    else:
+        chunks = splitter.split_text(text)
+
+    # Filter out invalid chunks (separators, empty, etc.)
+    chunks = [c for c in chunks if is_valid_chunk(c)]
+    return chunks
+
+def native_chunk_spans(text: str, max_chunk_size: int, chunk_overlap: int,
+                       separators: Optional[List[str]] = None) -> List[Tuple[int, int]]:
+    """
+    Single forward pass markdown-aware chunker with exact source offsets
+
+    Each chunk ends at the furthest break of the best priority level that fits
+    in max_chunk_size (same header > rule > paragraph > line > word order as the
+    recursive splitter), searched only inside the current window with C-level
+    str.rfind - no intermediate split lists or re-merging. Overlap only bridges
+    cuts inside a paragraph: it restarts at the first break inside the overlap
+    window and never reaches back across a paragraph, rule or header boundary.
+    Separator-only chunks are dropped as they are produced.
+
+    Returns:
+        List of (start_char, end_char) spans - text[start:end] is the chunk
+    """
+    separators = [sep for sep in (separators or DEFAULT_SEPARATORS) if sep]
+    chunk_overlap = min(chunk_overlap, max_chunk_size // 2)  # Guarantee forward progress
+    # Paragraph and higher-ranked separators are clean boundaries - overlap never crosses them
+    boundaries = separators[:separators.index('\n\n') + 1] if '\n\n' in separators else []
+    text_len = len(text)
+
+    spans = []
+    start = 0
+    previous_end = 0
+    while start < text_len:
+        # Skip leading whitespace (chunks are stripped, offsets stay exact)
+        while start < text_len and text[start].isspace():
+            start += 1
+        if start >= text_len:
+            break
+
+        limit = start + max_chunk_size
+        floor = max(start, previous_end)  # An overlapping chunk must still add new text
+        end_separator = None
+        if limit >= text_len:
+            end = text_len
+        else:
+            end = limit  # Character-level cut if no separator fits
+            for sep in separators:
+                pos = text.rfind(sep, floor + 1, limit + len(sep))
+                if pos > floor:
+                    end = pos
+                    end_separator = sep
+                    break
+
+        # Strip trailing whitespace
+        chunk_end = end
+        while chunk_end > start and text[chunk_end - 1].isspace():
+            chunk_end -= 1
+        if chunk_end > start and is_valid_chunk(text[start:chunk_end]):
+            spans.append((start, chunk_end))
+
+        if end >= text_len:
+            break
+        previous_end = end
+
+        # Next chunk starts at the first break inside the overlap window
+        next_start = end
+        if chunk_overlap > 0 and end_separator not in boundaries:
+            window_start = max(start + 1, end - chunk_overlap)
+            for sep in boundaries:
+                pos = text.rfind(sep, window_start, end)
+                if pos >= 0:
+                    window_start = pos + 1
+            for sep in separators:
+                pos = text.find(sep, window_start, end)
+                if 0 <= pos < next_start:
+                    next_start = pos
+        start = next_start
+
+    return spans
+
+def token_native_chunks(text: str, max_tokens: int, overlap_tokens: int, encoding_name: str,
+                        separators: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Token-budget chunker that tokenizes the document exactly once
+
+    The whole document is encoded once; chunks are cut on token offsets, with
+    the cut moved back to the best-ranked markdown/paragraph/line/word boundary
+    that fits in max_tokens (same priorities and overlap policy as
+    native_chunk_spans). token_count is the number of document tokens in the
+    chunk, so no later stage needs to re-tokenize.
+
+    Returns:
+        List of {"text", "start_char", "end_char", "token_count"}
+    """
+    separators = [sep for sep in (separators or DEFAULT_SEPARATORS) if sep]
+    overlap_tokens = min(overlap_tokens, max_tokens // 2)  # Guarantee forward progress
+    boundaries = separators[:separators.index('\n\n') + 1] if '\n\n' in separators else []
+
+    encoding = get_encoding(encoding_name)
+    tokens = encoding.encode_ordinary(text)
+    _, offsets = encoding.decode_with_offsets(tokens)  # Char index where each token starts
+    n_tokens = len(tokens)
+    offsets.append(len(text))  # Sentinel: offsets[n_tokens] == end of text
+
+    def _is_space(i: int) -> bool:
+        return text[offsets[i]:offsets[i + 1]].isspace()
+
+    records = []
+    start = 0
+    previous_end = 0
+    while start < n_tokens:
+        # Skip whitespace-only tokens
+        while start < n_tokens and _is_space(start):
+            start += 1
+        if start >= n_tokens:
+            break
+
+        limit = start + max_tokens
+        floor = max(start, previous_end)  # An overlapping chunk must still add new tokens
+        end_separator = None
+        if limit >= n_tokens:
+            end = n_tokens
+        else:
+            end = limit  # Token-level cut if no boundary fits
+            floor_char, limit_char = offsets[floor], offsets[limit]
+            for sep in separators:
+                pos = text.rfind(sep, floor_char + 1, limit_char + 1)
+                if pos > floor_char:
+                    boundary = bisect_left(offsets, pos, floor + 1, limit + 1)
+                    if floor < boundary <= limit:
+                        end = boundary
+                        end_separator = sep
+                        break
+
+        # Trim whitespace-only tokens, then whitespace inside the edge tokens
+        chunk_end = end
+        while chunk_end > start and _is_space(chunk_end - 1):
+            chunk_end -= 1
+        start_char, end_char = offsets[start], offsets[chunk_end]
+        while start_char < end_char and text[start_char].isspace():
+            start_char += 1
+        while end_char > start_char and text[end_char - 1].isspace():
+            end_char -= 1
+        chunk_text = text[start_char:end_char]
+        if chunk_text and is_valid_chunk(chunk_text):
+            records.append({
+                "text": chunk_text,
+                "start_char": start_char,
+                "end_char": end_char,
+                "token_count": chunk_end - start
+            })
+
+        if end >= n_tokens:
+            break
+        previous_end = end
+
+        # Next chunk starts at the first boundary inside the overlap window
+        next_start = end
+        if overlap_tokens > 0 and end_separator not in boundaries:
+            window_char = offsets[max(start + 1, end - overlap_tokens)]
+            end_char_pos = offsets[end]
+            for sep in boundaries:
+                pos = text.rfind(sep, window_char, end_char_pos)
+                if pos >= 0:
+                    window_char = pos + 1
+            for sep in separators:
+                pos = text.find(sep, window_char, end_char_pos)
+                if pos >= 0:
+                    candidate = bisect_left(offsets, pos, start + 1, end)
+                    if start < candidate < next_start:
+                        next_start = candidate
+        start = next_start
+
+    return records
+
+def locate_chunks(text: str, chunks: List[str]) -> List[Tuple[int, int]]:
+    """
+    Find source offsets for chunks produced by a splitter that returns plain strings
+
+    Searches forward from the previous chunk's start, so overlapping chunks and
+    repeated passages resolve to the right occurrence. Chunks the splitter
+    rewrote (e.g. markdown header stripping) fall back to the previous end.
+    """
+    spans = []
+    cursor = 0
+    previous_end = 0
+    for chunk in chunks:
+        pos = text.find(chunk, cursor)
+        if pos < 0:
+            pos = text.find(chunk)
+        if pos < 0:
+            spans.append((previous_end, previous_end + len(chunk)))
+            continue
+        spans.append((pos, pos + len(chunk)))
+        cursor = pos + 1
+        previous_end = pos + len(chunk)
+    return spans
+
+def chunking_params(request) -> Dict[str, Any]:
+    """Extract the (picklable) chunking parameters from an OrchestrationRequest"""
+    return {
+        "method": ChunkingMethod(request.method).value,
+        "max_chunk_size": request.max_chunk_size,
+        "chunk_overlap": request.chunk_overlap,
+        "separators": request.separators,
+        "markdown_headers": request.markdown_headers,
+        "encoding": request.encoding or "cl100k_base"
+    }
+
+def chunk_document(text: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Split a document and count tokens per chunk (runs inline or in a worker process)
+
+    Returns:
+        List of {"text", "start_char", "end_char", "token_count"}
+    """
+    if params["method"] == ChunkingMethod.token_native:
+        # Tokenized once inside the chunker - token counts come for free
+        return token_native_chunks(
+            text, params["max_chunk_size"], params["chunk_overlap"], params["encoding"], params.get("separators")
+        )
+
+    if params["method"] == ChunkingMethod.native:
+        spans = native_chunk_spans(text, params["max_chunk_size"], params["chunk_overlap"], params.get("separators"))
+        chunks = [text[start:end] for start, end in spans]
+    else:
+        chunks = perform_chunking(text, params)
+        spans = locate_chunks(text, chunks)
+
+    token_counts = count_tokens_batch(chunks, params["encoding"])
+    return [
+        {"text": chunk, "start_char": start, "end_char": end, "token_count": tokens}
+        for chunk, (start, end), tokens in zip(chunks, spans, token_counts)
+    ]
+
+def _init_worker(encodings: List[str]):
+    """Process pool initializer: load encoders before the first document arrives"""
+    for encoding_name in encodings:
+        try:
+            get_encoding(encoding_name)
+        except Exception as e:
+            print(f"⚠️  Chunking worker could not preload encoding '{encoding_name}': {e}")
+
+# ============================================================================
+# Engine
+# ============================================================================
+
+class ChunkingEngine:
+    """Runs chunking inline or in a warm process pool depending on document size"""
+
+    def __init__(self, workers: int, offload_threshold_chars: int, encodings: List[str], metrics_window: int = 1000):
+        """
+        Initialize engine
+
+        Args:
+            workers: Worker processes (0 = always chunk inline)
+            offload_threshold_chars: Documents at least this long are chunked in the pool
+            encodings: tiktoken encodings preloaded in every worker
+            metrics_window: Number of recent documents kept for timing percentiles
+        """
+        self.workers = workers
+        self.offload_threshold_chars = offload_threshold_chars
+        self.encodings = encodings
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._recent = deque(maxlen=metrics_window)
+
+        # Stats
+        self.documents_inline = 0
+        self.documents_offloaded = 0
+
+    def start(self):
+        """Start the worker pool (call from the service lifespan)"""
+        if self.workers > 0 and self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.encodings,)
+            )
+        # Warm the inline path too
+        _init_worker(self.encodings)
+
+    def shutdown(self):
+        """Stop the worker pool"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def chunk(self, text: str, params: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], float, bool]:
+        """
+        Chunk a document and count tokens per chunk
+
+        Returns:
+            (chunks, chunking_time_ms, offloaded) - see chunk_document() for the chunk layout
+        """
+        start = time.time()
+        offloaded = self._pool is not None and len(text) >= self.offload_threshold_chars
+        if offloaded:
+            loop = asyncio.get_running_loop()
+            chunks = await loop.run_in_executor(self._pool, chunk_document, text, params)
+            self.documents_offloaded += 1
+        else:
+            chunks = chunk_document(text, params)
+            self.documents_inline += 1
+
+        elapsed_ms = (time.time() - start) * 1000
+        self._recent.append((elapsed_ms, len(text), len(chunks), offloaded))
+        return chunks, elapsed_ms, offloaded
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-document chunking time metrics over the recent window"""
+        times = sorted(entry[0] for entry in self._recent)
+        total_chars = sum(entry[1] for entry in self._recent)
+
+        def _percentile(p: float) -> Optional[float]:
+            if not times:
+                return None
+            return round(times[min(len(times) - 1, int(p * len(times)))], 2)
+
+        return {
+            "workers": self.workers,
+            "offload_threshold_chars": self.offload_threshold_chars,
+            "documents_inline": self.documents_inline,
+            "documents_offloaded": self.documents_offloaded,
+            "window": len(times),
+            "chunking_time_ms": {
+                "p50": _percentile(0.50),
+                "p95": _percentile(0.95),
+                "p99": _percentile(0.99),
+                "max": round(times[-1], 2) if times else None
+            },
+            "chars_per_ms": round(total_chars / sum(times), 1) if times and sum(times) else None,
+            "chunks_recent": sum(entry[2] for entry in self._recent)
+        }
+
+# ============================================================================
+# Streaming
+# ============================================================================
+
+# Segment cut points, preferred first (headers, paragraphs, lines, words)
+STREAM_SEGMENT_BREAKS = ("\n#", "\n\n", "\n", " ")
+
+class StreamingChunker:
+    """
+    Chunks a document while it is still arriving
+
+    Text is fed in pieces; whenever about segment_chars have accumulated, the
+    buffer is cut at the best boundary in its second half and that segment is
+    chunked in the background (in the pool if it is large enough) while
+    feeding continues. finish() chunks the remainder and returns the chunks of
+    all segments in document order with document-level character offsets.
+
+    Chunks never span a segment cut, so chunks next to a cut can differ from
+    chunking the whole text at once.
+    """
+
+    def __init__(self, engine: ChunkingEngine, params: Dict[str, Any], segment_chars: int):
+        self.engine = engine
+        self.params = params
+        self.segment_chars = max(1, segment_chars)
+        self._buffer = ""
+        self._offset = 0  # Document offset of the buffer start
+        self._tasks: List[Tuple[int, asyncio.Task]] = []
+
+        # Stats
+        self.characters = 0
+        self.chunking_time_ms = 0.0
+
+    def feed(self, text: str):
+        """Add the next piece of the document"""
+        self._buffer += text
+        self.characters += len(text)
+        while len(self._buffer) >= self.segment_chars:
+            window = self._buffer[:self.segment_chars]
+            cut = self.segment_chars
+            for separator in STREAM_SEGMENT_BREAKS:
+                pos = window.rfind(separator, self.segment_chars // 2)
+                if pos > 0:
+                    cut = pos + (1 if separator == "\n#" else len(separator))
+                    break
+            self._schedule(self._buffer[:cut])
+            self._buffer = self._buffer[cut:]
+
+    def _schedule(self, segment: str):
+        if segment.strip():
+            self._tasks.append((self._offset, asyncio.ensure_future(self.engine.chunk(segment, self.params))))
+        self._offset += len(segment)
+
+    @property
+    def segments(self) -> int:
+        return len(self._tasks)
+
+    async def finish(self) -> List[Dict[str, Any]]:
+        """Chunk what is left and return all chunks (see chunk_document() for the layout)"""
+        self._schedule(self._buffer)
+        self._buffer = ""
+        try:
+            results = await asyncio.gather(*(task for _, task in self._tasks))
+        except BaseException:
+            self.cancel()
+            raise
+
+        chunks = []
+        for (offset, _), (segment_chunks, elapsed_ms, _) in zip(self._tasks, results):
+            self.chunking_time_ms += elapsed_ms
+            for chunk in segment_chunks:
+                chunk["start_char"] += offset
+                chunk["end_char"] += offset
+                chunks.append(chunk)
+        return chunks
+
+    def cancel(self):
+        """Abandon the document (body aborted or rejected)"""
+        for _, task in self._tasks:
+            task.cancel()
@@ -14,31 +14,34 @@ KEY CHANGES FROM v4.0.0:
 from fastapi import FastAPI, HTTPException, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from pydantic import ValidationError
 from typing import List, Optional, Dict, Any
 import time
 from datetime import datetime, timezone
-import tiktoken
 import httpx
 import asyncio
 from contextlib import asynccontextmanager
-from langchain_text_splitters import (
-    RecursiveCharacterTextSplitter,
-    MarkdownHeaderTextSplitter,
-    TokenTextSplitter
-)
 import uuid
+import hashlib
+import json
+import codecs
 from datetime import datetime
 import uvicorn
 
 # Import configurations and models
 from config import *
 from models import *
+from adaptive_limiter import AdaptiveLimiter, CallFailed, ConcurrencyMeter, Overloaded
+from chunking_engine import ChunkingEngine, StreamingChunker, chunking_params
+from checkpoint_store import CheckpointStore
+from chunk_dedup import ChunkHashIndex, chunk_text_hash, plan_dedup_slices
 
 # Import shared model registry for embedding model selection
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parents[4] / "shared"))
 from model_registry import DEFAULT_EMBEDDING_MODEL
+from vector_codec import VECTOR_ENCODING_FLOAT, decode_vector, encode_vector
 
 # ============================================================================
 # Service Initialization
@@ -50,10 +53,35 @@ TOTAL_REQUESTS = 0
 # HTTP client for connection pooling
 http_client = None
 
+# Process-wide pacing of per-chunk metadata calls (shared by all requests)
+metadata_limiter = AdaptiveLimiter(
+    name="metadata",
+    initial_limit=METADATA_CONCURRENCY_INITIAL,
+    min_limit=METADATA_CONCURRENCY_MIN,
+    max_limit=METADATA_CONCURRENCY_MAX,
+    latency_tolerance=METADATA_LATENCY_TOLERANCE,
+    max_error_rate=METADATA_MAX_ERROR_RATE
+)
+
+# Splitting/tokenization off the event loop for large documents
+chunking_engine = ChunkingEngine(
+    workers=CHUNKING_PROCESS_WORKERS,
+    offload_threshold_chars=CHUNKING_OFFLOAD_THRESHOLD_CHARS,
+    encodings=CHUNKING_WARM_ENCODINGS
+)
+
+# Stage outputs of in-progress storing requests (resume after failure)
+checkpoint_store = None
+active_checkpoints = set()  # Request ids currently running in this process
+last_checkpoint_gc = 0.0
+
+# Normalized-text hash -> stored chunk id, per tenant/collection (dedup_scope=collection)
+chunk_hash_index = None
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup/shutdown"""
-    global http_client
+    global http_client, checkpoint_store, last_checkpoint_gc, chunk_hash_index
 
     # Startup
     print("=" * 80)
@@ -61,6 +89,8 @@ async def lifespan(app: FastAPI):
     print("=" * 80)
     print(f"Connection pooling: Size={CONNECTION_POOL_SIZE}, Max={CONNECTION_POOL_MAX}")
     print(f"Max workers: {MAX_WORKERS}")
+    print(f"Chunking workers: {CHUNKING_PROCESS_WORKERS} processes (offload >= {CHUNKING_OFFLOAD_THRESHOLD_CHARS:,} chars)")
+    print(f"Metadata concurrency: adaptive {METADATA_CONCURRENCY_MIN}-{METADATA_CONCURRENCY_MAX} (start {METADATA_CONCURRENCY_INITIAL})")
     print("=" * 80)
     print("SIMPLIFIED ARCHITECTURE:")
     print("  → Chunking v5.0.0 (This service)")
@@ -77,9 +107,27 @@ async def lifespan(app: FastAPI):
     timeout = httpx.Timeout(CONNECTION_TIMEOUT, connect=10.0)
     http_client = httpx.AsyncClient(limits=limits, timeout=timeout)
 
+    # Start chunking worker processes (encoders preloaded)
+    chunking_engine.start()
+
+    if CHECKPOINT_ENABLED:
+        checkpoint_store = CheckpointStore(CHECKPOINT_DB_PATH, ttl_seconds=CHECKPOINT_TTL_HOURS * 3600)
+        expired = checkpoint_store.gc()
+        last_checkpoint_gc = time.time()
+        print(f"Checkpoints: {CHECKPOINT_DB_PATH} (TTL {CHECKPOINT_TTL_HOURS:g}h, {expired} expired removed)")
+
+    if CHUNK_DEDUP_INDEX_ENABLED:
+        chunk_hash_index = ChunkHashIndex(CHUNK_DEDUP_INDEX_DB_PATH)
+        print(f"Chunk hash index: {CHUNK_DEDUP_INDEX_DB_PATH}")
+
     yield
 
     # Shutdown
+    chunking_engine.shutdown()
+    if checkpoint_store:
+        checkpoint_store.close()
+    if chunk_hash_index:
+        chunk_hash_index.close()
     await http_client.aclose()
     print(f"{SERVICE_NAME} shut down")
 
@@ -169,89 +217,14 @@ def safe_int(value: Any) -> Optional[int]:
             return None
     return None
 
-def count_tokens(text: str, encoding_name: str = "cl100k_base") -> int:
-    """Count tokens using tiktoken"""
-    try:
-        encoding = tiktoken.get_encoding(encoding_name)
-        return len(encoding.encode(text))
-    except Exception:
-        return len(text) // 4
-
-def is_valid_chunk(chunk_text: str) -> bool:
-    """Check if chunk contains meaningful content"""
-    # Strip whitespace
-    stripped = chunk_text.strip()
-    
-    # Empty or whitespace-only
-    if not stripped:
-        return False
-    
-    # Just separator characters (---, ***, ___, etc.)
-    if all(c in '-*_ \t\n' for c in stripped):
-        return False
-    
-    # Keep headers (start with #)
-    if stripped.startswith('#'):
-        return True
-    
-    # Keep if has at least 5 alphanumeric characters
-    alphanum_count = sum(1 for c in stripped if c.isalnum())
-    if alphanum_count >= 5:
-        return True
-    
-    return False
-
-def perform_chunking(text: str, config: OrchestrationRequest) -> List[str]:
-    """Chunk text using specified method"""
-    if config.method == ChunkingMethod.recursive:
-        # Markdown-aware separators (non-regex version for compatibility)
-        # Priority: Headers > Horizontal rules > Paragraphs > Lines > Words > Chars
-        separators = config.separators or [
-            '\n### ',    # H3 headers
-            '\n## ',     # H2 headers
-            '\n# ',      # H1 headers
-            '\n---\n',   # Horizontal rule (---) - Fixes section mixing!
-            '\n***\n',   # Horizontal rule (***)
-            '\n___\n',   # Horizontal rule (___)
-            '\n\n',      # Double newline (paragraphs)
-            '\n',        # Single newline
-            ' ',         # Space
-            ''           # Empty (character-by-character)
-        ]
-        splitter = RecursiveCharacterTextSplitter(
-            chunk_size=config.max_chunk_size,
-            chunk_overlap=config.chunk_overlap,
-            separators=separators
-        )
-
-    elif config.method == ChunkingMethod.markdown:
-        headers = config.markdown_headers or ["#", "##", "###"]
-        splitter = MarkdownHeaderTextSplitter(
-            headers_to_split_on=[(h, h) for h in headers]
-        )
-
-    elif config.method == ChunkingMethod.token:
-        splitter = TokenTextSplitter(
-            chunk_size=config.max_chunk_size,
-            chunk_overlap=config.chunk_overlap,
-            encoding_name=config.encoding
-        )
-
-    # Split text
-    if config.method == ChunkingMethod.markdown:
-        docs = splitter.split_text(text)
-        chunks = [doc.page_content if hasattr(doc, 'page_content') else str(doc) for doc in docs]
-    else:
-        chunks = splitter.split_text(text)
-
-    # Filter out invalid chunks (separators, empty, etc.)
-    chunks = [c for c in chunks if is_valid_chunk(c)]
-    return chunks
-
-async def generate_embeddings_batch(chunks: List[str], api_key: str) -> List[Dict[str, Any]]:
+async def generate_embeddings_batch(chunks: List[str], api_key: str, token_counts: Optional[List[int]] = None) -> List[Dict[str, Any]]:
     """
     Generate hybrid embeddings (dense + sparse) for all chunks using embeddings v3.0.0
     Returns list of dicts with 'dense_embedding' and 'sparse_embedding' fields
+    ('dense_embedding' stays a VECTOR_ENCODING string when the service returned one -
+    it only passes through to storage)
+
+    token_counts (from chunking) are forwarded so the embeddings service doesn't estimate them again.
     """
     try:
         # Build headers - only include apikey if NOT in internal mode
@@ -267,7 +240,9 @@ async def generate_embeddings_batch(chunks: List[str], api_key: str) -> List[Dic
                 "input": chunks,
                 "model": DEFAULT_EMBEDDING_MODEL,  # Use shared registry instead of hardcoded value
                 "return_dense": True,
-                "return_sparse": True
+                "return_sparse": True,
+                "token_counts": token_counts,
+                "encoding_format": VECTOR_ENCODING
             }
         )
 
@@ -282,8 +257,11 @@ async def generate_embeddings_batch(chunks: List[str], api_key: str) -> List[Dic
         embedding_model_used = result.get('model', DEFAULT_EMBEDDING_MODEL)
 
         # Return tuple: (embeddings list, model used)
+        # Services that predate encoding_format ignore it and return float arrays
+        encoding = result.get('encoding_format', VECTOR_ENCODING_FLOAT)
+        passthrough = encoding in (VECTOR_ENCODING, VECTOR_ENCODING_FLOAT)
         embeddings_list = [{
-            'dense_embedding': item['dense_embedding'],
+            'dense_embedding': item['dense_embedding'] if passthrough else decode_vector(item['dense_embedding'], encoding),
             'sparse_embedding': item.get('sparse_embedding', {})
         } for item in embeddings_data]
 
@@ -297,6 +275,10 @@ async def generate_metadata_for_chunk(chunk_text: str, chunk_id: str, config: Me
     """
     Generate enriched metadata for a single chunk using metadata v3.0.0
     Returns 45 fields instead of 4!
+
+    Raises Overloaded on 429/503/timeouts so the caller can back off and re-queue,
+    and CallFailed on any other failure so the limiter records it as an error
+    (retryable unless the service rejected the request with a 4xx).
     """
     try:
         # Build headers - only include apikey if NOT in internal mode
@@ -319,46 +301,82 @@ async def generate_metadata_for_chunk(chunk_text: str, chunk_id: str, config: Me
         )
 
         if response.status_code == 200:
-            result = response.json()
-            # DEBUG: Print FULL response keys and URL called
-            print(f"DEBUG {chunk_id}: URL={METADATA_SERVICE_URL}")
-            print(f"DEBUG {chunk_id}: Response keys: {list(result.keys())}")
-            print(f"DEBUG {chunk_id}: semantic_keywords={result.get('semantic_keywords', 'KEY_MISSING')}")
-            return result
+            return response.json()
+        elif response.status_code in (429, 503):
+            raise Overloaded(f"Metadata service returned {response.status_code} for {chunk_id}")
         else:
             print(f"⚠️  Metadata service error for {chunk_id}: {response.status_code} URL={METADATA_SERVICE_URL} INTERNAL_MODE={INTERNAL_MODE}")
-            return None
+            raise CallFailed(
+                f"Metadata service returned {response.status_code} for {chunk_id}",
+                retryable=not 400 <= response.status_code < 500
+            )
 
+    except (Overloaded, CallFailed):
+        raise
+    except httpx.TimeoutException as e:
+        raise Overloaded(f"Metadata request timed out for {chunk_id}") from e
     except Exception as e:
         print(f"⚠️  Metadata generation error for {chunk_id}: {e}")
-        return None
-
-async def generate_metadata_parallel(chunks: List[str], config: MetadataConfig, api_key: str) -> List[Optional[Dict]]:
-    """Generate metadata for all chunks in parallel"""
+        raise CallFailed(f"Metadata generation error for {chunk_id}: {e}") from e
 
-    # Filter: Skip chunks shorter than 50 chars (metadata service minimum)
-    MIN_METADATA_LENGTH = 50
+# Chunks shorter than this are not sent for metadata (metadata service minimum)
+MIN_METADATA_LENGTH = 50
 
-    tasks = []
-    skip_indices = []
+async def generate_metadata_parallel(
+    chunks: List[str],
+    config: MetadataConfig,
+    api_key: str,
+    start_index: int = 0,
+    meter: Optional[ConcurrencyMeter] = None,
+    stats: Optional[Dict[str, int]] = None,
+    indices: Optional[List[int]] = None
+) -> List[Optional[Dict]]:
+    """
+    Generate metadata for all chunks, paced by the process-wide adaptive limiter
+
+    Chunks throttled by the metadata service (429/503/timeout) or failing with a
+    transient error (5xx, connection errors) are re-queued with backoff instead
+    of being dropped; 4xx rejections fail at once. start_index offsets chunk ids for slices
+    (indices gives each chunk's position instead, for non-contiguous slices);
+    meter/stats collect per-request concurrency, retry and failure counts
+    ("failed" counts every chunk left without metadata, "errors" the non-overload
+    failures among them).
+    """
+    indices = indices if indices is not None else [start_index + i for i in range(len(chunks))]
 
-    for i, chunk_text in enumerate(chunks):
-        if len(chunk_text.strip()) < MIN_METADATA_LENGTH:
-            # Too short for metadata extraction - skip API call
-            tasks.append(None)
-            skip_indices.append(i)
-        else:
-            tasks.append(generate_metadata_for_chunk(chunk_text, f"chunk_{i:04d}", config, api_key))
+    # Filter: Skip chunks shorter than MIN_METADATA_LENGTH chars
+    stats = stats if stats is not None else {}
 
+    skip_indices = [indices[i] for i, chunk_text in enumerate(chunks) if len(chunk_text.strip()) < MIN_METADATA_LENGTH]
     if skip_indices:
         print(f"  ⏭️  Skipped {len(skip_indices)} chunks (< {MIN_METADATA_LENGTH} chars): {skip_indices}")
 
-    # Execute all valid tasks in parallel (no concurrency limit - testing showed this is fastest)
+    async def _extract(i: int, chunk_text: str) -> Optional[Dict]:
+        chunk_id = f"chunk_{indices[i]:04d}"
+        for attempt in range(1, METADATA_MAX_ATTEMPTS + 1):
+            try:
+                async with metadata_limiter.slot(meter):
+                    return await generate_metadata_for_chunk(chunk_text, chunk_id, config, api_key)
+            except (Overloaded, CallFailed) as e:
+                if isinstance(e, Overloaded):
+                    stats["throttled"] = stats.get("throttled", 0) + 1
+                else:
+                    stats["errors"] = stats.get("errors", 0) + 1
+                if attempt == METADATA_MAX_ATTEMPTS or not getattr(e, "retryable", True):
+                    print(f"⚠️  Giving up on {chunk_id} after {attempt} attempts: {e}")
+                    stats["failed"] = stats.get("failed", 0) + 1
+                    return None
+                # Re-queue: back off, then wait for a slot behind the chunks already queued
+                stats["retries"] = stats.get("retries", 0) + 1
+                await asyncio.sleep(METADATA_RETRY_DELAY * (2 ** (attempt - 1)))
+        return None
+
+    tasks = [
+        _extract(i, chunk_text) if len(chunk_text.strip()) >= MIN_METADATA_LENGTH else None
+        for i, chunk_text in enumerate(chunks)
+    ]
     valid_tasks = [t for t in tasks if t is not None]
-    if valid_tasks:
-        results = await asyncio.gather(*valid_tasks, return_exceptions=True)
-    else:
-        results = []
+    results = await asyncio.gather(*valid_tasks, return_exceptions=True) if valid_tasks else []
 
     # Merge results back with None for skipped chunks
     metadata_results = []
@@ -394,6 +412,10 @@ async def store_in_milvus_storage(
     """
     Store chunks in Milvus via Storage Service v1.0.0 API
     NO direct pymilvus - delegates to storage service!
+
+    Chunks are upserted: slices are stored as they finish, and chunk ids are
+    deterministic, so a retried request (with or without checkpoints) overwrites
+    the slices an earlier attempt stored instead of duplicating them.
     """
     try:
         # Build headers - only include apikey if NOT in internal mode
@@ -405,8 +427,18 @@ async def store_in_milvus_storage(
         payload = {
             "collection_name": collection_name,
             "chunks": chunks_data,
-            "create_collection": True  # Auto-create if doesn't exist
+            "create_collection": True,  # Auto-create if doesn't exist
+            "upsert": True
         }
+        if VECTOR_ENCODING != VECTOR_ENCODING_FLOAT:
+            # Vectors from the embeddings service are already encoded; only array vectors
+            # (reused from the collection, older services) are encoded here
+            payload["chunks"] = [
+                dict(chunk, dense_vector=encode_vector(chunk["dense_vector"], VECTOR_ENCODING))
+                if isinstance(chunk.get("dense_vector"), list) else chunk
+                for chunk in chunks_data
+            ]
+            payload["vector_encoding"] = VECTOR_ENCODING
 
         # Add optional model information
         if source_document:
@@ -432,6 +464,73 @@ async def store_in_milvus_storage(
         print(f"⚠️  Storage service error: {e}")
         raise HTTPException(status_code=500, detail=f"Milvus storage failed: {str(e)}")
 
+# Computed per chunk and shared by exact duplicates (see chunk_dedup.py)
+CHUNK_METADATA_FIELDS = [
+    "keywords", "topics", "questions", "summary",
+    "semantic_keywords", "entity_relationships", "attributes"
+]
+REUSABLE_CHUNK_FIELDS = {"dense_embedding", "sparse_embedding", *CHUNK_METADATA_FIELDS}
+REUSABLE_STORAGE_FIELDS = ["id", "text", "dense_vector", *CHUNK_METADATA_FIELDS]
+
+async def fetch_stored_chunks(
+    chunk_ids: List[str],
+    collection_name: str,
+    tenant_id: str,
+    api_key: str
+) -> Dict[str, Dict[str, Any]]:
+    """Fetch stored chunks (text, vector, metadata) by id via the Storage Service query API"""
+    headers = {"Content-Type": "application/json"}
+    if not INTERNAL_MODE:
+        headers["apikey"] = api_key
+
+    response = await http_client.post(
+        f"{MILVUS_STORAGE_SERVICE_URL}/query",
+        headers=headers,
+        json={
+            "collection_name": collection_name,
+            "filter": f"id in {json.dumps(chunk_ids)}",
+            "output_fields": REUSABLE_STORAGE_FIELDS,
+            "tenant_id": tenant_id,
+            "limit": len(chunk_ids)
+        },
+        timeout=60.0
+    )
+    if response.status_code != 200:
+        raise Exception(f"Storage service returned {response.status_code}: {response.text}")
+    return {record["id"]: record for record in response.json().get("results", [])}
+
+def to_storage_chunk(chunk: ChunkData, document_id: str, tenant_id: str) -> Dict[str, Any]:
+    """Convert ChunkData to a Storage Service chunk record"""
+    timestamp_now = datetime.now(timezone.utc).isoformat()
+    return {
+        "id": chunk.chunk_id,
+        "document_id": document_id,
+        "chunk_index": chunk.index,
+        "text": chunk.text,
+        "dense_vector": chunk.dense_embedding,  # Hybrid: dense vector
+        "sparse_vector": chunk.sparse_embedding,  # Hybrid: sparse vector
+        "tenant_id": tenant_id,
+        "char_count": chunk.char_count,
+        "token_count": chunk.token_count,
+        "created_at": timestamp_now,
+        "updated_at": timestamp_now,
+
+        # Basic metadata (7 fields with semantic expansion)
+        "keywords": chunk.keywords or "",
+        "topics": chunk.topics or "",
+        "questions": chunk.questions or "",
+        "summary": chunk.summary or "",
+        "semantic_keywords": chunk.semantic_keywords or "",
+        "entity_relationships": chunk.entity_relationships or "",
+        "attributes": chunk.attributes or ""
+    }
+
+def with_float_vector(chunk: ChunkData) -> ChunkData:
+    """ChunkData with its dense vector as a float list (responses keep the JSON array format)"""
+    if not isinstance(chunk.dense_embedding, str):
+        return chunk
+    return chunk.model_copy(update={"dense_embedding": decode_vector(chunk.dense_embedding, VECTOR_ENCODING)})
+
 # ============================================================================
 # API Endpoints
 # ============================================================================
@@ -477,6 +576,18 @@ async def health():
         total_requests=TOTAL_REQUESTS
     )
 
+@app.get("/metrics/chunking")
+async def chunking_metrics():
+    """Per-document chunking time metrics (inline vs worker process)"""
+    return chunking_engine.stats()
+
+@app.get("/metrics/checkpoints")
+async def checkpoint_metrics():
+    """Stage checkpoint store: pending (failed/in-progress) requests, resumes, expirations"""
+    if not checkpoint_store:
+        return {"enabled": False}
+    return {"enabled": True, "active": len(active_checkpoints), **await asyncio.to_thread(checkpoint_store.stats)}
+
 @app.get("/version", response_model=VersionResponse)
 async def version_info():
     """Get version information"""
@@ -484,8 +595,8 @@ async def version_info():
         version=API_VERSION,
         service=SERVICE_NAME,
         description=SERVICE_DESCRIPTION,
-        endpoints=["/health", "/version", "/v5/orchestrate"],
-        supported_methods=["recursive", "markdown", "token"],
+        endpoints=["/health", "/version", "/metrics/chunking", "/metrics/checkpoints", "/v5/orchestrate"],
+        supported_methods=["recursive", "markdown", "token", "native", "token_native"],
         permission_system={
             "basic": ["chunking"],
             "enhanced": ["chunking", "embeddings", "metadata"],
@@ -495,6 +606,11 @@ async def version_info():
         storage_version="1.0.0"
     )
 
+def request_fingerprint(request: OrchestrationRequest) -> str:
+    """sha256 of everything that determines the stored result (response projection and request_id excluded)"""
+    body = request.model_dump_json(exclude={"request_id", "response_mode"})
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
 @app.post("/v1/orchestrate", response_model=OrchestrationResponse)
 async def orchestrate_pipeline(
     request: OrchestrationRequest,
@@ -522,7 +638,133 @@ async def orchestrate_pipeline(
     3. Extract enriched metadata via v3 API (if permitted)
     4. Generate embeddings (if permitted)
     5. Store via Milvus Storage API (if permitted)
+
+    Checkpoints: for storing requests, chunks, each slice's metadata + vectors
+    and each stored slice are checkpointed under request_id (default: derived
+    from the request body). If the request fails, retrying it resumes at the
+    first incomplete stage; checkpoints are removed after success.
     """
+    return await orchestrate_checkpointed(request, apikey, request_fingerprint(request))
+
+# Placeholder text of streamed requests (the document is the request body)
+STREAMED_TEXT = "<streamed>"
+
+@app.post("/v1/orchestrate/stream", response_model=OrchestrationResponse)
+async def orchestrate_stream(
+    raw_request: Request,
+    x_orchestration_request: str = Header(...),
+    apikey: Optional[str] = Header(None)
+):
+    """
+    Orchestrate a document streamed as the raw request body (UTF-8)
+
+    The OrchestrationRequest fields (without text) are sent as JSON in the
+    X-Orchestration-Request header. The body is decoded and cut into segments
+    of about STREAM_SEGMENT_CHARS at paragraph/line boundaries as it arrives;
+    each segment is chunked while the rest is still uploading, so neither the
+    document nor a JSON copy of it is parsed in one piece. The remaining steps
+    (metadata, embeddings, storage, checkpoints) run as for /v1/orchestrate.
+    """
+    try:
+        params = json.loads(x_orchestration_request)
+        if not isinstance(params, dict):
+            raise ValueError("expected a JSON object")
+        params.pop("text", None)
+        request = OrchestrationRequest(**params, text=STREAMED_TEXT)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid X-Orchestration-Request header: {e}")
+    check_storage_settings(request)
+
+    upload_start = time.time()
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    chunker = StreamingChunker(chunking_engine, chunking_params(request), STREAM_SEGMENT_CHARS)
+    body_hash = hashlib.sha256()
+    try:
+        async for data in raw_request.stream():
+            body_hash.update(data)
+            chunker.feed(decoder.decode(data))
+            if chunker.characters > MAX_STREAM_CHARS:
+                raise HTTPException(status_code=413, detail=f"Streamed document exceeds {MAX_STREAM_CHARS} characters")
+        chunker.feed(decoder.decode(b"", final=True))
+        if not chunker.characters:
+            raise HTTPException(status_code=400, detail="Empty document body")
+        upload_time = (time.time() - upload_start) * 1000
+        chunk_records = await chunker.finish()
+    except UnicodeDecodeError as e:
+        chunker.cancel()
+        raise HTTPException(status_code=400, detail=f"Document body is not valid UTF-8: {e}")
+    except HTTPException:
+        chunker.cancel()
+        raise
+    except Exception as e:
+        chunker.cancel()
+        raise HTTPException(status_code=500, detail=f"Chunking failed: {str(e)}")
+
+    if not chunk_records:
+        raise HTTPException(status_code=500, detail="Chunking produced no results")
+
+    stream_stats = {
+        "characters": chunker.characters,
+        "segments": chunker.segments,
+        "upload_time_ms": round(upload_time, 2),
+        "chunking_after_upload_ms": round((time.time() - upload_start) * 1000 - upload_time, 2)
+    }
+    # Same role as request_fingerprint(): the text enters through its hash
+    body = request.model_dump_json(exclude={"request_id", "response_mode", "text"}) + body_hash.hexdigest()
+    fingerprint = hashlib.sha256(body.encode("utf-8")).hexdigest()
+    return await orchestrate_checkpointed(
+        request, apikey, fingerprint,
+        chunked={"records": chunk_records, "chunking_time_ms": chunker.chunking_time_ms, "stream": stream_stats}
+    )
+
+async def orchestrate_checkpointed(
+    request: OrchestrationRequest,
+    apikey: Optional[str],
+    fingerprint: str,
+    chunked: Optional[Dict[str, Any]] = None
+) -> OrchestrationResponse:
+    """Run the pipeline under its request_id, guarding against concurrent attempts when checkpointing"""
+    request_id = request.request_id or f"req_{fingerprint[:32]}"
+    checkpointing = checkpoint_store is not None and request.storage_mode != StorageMode.none and not request.dry_run
+
+    if not checkpointing:
+        return await run_orchestration(request, apikey, request_id, fingerprint, checkpointing=False, chunked=chunked)
+
+    # Two concurrent attempts of the same request would both write (and insert) the same slices
+    if request_id in active_checkpoints:
+        raise HTTPException(status_code=409, detail=f"Request {request_id} is already in progress")
+    active_checkpoints.add(request_id)
+    try:
+        return await run_orchestration(request, apikey, request_id, fingerprint, checkpointing=True, chunked=chunked)
+    finally:
+        active_checkpoints.discard(request_id)
+
+def check_storage_settings(request: OrchestrationRequest):
+    """Reject storage settings that cannot work before anything is spent on the document"""
+    if request.storage_mode == StorageMode.none:
+        return
+    if not request.generate_embeddings:
+        raise HTTPException(status_code=400, detail="Cannot store in Milvus without embeddings. Set generate_embeddings=true")
+    if request.storage_mode != StorageMode.new_collection and not request.collection_name:
+        raise HTTPException(status_code=400, detail="collection_name required for existing storage mode")
+
+async def run_orchestration(
+    request: OrchestrationRequest,
+    apikey: Optional[str],
+    request_id: str,
+    fingerprint: str,
+    checkpointing: bool,
+    chunked: Optional[Dict[str, Any]] = None
+) -> OrchestrationResponse:
+    """
+    Run the pipeline for one request, reusing and writing stage checkpoints when checkpointing
+
+    chunked carries the chunks of a streamed document ({"records",
+    "chunking_time_ms", "stream"}); otherwise request.text is chunked here.
+    """
+    global last_checkpoint_gc
     start_time = time.time()
 
     # Internal mode: all permissions granted (no external auth)
@@ -536,169 +778,400 @@ async def orchestrate_pipeline(
     # Generate document ID if not provided
     document_id = request.document_id or f"doc_{uuid.uuid4().hex[:12]}"
 
+    # Validate storage settings before spending anything on chunking/metadata/embeddings
+    storing = request.storage_mode != StorageMode.none
+    check_storage_settings(request)
+    collection_name = None
+    if storing:
+        if request.storage_mode == StorageMode.new_collection:
+            collection_name = request.collection_name or f"collection_{uuid.uuid4().hex[:8]}"
+        else:
+            collection_name = request.collection_name
+
+    # Resume from checkpoints of a previous failed attempt
+    resuming = False
+    resumed_stages = {"chunks": 0, "slices": 0, "stored_slices": 0}
+    saved_chunks = None
+    if checkpointing:
+        resuming = await asyncio.to_thread(checkpoint_store.begin, request_id, fingerprint)
+        if resuming:
+            saved_chunks = await asyncio.to_thread(checkpoint_store.load, request_id, "chunks")
+
+    async def _checkpoint(name: str, data: Any):
+        if checkpointing:
+            await asyncio.to_thread(checkpoint_store.save, request_id, name, data)
+
+    async def _restore(name: str) -> Optional[Any]:
+        if not resuming:
+            return None
+        return await asyncio.to_thread(checkpoint_store.load, request_id, name)
+
     # Step 1: Chunk text
     print(f"📄 Processing document: {document_id} (Consumer: {consumer.username}, Tier: {consumer.tier})")
     chunk_start = time.time()
 
-    try:
-        chunks = perform_chunking(request.text, request)
-        if not chunks:
-            raise HTTPException(status_code=500, detail="Chunking produced no results")
-
-        chunking_time = (time.time() - chunk_start) * 1000
-        print(f"  ✅ Created {len(chunks)} chunks ({chunking_time:.0f}ms)")
+    if saved_chunks:
+        # Generated ids from the first attempt keep chunk ids / collection stable across retries
+        chunk_records = saved_chunks["records"]
+        document_id = saved_chunks["document_id"]
+        collection_name = saved_chunks["collection_name"]
+        offloaded = False
+        resumed_stages["chunks"] = len(chunk_records)
+    elif chunked is not None:
+        chunk_records = chunked["records"]
+        offloaded = False
+        await _checkpoint("chunks", {"records": chunk_records, "document_id": document_id, "collection_name": collection_name})
+    else:
+        try:
+            chunk_records, _, offloaded = await chunking_engine.chunk(request.text, chunking_params(request))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Chunking failed: {str(e)}")
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Chunking failed: {str(e)}")
+        if not chunk_records:
+            raise HTTPException(status_code=500, detail="Chunking produced no results")
+        await _checkpoint("chunks", {"records": chunk_records, "document_id": document_id, "collection_name": collection_name})
+    chunks = [record["text"] for record in chunk_records]
+
+    chunking_time = (time.time() - chunk_start) * 1000
+    stream_stats = None
+    if chunked is not None:
+        chunking_time = chunked["chunking_time_ms"]  # Overlapped with the upload
+        stream_stats = chunked["stream"]
+    if saved_chunks:
+        print(f"  ♻️  Resumed {len(chunks)} chunks from checkpoint {request_id}")
+    else:
+        print(f"  ✅ Created {len(chunks)} chunks ({chunking_time:.0f}ms{', worker process' if offloaded else ''})")
 
-    # Step 2: Generate enriched metadata via v3 API
-    metadata_list = None
-    metadata_model_used = None
-    metadata_time = None
     if request.generate_metadata:
         permissions_used.append("metadata")
-
-        meta_start = time.time()
-        print(f"  🔍 Extracting enriched metadata (v3.0.0 - 45 fields)...")
-
-        metadata_config = request.metadata_config or MetadataConfig()
-        metadata_list, metadata_model_used = await generate_metadata_parallel(chunks, metadata_config, apikey)
-
-        metadata_time = (time.time() - meta_start) * 1000
-        successful = sum(1 for m in metadata_list if m is not None)
-        print(f"  ✅ Extracted metadata for {successful}/{len(chunks)} chunks ({metadata_time:.0f}ms, model: {metadata_model_used})")
-
-    # Step 3: Generate embeddings
-    embeddings = None
-    embedding_model_used = None
-    embeddings_time = None
     if request.generate_embeddings:
         permissions_used.append("embeddings")
+    if storing:
+        permissions_used.append("milvus")
 
-        embed_start = time.time()
-        print(f"  🔢 Generating embeddings...")
-
-        embeddings, embedding_model_used = await generate_embeddings_batch(chunks, apikey)
-        if not embeddings:
-            raise HTTPException(status_code=500, detail="Embeddings generation failed")
-
-        embeddings_time = (time.time() - embed_start) * 1000
-        print(f"  ✅ Generated {len(embeddings)} embeddings ({embeddings_time:.0f}ms, model: {embedding_model_used})")
-
-    # Step 4: Build chunk data objects with ALL 45 metadata fields
-    chunks_data = []
-    char_pos = 0
-
-    for idx, chunk_text in enumerate(chunks):
-        char_count = len(chunk_text)
-        token_count = count_tokens(chunk_text, request.encoding)
+    # Exact duplicates: each distinct normalized text is sent through metadata and
+    # embeddings once; duplicates (and, with dedup_scope=collection, chunks already
+    # stored in the collection) reuse that metadata/vector pair
+    hashes = [chunk_text_hash(text) for text in chunks]
+    dedup_scope = request.dedup_scope
+    if dedup_scope == DedupScope.collection and not (storing and chunk_hash_index):
+        dedup_scope = DedupScope.request
+    slices = await _restore("plan")
+    if slices is None:
+        plan_keys = hashes if dedup_scope != DedupScope.none else [str(i) for i in range(len(chunks))]
+        reusable = {}
+        if dedup_scope == DedupScope.collection:
+            reusable = await asyncio.to_thread(chunk_hash_index.lookup, request.tenant_id, collection_name, hashes)
+        slices = plan_dedup_slices(plan_keys, PIPELINE_SLICE_SIZE, reusable)
+        await _checkpoint("plan", slices)
+    unique_chunks = len(set(hashes))
+
+    def _dedup_summary(computed: int, copied: int, reused: int) -> Dict[str, Any]:
+        return {
+            "scope": dedup_scope.value,
+            "unique_chunks": unique_chunks,
+            "computed": computed,
+            "copied_within_request": copied,
+            "reused_from_collection": reused,
+            "dedup_ratio": round(1 - computed / len(chunks), 4)
+        }
 
-        # Extract metadata (4 core fields only)
-        metadata = metadata_list[idx] if metadata_list and idx < len(metadata_list) and metadata_list[idx] else {}
+    if request.dry_run:
+        # Work a real run would do - no model calls, nothing stored
+        computed = [idx for plan in slices for idx in plan["compute"]]
+        dry_run_plan = {
+            "chunks": len(chunks),
+            "tokens": sum(record["token_count"] for record in chunk_records),
+            "characters": sum(len(text) for text in chunks),
+            "max_chunk_tokens": max(record["token_count"] for record in chunk_records),
+            "computed_chunks": len(computed),
+            "computed_tokens": sum(chunk_records[idx]["token_count"] for idx in computed),
+            "metadata_calls": sum(1 for idx in computed if len(chunks[idx].strip()) >= MIN_METADATA_LENGTH)
+            if request.generate_metadata else 0,
+            "embedding_calls": sum(1 for plan in slices if plan["compute"]) if request.generate_embeddings else 0,
+            "storage_inserts": len(slices) if storing else 0
+        }
+        total_time = (time.time() - start_time) * 1000
+        print(f"  🧮 Dry run: {dry_run_plan['chunks']} chunks, {dry_run_plan['tokens']} tokens, "
+              f"{dry_run_plan['metadata_calls']} metadata calls, {dry_run_plan['embedding_calls']} embedding calls")
+        return OrchestrationResponse(
+            document_id=document_id,
+            total_chunks=len(chunks),
+            processing_time_ms=round(total_time, 2),
+            chunk_ids=[f"{document_id}_chunk_{idx:04d}" for idx in range(len(chunks))] if request.response_mode == ResponseMode.ids else None,
+            response_mode=request.response_mode,
+            pipeline_slices=len(slices),
+            dedup=_dedup_summary(
+                len(computed),
+                sum(len(plan["copies"]) for plan in slices),
+                sum(len(plan["reuse"]) for plan in slices)
+            ),
+            dry_run_plan=dry_run_plan,
+            embeddings_generated=False,
+            metadata_generated=False,
+            stored_in_milvus=False,
+            collection_name=collection_name,
+            chunking_time_ms=round(chunking_time, 2),
+            stream=stream_stats,
+            consumer=consumer.username,
+            tier=consumer.tier,
+            permissions_used=["chunking"]
+        )
 
-        # Extract hybrid embeddings (dense + sparse)
-        dense_emb = None
-        sparse_emb = None
-        if embeddings and idx < len(embeddings):
-            dense_emb = embeddings[idx].get('dense_embedding')
-            sparse_emb = embeddings[idx].get('sparse_embedding')
+    # Steps 2-5: Pipelined slices
+    # Metadata and embeddings for each slice run concurrently, and a slice is
+    # stored as soon as both are ready (no waiting for the whole document).
+    metadata_config = request.metadata_config or MetadataConfig()
+    print(f"  🔀 Pipelining {len(chunks)} chunks in {len(slices)} slices (metadata ‖ embeddings → storage)")
+
+    chunks_data: List[Optional[ChunkData]] = [None] * len(chunks)
+    stage_spans = {"metadata": [], "embeddings": [], "storage": []}
+    model_info = {"metadata": None, "embeddings": None}
+    metadata_meter = ConcurrencyMeter()
+    metadata_stats: Dict[str, int] = {}
+    metadata_successful = 0
+    inserted_total = 0
+    dedup_counts = {"computed": 0, "copied": 0, "reused": 0}
+    storage_lock = asyncio.Lock()  # One insert at a time (first insert may create the collection)
+    slice_semaphore = asyncio.Semaphore(PIPELINE_MAX_INFLIGHT_SLICES)
+
+    async def _timed(stage: str, coro):
+        stage_start = time.time()
+        try:
+            return await coro
+        finally:
+            stage_spans[stage].append((stage_start, time.time()))
 
-        chunk_data = ChunkData(
+    def _chunk_at(idx: int, **fields) -> ChunkData:
+        """ChunkData for chunk idx with the given vectors/metadata"""
+        return ChunkData(
             chunk_id=f"{document_id}_chunk_{idx:04d}",
-            text=chunk_text,
+            text=chunks[idx],
             index=idx,
-            char_count=char_count,
-            token_count=token_count,
-            start_char=char_pos,
-            end_char=char_pos + char_count,
-            dense_embedding=dense_emb,
-            sparse_embedding=sparse_emb,
-            embedding=dense_emb,  # Backward compatibility
-
-            # Basic metadata (7 fields with semantic expansion)
-            keywords=metadata.get('keywords', ''),
-            topics=metadata.get('topics', ''),
-            questions=metadata.get('questions', ''),
-            summary=metadata.get('summary', ''),
-            semantic_keywords=metadata.get('semantic_keywords', ''),
-            entity_relationships=metadata.get('entity_relationships', ''),
-            attributes=metadata.get('attributes', '')
+            char_count=len(chunks[idx]),
+            token_count=chunk_records[idx]["token_count"],
+            start_char=chunk_records[idx]["start_char"],
+            end_char=chunk_records[idx]["end_char"],
+            **fields
         )
 
-        chunks_data.append(chunk_data)
-        char_pos += char_count
-
-    # Step 5: Store via Milvus Storage Service v1.0.0
-    stored_in_milvus = False
-    collection_name = None
-    storage_time = None
-
-    if request.storage_mode != StorageMode.none:
-        permissions_used.append("milvus")
-
-        if not request.generate_embeddings:
-            raise HTTPException(status_code=400, detail="Cannot store in Milvus without embeddings. Set generate_embeddings=true")
+    async def _compute_slice(compute: List[int], copies: List[List[int]]) -> List[ChunkData]:
+        """Metadata ‖ embeddings for the compute indices; copies get their representative's results"""
+        metadata_list, embeddings = None, None
+        slice_texts = [chunks[idx] for idx in compute]
+        metadata_coro = _timed("metadata", generate_metadata_parallel(
+            slice_texts, metadata_config, apikey, meter=metadata_meter, stats=metadata_stats, indices=compute)) \
+            if request.generate_metadata else None
+        slice_token_counts = [chunk_records[idx]["token_count"] for idx in compute]
+        embeddings_coro = _timed("embeddings", generate_embeddings_batch(slice_texts, apikey, slice_token_counts)) \
+            if request.generate_embeddings else None
+
+        results = await asyncio.gather(*[c for c in (metadata_coro, embeddings_coro) if c is not None])
+        if metadata_coro is not None:
+            metadata_list, model_info["metadata"] = results[0][0], results[0][1] or model_info["metadata"]
+        if embeddings_coro is not None:
+            embeddings, model_info["embeddings"] = results[-1]
+            if not embeddings:
+                raise HTTPException(status_code=500, detail="Embeddings generation failed")
+
+        # Build chunk data objects (7 metadata fields)
+        computed = {}
+        for offset, idx in enumerate(compute):
+            metadata = metadata_list[offset] if metadata_list and metadata_list[offset] else {}
+            dense_emb = embeddings[offset].get('dense_embedding') if embeddings and offset < len(embeddings) else None
+            sparse_emb = embeddings[offset].get('sparse_embedding') if embeddings and offset < len(embeddings) else None
+
+            computed[idx] = _chunk_at(
+                idx,
+                dense_embedding=dense_emb,
+                sparse_embedding=sparse_emb,
+
+                # Basic metadata (7 fields with semantic expansion)
+                keywords=metadata.get('keywords', ''),
+                topics=metadata.get('topics', ''),
+                questions=metadata.get('questions', ''),
+                summary=metadata.get('summary', ''),
+                semantic_keywords=metadata.get('semantic_keywords', ''),
+                entity_relationships=metadata.get('entity_relationships', ''),
+                attributes=metadata.get('attributes', '')
+            )
+        slice_chunks = list(computed.values())
+        for idx, rep_idx in copies:
+            slice_chunks.append(_chunk_at(idx, **computed[rep_idx].model_dump(include=REUSABLE_CHUNK_FIELDS)))
+        dedup_counts["computed"] += len(compute)
+        dedup_counts["copied"] += len(copies)
+        return slice_chunks
+
+    async def _reuse_slice(reuse: List[List[Any]]) -> List[ChunkData]:
+        """Copy metadata/vectors of stored chunks; chunks whose stored copy is gone or changed are computed"""
+        stored, fetched = {}, False
+        try:
+            stored = await fetch_stored_chunks(
+                sorted({chunk_id for _, chunk_id in reuse}), collection_name, request.tenant_id, apikey)
+            fetched = True
+        except Exception as e:
+            print(f"  ⚠️  Could not fetch stored duplicates, computing them instead: {e}")
+
+        slice_chunks, missing, stale = [], [], set()
+        for idx, chunk_id in reuse:
+            record = stored.get(chunk_id)
+            # The stored chunk may have been deleted or re-ingested with other text since it was indexed
+            if record and record.get("dense_vector") and chunk_text_hash(record.get("text", "")) == hashes[idx]:
+                slice_chunks.append(_chunk_at(
+                    idx,
+                    dense_embedding=record["dense_vector"],
+                    **{field: record.get(field) or "" for field in CHUNK_METADATA_FIELDS}
+                ))
+            else:
+                missing.append(idx)
+                stale.add(chunk_id)
+        dedup_counts["reused"] += len(slice_chunks)
+
+        if fetched and stale:
+            await asyncio.to_thread(chunk_hash_index.forget_chunks, request.tenant_id, collection_name, sorted(stale))
+        if missing:
+            representatives = {}
+            for idx in missing:
+                representatives.setdefault(hashes[idx], idx)
+            copies = [[idx, representatives[hashes[idx]]] for idx in missing if representatives[hashes[idx]] != idx]
+            slice_chunks.extend(await _compute_slice(list(representatives.values()), copies))
+        return slice_chunks
+
+    def _has_metadata(chunk: ChunkData) -> bool:
+        return any(getattr(chunk, field) for field in CHUNK_METADATA_FIELDS)
+
+    async def _process_slice(slice_number: int, plan: Dict[str, Any]):
+        nonlocal metadata_successful, inserted_total
+        async with slice_semaphore:
+            saved_slice = await _restore(f"slice_{slice_number}")
+            if saved_slice:
+                slice_chunks = [ChunkData(**chunk) for chunk in saved_slice["chunks"]]
+                model_info["metadata"] = model_info["metadata"] or saved_slice["metadata_model"]
+                model_info["embeddings"] = model_info["embeddings"] or saved_slice["embedding_model"]
+                for key, count in saved_slice["dedup"].items():
+                    dedup_counts[key] += count
+                resumed_stages["slices"] += 1
+            else:
+                counts_before = dict(dedup_counts)
+                if plan["reuse"]:
+                    slice_chunks = await _reuse_slice(plan["reuse"])
+                else:
+                    slice_chunks = await _compute_slice(plan["compute"], plan["copies"])
+                await _checkpoint(f"slice_{slice_number}", {
+                    "chunks": [chunk.model_dump() for chunk in slice_chunks],
+                    "metadata_model": model_info["metadata"],
+                    "embedding_model": model_info["embeddings"],
+                    "dedup": {key: dedup_counts[key] - counts_before[key] for key in dedup_counts}
+                })
+            slice_chunks.sort(key=lambda chunk: chunk.index)
+            if request.generate_metadata:
+                metadata_successful += sum(1 for chunk in slice_chunks if _has_metadata(chunk))
+            for chunk in slice_chunks:
+                chunks_data[chunk.index] = chunk
+
+            # Store this slice right away (unless a previous attempt already did)
+            if storing:
+                first_index = slice_chunks[0].index
+                saved_insert = await _restore(f"stored_{slice_number}")
+                if saved_insert:
+                    inserted_total += saved_insert["inserted_count"]
+                    resumed_stages["stored_slices"] += 1
+                else:
+                    storage_chunks = [to_storage_chunk(chunk, document_id, request.tenant_id) for chunk in slice_chunks]
+                    async with storage_lock:
+                        storage_result = await _timed("storage", store_in_milvus_storage(
+                            chunks_data=storage_chunks,
+                            collection_name=collection_name,
+                            tenant_id=request.tenant_id,
+                            api_key=apikey,
+                            source_document=document_id,
+                            metadata_model_used=model_info["metadata"],
+                            embedding_model_used=model_info["embeddings"]
+                        ))
+                    if not storage_result.get("success", False):
+                        raise HTTPException(status_code=500, detail=f"Milvus storage failed for slice at chunk {first_index}")
+                    inserted_total += storage_result.get("inserted_count", 0)
+                    await _checkpoint(f"stored_{slice_number}", {"inserted_count": storage_result.get("inserted_count", 0)})
+
+                # Later requests with dedup_scope=collection can reuse these chunks
+                if chunk_hash_index:
+                    await asyncio.to_thread(chunk_hash_index.record, request.tenant_id, collection_name, [
+                        (hashes[chunk.index], chunk.chunk_id, document_id) for chunk in slice_chunks
+                    ])
 
-        storage_start = time.time()
-        print(f"  💾 Storing via Milvus Storage Service v1.0.0...")
+    if request.generate_metadata:
+        print(f"  🔍 Extracting enriched metadata (v3.0.0 - 45 fields)...")
+    if request.generate_embeddings:
+        print(f"  🔢 Generating embeddings...")
+    if storing:
+        print(f"  💾 Storing via Milvus Storage Service v1.0.0 (per slice)...")
 
-        if request.storage_mode == StorageMode.new_collection:
-            collection_name = request.collection_name or f"collection_{uuid.uuid4().hex[:8]}"
+    slice_tasks = [asyncio.create_task(_process_slice(number, plan)) for number, plan in enumerate(slices)]
+    try:
+        await asyncio.gather(*slice_tasks)
+    except Exception as e:
+        if checkpointing:
+            # Let the other slices finish and checkpoint their (already paid for) work;
+            # cancelling mid-insert could also store a slice without its "stored" marker
+            await asyncio.gather(*slice_tasks, return_exceptions=True)
         else:
-            collection_name = request.collection_name
-            if not collection_name:
-                raise HTTPException(status_code=400, detail="collection_name required for existing storage mode")
+            for task in slice_tasks:
+                task.cancel()
+        resume_hint = f" (request_id={request_id}: retry to resume from checkpoints)" if checkpointing else ""
+        if isinstance(e, HTTPException):
+            raise HTTPException(status_code=e.status_code, detail=f"{e.detail}{resume_hint}")
+        print(f"  ⚠️  Pipeline slice failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Pipeline failed: {str(e)}{resume_hint}")
+
+    if resuming:
+        print(f"  ♻️  Resumed from checkpoints: {resumed_stages['slices']}/{len(slices)} slices computed, "
+              f"{resumed_stages['stored_slices']} already stored")
+    if checkpointing:
+        await asyncio.to_thread(checkpoint_store.clear, request_id)
+        if time.time() - last_checkpoint_gc >= CHECKPOINT_GC_INTERVAL:
+            last_checkpoint_gc = time.time()
+            await asyncio.to_thread(checkpoint_store.gc)
+
+    def _span_ms(stage: str) -> Optional[float]:
+        spans = stage_spans[stage]
+        if not spans:
+            return None
+        return (max(end for _, end in spans) - min(begin for begin, _ in spans)) * 1000
 
-        try:
-            # Prepare data for storage service (convert ChunkData to dict)
-            storage_chunks = []
-            for chunk in chunks_data:
-                storage_chunk = {
-                    "id": chunk.chunk_id,
-                    "document_id": document_id,
-                    "chunk_index": chunk.index,
-                    "text": chunk.text,
-                    "dense_vector": chunk.dense_embedding,  # Hybrid: dense vector
-                    "sparse_vector": chunk.sparse_embedding,  # Hybrid: sparse vector
-                    "tenant_id": request.tenant_id,
-                    "char_count": chunk.char_count,
-                    "token_count": chunk.token_count,
-                    "created_at": datetime.now(timezone.utc).isoformat(),
-                    "updated_at": datetime.now(timezone.utc).isoformat(),
-
-                    # Basic metadata (7 fields with semantic expansion)
-                    "keywords": chunk.keywords or "",
-                    "topics": chunk.topics or "",
-                    "questions": chunk.questions or "",
-                    "summary": chunk.summary or "",
-                    "semantic_keywords": chunk.semantic_keywords or "",
-                    "entity_relationships": chunk.entity_relationships or "",
-                    "attributes": chunk.attributes or ""
-                }
-                # DEBUG: Log what we're sending to storage
-                if chunk.index == 0:
-                    print(f"DEBUG STORAGE chunk 0: semantic_keywords='{chunk.semantic_keywords}', entity_relationships='{chunk.entity_relationships[:60] if chunk.entity_relationships else 'EMPTY'}', attributes='{chunk.attributes[:60] if chunk.attributes else 'EMPTY'}'")
-                storage_chunks.append(storage_chunk)
-
-            # Call storage service with model information
-            storage_result = await store_in_milvus_storage(
-                chunks_data=storage_chunks,
-                collection_name=collection_name,
-                tenant_id=request.tenant_id,
-                api_key=apikey,
-                source_document=document_id,
-                metadata_model_used=metadata_model_used,
-                embedding_model_used=embedding_model_used
-            )
+    metadata_time = _span_ms("metadata")
+    embeddings_time = _span_ms("embeddings")
+    storage_time = _span_ms("storage")
+    metadata_model_used = model_info["metadata"]
+    embedding_model_used = model_info["embeddings"]
+
+    metadata_concurrency = None
+    if request.generate_metadata:
+        print(f"  ✅ Extracted metadata for {metadata_successful}/{len(chunks)} chunks ({metadata_time or 0:.0f}ms, model: {metadata_model_used})")
+        metadata_concurrency = {
+            "effective": round(metadata_meter.effective, 2),
+            "peak": metadata_meter.peak,
+            "limit": round(metadata_limiter.limit, 2),
+            "calls": metadata_meter.calls,
+            "throttled": metadata_stats.get("throttled", 0),
+            "retries": metadata_stats.get("retries", 0),
+            "errors": metadata_stats.get("errors", 0),
+            "failed": metadata_stats.get("failed", 0)
+        }
+        print(f"  📶 Metadata concurrency: effective {metadata_concurrency['effective']}, peak {metadata_meter.peak}, "
+              f"limit {metadata_concurrency['limit']}, {metadata_concurrency['retries']} re-queued, "
+              f"{metadata_concurrency['failed']} failed")
+    if request.generate_embeddings:
+        print(f"  ✅ Generated {dedup_counts['computed']} embeddings for {len(chunks)} chunks ({embeddings_time or 0:.0f}ms, model: {embedding_model_used})")
 
-            stored_in_milvus = storage_result.get("success", False)
-            storage_time = (time.time() - storage_start) * 1000
-            inserted_count = storage_result.get("inserted_count", 0)
-            print(f"  ✅ Stored {inserted_count} chunks in '{collection_name}' ({storage_time:.0f}ms)")
+    dedup = _dedup_summary(dedup_counts["computed"], dedup_counts["copied"], dedup_counts["reused"])
+    if dedup_counts["copied"] or dedup_counts["reused"]:
+        print(f"  🧬 Dedup: {dedup['computed']}/{len(chunks)} chunks computed, {dedup['copied_within_request']} copied, "
+              f"{dedup['reused_from_collection']} reused from collection (ratio {dedup['dedup_ratio']:.1%})")
 
-        except Exception as e:
-            print(f"  ⚠️  Milvus storage failed: {e}")
-            raise HTTPException(status_code=500, detail=f"Milvus storage failed: {str(e)}")
+    stored_in_milvus = False
+    if storing:
+        stored_in_milvus = inserted_total == len(chunks)
+        print(f"  ✅ Stored {inserted_total} chunks in '{collection_name}' ({storage_time or 0:.0f}ms across {len(slices)} slices)")
 
     # Final response
     total_time = (time.time() - start_time) * 1000
@@ -708,7 +1181,14 @@ async def orchestrate_pipeline(
         document_id=document_id,
         total_chunks=len(chunks_data),
         processing_time_ms=round(total_time, 2),
-        chunks=chunks_data,
+        chunks=[with_float_vector(chunk) for chunk in chunks_data] if request.response_mode == ResponseMode.full else [],
+        chunk_ids=[chunk.chunk_id for chunk in chunks_data] if request.response_mode == ResponseMode.ids else None,
+        response_mode=request.response_mode,
+        pipeline_slices=len(slices),
+        metadata_concurrency=metadata_concurrency,
+        request_id=request_id if checkpointing else None,
+        resumed_stages=resumed_stages if resuming else None,
+        dedup=dedup,
         embeddings_generated=request.generate_embeddings,
         metadata_generated=request.generate_metadata,
         stored_in_milvus=stored_in_milvus,
@@ -717,6 +1197,7 @@ async def orchestrate_pipeline(
         embeddings_time_ms=round(embeddings_time, 2) if embeddings_time else None,
         metadata_time_ms=round(metadata_time, 2) if metadata_time else None,
         storage_time_ms=round(storage_time, 2) if storage_time else None,
+        stream=stream_stats,
         consumer=consumer.username,
         tier=consumer.tier,
         permissions_used=permissions_used
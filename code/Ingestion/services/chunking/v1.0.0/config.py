@@ -15,6 +15,7 @@ sys.path.insert(0, str(SHARED_DIR))
 
 # Import and load environment using config_loader
 from config_loader import load_shared_env, get_env
+from vector_codec import check_encoding
 
 # Load environment configuration (dev/prod/staging)
 load_shared_env()
@@ -54,6 +55,71 @@ print(f"[CONFIG]   Storage v1: {MILVUS_STORAGE_SERVICE_URL}")
 MAX_WORKERS = int(os.getenv("MAX_WORKERS", "5"))
 SERVICE_TIMEOUT = int(os.getenv("SERVICE_TIMEOUT", "60"))
 
+# Dense vectors from the embeddings service and to the storage service travel as
+# base64 little-endian float32 ("base64"), float16 ("base64_float16", lossy) or
+# JSON arrays ("float", for services that predate the encoding)
+VECTOR_ENCODING = check_encoding(os.getenv("VECTOR_ENCODING", "base64"))
+
+# ============================================================================
+# Chunking Engine (CPU offload)
+# ============================================================================
+# Documents at least CHUNKING_OFFLOAD_THRESHOLD_CHARS long are split and
+# tokenized in worker processes so they don't block the event loop.
+CHUNKING_PROCESS_WORKERS = int(os.getenv("CHUNKING_PROCESS_WORKERS", "2"))  # 0 = always inline
+CHUNKING_OFFLOAD_THRESHOLD_CHARS = int(os.getenv("CHUNKING_OFFLOAD_THRESHOLD_CHARS", "200000"))
+CHUNKING_WARM_ENCODINGS = [e.strip() for e in os.getenv("CHUNKING_WARM_ENCODINGS", "cl100k_base").split(",") if e.strip()]
+
+# Streamed documents (/v1/orchestrate/stream) are cut into segments of about
+# this many characters at paragraph/line boundaries; each segment is chunked
+# while the rest of the body is still arriving.
+STREAM_SEGMENT_CHARS = int(os.getenv("STREAM_SEGMENT_CHARS", "262144"))
+MAX_STREAM_CHARS = int(os.getenv("MAX_STREAM_CHARS", "10000000"))  # Same cap as OrchestrationRequest.text
+
+# ============================================================================
+# Pipeline Slicing (metadata ‖ embeddings → storage, per slice of chunks)
+# ============================================================================
+# Chunks are processed in slices: metadata and embeddings for a slice run
+# concurrently, and the slice is stored as soon as both are done.
+PIPELINE_SLICE_SIZE = int(os.getenv("PIPELINE_SLICE_SIZE", "64"))  # <= embeddings MAX_BATCH_SIZE (128)
+PIPELINE_MAX_INFLIGHT_SLICES = int(os.getenv("PIPELINE_MAX_INFLIGHT_SLICES", "8"))
+
+# ============================================================================
+# Adaptive Metadata Concurrency (AIMD)
+# ============================================================================
+# Per-chunk metadata calls share one process-wide limit that grows while
+# latency holds and calls succeed, and halves on 429/503/timeouts. Throttled
+# and transiently failed chunks are re-queued.
+METADATA_CONCURRENCY_INITIAL = int(os.getenv("METADATA_CONCURRENCY_INITIAL", "16"))
+METADATA_CONCURRENCY_MIN = int(os.getenv("METADATA_CONCURRENCY_MIN", "2"))
+METADATA_CONCURRENCY_MAX = int(os.getenv("METADATA_CONCURRENCY_MAX", "128"))
+METADATA_LATENCY_TOLERANCE = float(os.getenv("METADATA_LATENCY_TOLERANCE", "2.0"))  # x best latency
+METADATA_MAX_ERROR_RATE = float(os.getenv("METADATA_MAX_ERROR_RATE", "0.1"))  # No growth above this
+METADATA_MAX_ATTEMPTS = int(os.getenv("METADATA_MAX_ATTEMPTS", "4"))
+METADATA_RETRY_DELAY = float(os.getenv("METADATA_RETRY_DELAY", "0.5"))  # seconds, doubled per attempt
+
+# ============================================================================
+# Stage Checkpoints (resume failed requests)
+# ============================================================================
+# Chunks, per-slice metadata + vectors and per-slice storage markers are
+# persisted per request id while a storing request runs, so a retry resumes
+# at the first incomplete stage. Deleted after success; expired after the TTL.
+CHECKPOINT_ENABLED = os.getenv("CHECKPOINT_ENABLED", "true").lower() == "true"
+CHUNKING_STATE_DIR = os.getenv("CHUNKING_STATE_DIR", str(Path(__file__).resolve().parent / "state"))
+CHECKPOINT_DIR = os.getenv("CHECKPOINT_DIR", CHUNKING_STATE_DIR)
+CHECKPOINT_DB_PATH = os.path.join(CHECKPOINT_DIR, "orchestration_checkpoints.db")
+CHECKPOINT_TTL_HOURS = float(os.getenv("CHECKPOINT_TTL_HOURS", "24"))
+CHECKPOINT_GC_INTERVAL = float(os.getenv("CHECKPOINT_GC_INTERVAL", "600"))  # seconds
+
+# ============================================================================
+# Exact Chunk Deduplication
+# ============================================================================
+# Chunks with identical normalized text are sent through metadata/embeddings
+# once per request (dedup_scope=request). With dedup_scope=collection, stored
+# chunks are looked up by hash in a per-tenant/collection index and their
+# metadata + vector are reused. The index is filled by every storing request.
+CHUNK_DEDUP_INDEX_ENABLED = os.getenv("CHUNK_DEDUP_INDEX_ENABLED", "true").lower() == "true"
+CHUNK_DEDUP_INDEX_DB_PATH = os.getenv("CHUNK_DEDUP_INDEX_DB_PATH", os.path.join(CHUNKING_STATE_DIR, "chunk_hashes.db"))
+
 # ============================================================================
 # Connection Pooling Configuration
 # ============================================================================
@@ -5,13 +5,15 @@ Includes enriched metadata (45 fields from metadata v3.0.0)
 """
 
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union
 from enum import Enum
 
 class ChunkingMethod(str, Enum):
     recursive = "recursive"
     markdown = "markdown"
     token = "token"
+    native = "native"  # Built-in single-pass markdown-aware splitter (exact offsets)
+    token_native = "token_native"  # Token-budget chunks, document tokenized once (exact token counts)
 
 class StorageMode(str, Enum):
     """How to handle vector storage"""
@@ -19,6 +21,18 @@ class StorageMode(str, Enum):
     new_collection = "new"  # Create new collection
     existing = "existing"   # Add to existing collection
 
+class ResponseMode(str, Enum):
+    """How much chunk data to return in the orchestration response"""
+    summary = "summary"     # Counts and timings only (no chunks)
+    ids = "ids"             # Plus chunk ids
+    full = "full"           # Plus full chunks (text, vectors, metadata)
+
+class DedupScope(str, Enum):
+    """Which identical chunks share one computed metadata/vector pair"""
+    none = "none"               # Compute every chunk
+    request = "request"         # Duplicates within this request
+    collection = "collection"   # Plus chunks already stored in the tenant's collection
+
 class MetadataConfig(BaseModel):
     """Configuration for metadata generation"""
     keywords_count: str = Field(default="5", description="Number of keywords to extract")
@@ -52,6 +66,22 @@ class OrchestrationRequest(BaseModel):
     document_id: Optional[str] = Field(default=None, description="Document identifier")
     document_metadata: Optional[Dict[str, Any]] = Field(default=None, description="Additional document metadata")
 
+    # Deduplication
+    dedup_scope: DedupScope = Field(default=DedupScope.request, description="Reuse metadata/vectors for identical chunks: none, request, collection")
+
+    # Response projection
+    response_mode: ResponseMode = Field(default=ResponseMode.summary, description="Response projection: summary, ids, full")
+
+    # Planning
+    dry_run: bool = Field(default=False, description="Chunk and count tokens/calls only - no metadata, embeddings or storage")
+
+    # Checkpointing
+    request_id: Optional[str] = Field(
+        default=None,
+        max_length=128,
+        description="Checkpoint key; retrying with the same id resumes at the first incomplete stage (default: derived from the request body)"
+    )
+
 class ChunkData(BaseModel):
     """
     Single chunk with basic metadata (7 fields with semantic expansion)
@@ -66,12 +96,9 @@ class ChunkData(BaseModel):
     end_char: int
 
     # Vector embeddings (hybrid: dense + sparse from embeddings v3.0.0)
-    dense_embedding: Optional[List[float]] = None  # Dimension from model registry
+    dense_embedding: Optional[Union[List[float], str]] = None  # Dimension from model registry; VECTOR_ENCODING string until the response
     sparse_embedding: Optional[Dict[str, float]] = None  # {token_id: weight}
 
-    # Backward compatibility (deprecated - use dense_embedding instead)
-    embedding: Optional[List[float]] = None
-
     # Basic metadata (7 fields - what gets stored in database)
     keywords: Optional[str] = None
     topics: Optional[str] = None
@@ -87,8 +114,10 @@ class OrchestrationResponse(BaseModel):
     total_chunks: int
     processing_time_ms: float
 
-    # Chunks with all data (45 metadata fields per chunk)
-    chunks: List[ChunkData]
+    # Chunks with all data (only with response_mode=full)
+    chunks: List[ChunkData] = Field(default_factory=list)
+    chunk_ids: Optional[List[str]] = None  # response_mode=ids
+    response_mode: ResponseMode = ResponseMode.summary
 
     # Pipeline status
     embeddings_generated: bool
@@ -101,6 +130,13 @@ class OrchestrationResponse(BaseModel):
     embeddings_time_ms: Optional[float] = None
     metadata_time_ms: Optional[float] = None
     storage_time_ms: Optional[float] = None
+    pipeline_slices: Optional[int] = Field(default=None, description="Slices processed through metadata ‖ embeddings → storage")
+    metadata_concurrency: Optional[Dict[str, Any]] = Field(default=None, description="Adaptive limiter stats: effective/peak concurrency, limit, retries, errors, failed chunks")
+    request_id: Optional[str] = Field(default=None, description="Checkpoint key of this request")
+    resumed_stages: Optional[Dict[str, int]] = Field(default=None, description="Work reused from checkpoints of a previous attempt")
+    dedup: Optional[Dict[str, Any]] = Field(default=None, description="Exact-duplicate chunks: scope, computed vs reused counts, dedup_ratio")
+    dry_run_plan: Optional[Dict[str, Any]] = Field(default=None, description="dry_run only: chunks, tokens and the metadata/embedding/storage calls a real run would make")
+    stream: Optional[Dict[str, Any]] = Field(default=None, description="/v1/orchestrate/stream only: characters, segments chunked during upload, upload/chunking times")
 
     # Permission info
     consumer: Optional[str] = None
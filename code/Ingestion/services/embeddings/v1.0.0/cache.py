@@ -1,23 +1,49 @@
 #!/usr/bin/env python3
 """
 Response caching for Embeddings Service v3.0.1
-LRU cache with TTL for embeddings responses
+LRU cache with TTL for embedding vectors, keyed per text
+
+Entries are keyed on the hash of the normalized text (Unicode NFC, whitespace
+runs collapsed, ends trimmed - the same normalization the chunking service
+uses for exact-duplicate chunks) plus model and normalize flag; the vector
+dimension is fixed per model. A batch that shares most texts with an earlier
+one only sends the missing texts to the provider.
+
+DiskEmbeddingsCache is an optional second tier: a SQLite file on local disk
+holding vectors as packed float16 blobs, shared by every worker process on
+the host and kept across restarts, evicted least-recently-used by total bytes.
 """
 
+import hashlib
+import struct
 import time
+import unicodedata
 from collections import OrderedDict
-from typing import Optional, List, Any
+from typing import Dict, List, Optional, Tuple
+
+from sqlite_store import SQLiteStore
+
+
+def normalize_text(text: str) -> str:
+    """Unicode NFC with whitespace runs collapsed and ends trimmed"""
+    return unicodedata.normalize("NFC", " ".join(text.split()))
+
+
+def cache_key(text: str, model: str, normalize: bool) -> str:
+    """Cache key of one text under the request parameters"""
+    text_hash = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+    return f"{text_hash}_{model}_{normalize}"
 
 
 class EmbeddingsCache:
-    """LRU cache with TTL for embeddings responses"""
+    """LRU cache with TTL for per-text embedding vectors"""
 
     def __init__(self, max_size: int = 10000, ttl: int = 7200):
         """
         Initialize cache
 
         Args:
-            max_size: Maximum number of entries
+            max_size: Maximum number of cached vectors
             ttl: Time-to-live in seconds (default 2 hours)
         """
         self.max_size = max_size
@@ -26,14 +52,9 @@ class EmbeddingsCache:
         self.hits = 0
         self.misses = 0
 
-    def _generate_key(self, texts: List[str], model: str, normalize: bool) -> str:
-        """Generate cache key from request parameters"""
-        text_key = "|".join(texts)
-        return f"{text_key}_{model}_{normalize}"
-
-    def get(self, texts: List[str], model: str, normalize: bool) -> Optional[Any]:
+    def get_many(self, texts: List[str], model: str, normalize: bool) -> Tuple[Dict[int, List[float]], Optional[float]]:
         """
-        Get cached embeddings response
+        Get cached vectors for a batch of texts
 
         Args:
             texts: Input texts
@@ -41,54 +62,57 @@ class EmbeddingsCache:
             normalize: Normalization flag
 
         Returns:
-            Cached response or None if not found/expired
+            (vectors by position of the texts found, age in seconds of the oldest hit or None)
         """
-        key = self._generate_key(texts, model, normalize)
+        now = time.time()
+        found: Dict[int, List[float]] = {}
+        oldest = None
 
-        if key in self.cache:
-            entry = self.cache[key]
-            age = time.time() - entry["timestamp"]
+        for i, text in enumerate(texts):
+            key = cache_key(text, model, normalize)
+            entry = self.cache.get(key)
+            if entry is None:
+                self.misses += 1
+                continue
 
+            age = now - entry["timestamp"]
             # Check if expired
             if age > self.ttl:
                 del self.cache[key]
                 self.misses += 1
-                return None
+                continue
 
             # Move to end (most recently used)
             self.cache.move_to_end(key)
             self.hits += 1
+            found[i] = entry["embedding"]
+            oldest = age if oldest is None else max(oldest, age)
 
-            # Add cache age to response
-            response = entry["response"].copy()
-            response["cached"] = True
-            response["cache_age_seconds"] = age
+        return found, oldest
 
-            return response
-
-        self.misses += 1
-        return None
-
-    def set(self, texts: List[str], model: str, normalize: bool, response: Any):
+    def set_many(self, texts: List[str], model: str, normalize: bool, embeddings: List[List[float]]):
         """
-        Cache embeddings response
+        Cache the vectors of a batch of texts
 
         Args:
             texts: Input texts
             model: Model name
             normalize: Normalization flag
-            response: Response to cache
+            embeddings: Vector per text (same order)
         """
-        key = self._generate_key(texts, model, normalize)
+        now = time.time()
+        for text, embedding in zip(texts, embeddings):
+            key = cache_key(text, model, normalize)
 
-        # Remove oldest if at capacity
-        if len(self.cache) >= self.max_size and key not in self.cache:
-            self.cache.popitem(last=False)
+            # Remove oldest if at capacity
+            if len(self.cache) >= self.max_size and key not in self.cache:
+                self.cache.popitem(last=False)
 
-        self.cache[key] = {
-            "response": response,
-            "timestamp": time.time()
-        }
+            self.cache[key] = {
+                "embedding": embedding,
+                "timestamp": now
+            }
+            self.cache.move_to_end(key)
 
     def clear(self):
         """Clear all cache entries"""
@@ -97,7 +121,7 @@ class EmbeddingsCache:
         self.misses = 0
 
     def stats(self) -> dict:
-        """Get cache statistics"""
+        """Get cache statistics (hits and misses count texts, not requests)"""
         total = self.hits + self.misses
         hit_rate = (self.hits / total * 100) if total > 0 else 0
 
@@ -113,5 +137,173 @@ class EmbeddingsCache:
         }
 
 
-# Global cache instance
-embeddings_cache = EmbeddingsCache()
+class DiskEmbeddingsCache(SQLiteStore):
+    """
+    SQLite tier of float16 vectors shared by all worker processes on a host
+
+    Vectors are stored as little-endian float16 (half the size of float32,
+    ~3 significant digits - well below the noise of cosine ranking). Total
+    blob bytes are tracked in the database; once they exceed max_bytes, the
+    least recently used vectors are deleted down to 90% of max_bytes.
+    """
+
+    ACCESS_RESOLUTION = 60.0  # Seconds - last-access times are refreshed at most this often
+    QUERY_CHUNK = 500  # Keys per IN (...) query (SQLite variable limit)
+
+    def __init__(self, db_path: str, max_bytes: int, ttl: int = 0):
+        """
+        Initialize cache
+
+        Args:
+            db_path: Path to the SQLite database file (created if missing)
+            max_bytes: Maximum total size of the stored vectors
+            ttl: Time-to-live in seconds (0 = vectors never expire)
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        # Other worker processes write to the same file: wait for their locks instead of failing
+        super().__init__(db_path, timeout=30.0)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS vectors (
+                key TEXT PRIMARY KEY,
+                dimension INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_vectors_accessed ON vectors (accessed_at);
+            CREATE TABLE IF NOT EXISTS usage (
+                id INTEGER PRIMARY KEY CHECK (id = 0),
+                total_bytes INTEGER NOT NULL
+            );
+            INSERT OR IGNORE INTO usage (id, total_bytes) VALUES (0, 0);
+        """)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def pack(vector: List[float]) -> bytes:
+        """float16 blob of a vector (OverflowError beyond +-65504)"""
+        return struct.pack(f"<{len(vector)}e", *vector)
+
+    @staticmethod
+    def unpack(blob: bytes, dimension: int) -> List[float]:
+        return list(struct.unpack(f"<{dimension}e", blob))
+
+    def get_many(self, texts: List[str], model: str, normalize: bool) -> Dict[int, List[float]]:
+        """
+        Get stored vectors for a batch of texts
+
+        Returns:
+            Vectors by position of the texts found
+        """
+        keys = [cache_key(text, model, normalize) for text in texts]
+        now = time.time()
+        rows = {}
+        with self._lock:
+            for start in range(0, len(keys), self.QUERY_CHUNK):
+                chunk = list(set(keys[start:start + self.QUERY_CHUNK]))
+                placeholders = ",".join("?" * len(chunk))
+                for row in self._conn.execute(
+                    f"SELECT key, dimension, vector, created_at, accessed_at FROM vectors WHERE key IN ({placeholders})",
+                    chunk
+                ):
+                    if not self.ttl or now - row["created_at"] <= self.ttl:
+                        rows[row["key"]] = row
+            stale = [key for key, row in rows.items() if now - row["accessed_at"] > self.ACCESS_RESOLUTION]
+            if stale:
+                self._conn.executemany("UPDATE vectors SET accessed_at = ? WHERE key = ?", [(now, key) for key in stale])
+
+        found = {}
+        for i, key in enumerate(keys):
+            row = rows.get(key)
+            if row is None:
+                self.misses += 1
+                continue
+            self.hits += 1
+            found[i] = self.unpack(row["vector"], row["dimension"])
+        return found
+
+    def set_many(self, texts: List[str], model: str, normalize: bool, embeddings: List[List[float]]):
+        """Store the vectors of a batch of texts, then evict down to max_bytes if needed"""
+        now = time.time()
+        entries = {}
+        for text, embedding in zip(texts, embeddings):
+            try:
+                entries[cache_key(text, model, normalize)] = (len(embedding), self.pack(embedding))
+            except (OverflowError, struct.error):
+                continue  # Not representable as float16 - keep it in memory only
+        if not entries:
+            return
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                keys = list(entries)
+                replaced = 0
+                for start in range(0, len(keys), self.QUERY_CHUNK):
+                    chunk = keys[start:start + self.QUERY_CHUNK]
+                    placeholders = ",".join("?" * len(chunk))
+                    replaced += self._conn.execute(
+                        f"SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM vectors WHERE key IN ({placeholders})", chunk
+                    ).fetchone()[0]
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO vectors (key, dimension, vector, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                    [(key, dimension, blob, now, now) for key, (dimension, blob) in entries.items()]
+                )
+                added = sum(len(blob) for _, blob in entries.values())
+                self._conn.execute("UPDATE usage SET total_bytes = total_bytes + ? WHERE id = 0", (added - replaced,))
+                total = self._conn.execute("SELECT total_bytes FROM usage WHERE id = 0").fetchone()[0]
+                if total > self.max_bytes:
+                    self._evict(total, int(self.max_bytes * 0.9))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _evict(self, total: int, target: int):
+        """Delete least recently used vectors until total bytes <= target (inside a transaction)"""
+        freed = 0
+        keys = []
+        for row in self._conn.execute("SELECT key, LENGTH(vector) AS size FROM vectors ORDER BY accessed_at"):
+            if total - freed <= target:
+                break
+            keys.append(row["key"])
+            freed += row["size"]
+        self._conn.executemany("DELETE FROM vectors WHERE key = ?", [(key,) for key in keys])
+        self._conn.execute("UPDATE usage SET total_bytes = total_bytes - ? WHERE id = 0", (freed,))
+        self.evictions += len(keys)
+
+    def clear(self):
+        """Delete every stored vector (for all workers sharing the file)"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("DELETE FROM vectors")
+                self._conn.execute("UPDATE usage SET total_bytes = 0 WHERE id = 0")
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        """Get tier statistics (entries and bytes are host-wide, hits and misses this worker's)"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM vectors").fetchone()[0]
+            total = self._conn.execute("SELECT total_bytes FROM usage WHERE id = 0").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "enabled": True,
+            "path": self.db_path,
+            "entries": entries,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / lookups * 100) if lookups > 0 else 0,
+            "evictions": self.evictions,
+            "ttl_seconds": self.ttl
+        }
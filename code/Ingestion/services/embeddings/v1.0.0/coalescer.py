@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Request coalescing for Embeddings Service v3.0.2
+Micro-batches small concurrent requests into one provider call per model
+
+Query-time callers send one text per request. With coalescing enabled, the
+texts of concurrent requests for the same model are held for at most
+max_wait_ms (or until max_batch texts are queued), sent to the provider as
+one batch, and each request gets its own vectors back. Requests with
+max_batch or more texts go straight to the provider.
+"""
+
+import asyncio
+import time
+from bisect import bisect_left
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+class Histogram:
+    """Fixed-bucket histogram (each observation counts in the first bucket with value <= bound)"""
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = list(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # Last bucket: above every bound
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def snapshot(self) -> dict:
+        buckets = {f"le_{bound:g}": n for bound, n in zip(self.bounds, self.counts)}
+        buckets[f"gt_{self.bounds[-1]:g}"] = self.counts[-1]
+        return {
+            "buckets": buckets,
+            "count": self.count,
+            "mean": round(self.total / self.count, 3) if self.count else 0.0,
+            "max": round(self.max, 3)
+        }
+
+
+class RequestCoalescer:
+    """Groups concurrent embedding requests per (model, provider) into shared provider batches"""
+
+    FILL_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+    WAIT_BUCKETS_MS = (0.5, 1, 2, 5, 10, 20, 50, 100)
+
+    def __init__(
+        self,
+        embed_fn: Callable[[List[str], str, str, Optional[List[int]]], Awaitable[List[Any]]],
+        max_wait_ms: float = 5.0,
+        max_batch: int = 64
+    ):
+        """
+        Initialize coalescer
+
+        Args:
+            embed_fn: Async callable (texts, model, provider, token_counts) returning one vector per text
+            max_wait_ms: Longest a request is held waiting for others to join its batch
+            max_batch: Texts per provider batch (a full batch is sent immediately)
+        """
+        self.embed_fn = embed_fn
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_batch = max_batch
+        self._pending: Dict[Tuple[str, str], List[tuple]] = {}  # key -> [(texts, token_counts, future, enqueued_at)]
+        self._pending_texts: Dict[Tuple[str, str], int] = {}
+        self._timers: Dict[Tuple[str, str], asyncio.TimerHandle] = {}
+        self._tasks: set = set()
+
+        # Stats
+        self.requests = 0
+        self.bypassed = 0
+        self.batches = 0
+        self.batch_fill = Histogram(self.FILL_BUCKETS)  # Distinct texts per provider batch
+        self.batch_requests = Histogram(self.FILL_BUCKETS)  # Requests sharing a provider batch
+        self.added_wait_ms = Histogram(self.WAIT_BUCKETS_MS)  # Time a request was held before dispatch
+
+    async def embed(
+        self,
+        texts: List[str],
+        model: str,
+        provider: str,
+        token_counts: Optional[List[int]] = None
+    ) -> List[Any]:
+        """
+        Embed texts, sharing the provider call with concurrent requests
+
+        token_counts (exact tokens per text, if known) travel with the texts
+        into the shared batch so it is split on real token counts.
+
+        Returns:
+            One vector per text, in input order
+
+        Raises:
+            Whatever embed_fn raised for the shared batch
+        """
+        self.requests += 1
+        if len(texts) >= self.max_batch:
+            self.bypassed += 1
+            return await self.embed_fn(texts, model, provider, token_counts)
+
+        key = (model, provider)
+        if self._pending_texts.get(key, 0) + len(texts) > self.max_batch:
+            self._dispatch(key)  # Would overflow: send what is queued, start a new batch
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.setdefault(key, []).append((texts, token_counts, future, time.perf_counter()))
+        self._pending_texts[key] = self._pending_texts.get(key, 0) + len(texts)
+
+        if self._pending_texts[key] >= self.max_batch:
+            self._dispatch(key)
+        elif key not in self._timers:
+            self._timers[key] = asyncio.get_running_loop().call_later(self.max_wait, self._dispatch, key)
+
+        return await future
+
+    def _dispatch(self, key: Tuple[str, str]):
+        """Send the requests queued for key as one provider batch"""
+        timer = self._timers.pop(key, None)
+        if timer:
+            timer.cancel()
+        entries = self._pending.pop(key, [])
+        self._pending_texts.pop(key, None)
+        if not entries:
+            return
+        task = asyncio.create_task(self._send(key, entries))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, key: Tuple[str, str], entries: List[tuple]):
+        now = time.perf_counter()
+        # Identical texts from different requests (the same query twice) are embedded once
+        positions: Dict[str, int] = {}
+        tokens: List[int] = []
+        for texts, token_counts, _, enqueued_at in entries:
+            self.added_wait_ms.observe((now - enqueued_at) * 1000)
+            if token_counts is None or len(token_counts) != len(texts):
+                token_counts = [len(text) // 4 for text in texts]  # Same estimate as an uncounted request
+            for text, count in zip(texts, token_counts):
+                if text not in positions:
+                    positions[text] = len(positions)
+                    tokens.append(count)
+        batch = list(positions)
+        self.batches += 1
+        self.batch_fill.observe(len(batch))
+        self.batch_requests.observe(len(entries))
+
+        model, provider = key
+        try:
+            vectors = await self.embed_fn(batch, model, provider, tokens)
+        except Exception as e:
+            for _, _, future, _ in entries:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for texts, _, future, _ in entries:
+            if not future.done():
+                future.set_result([vectors[positions[text]] for text in texts])
+
+    async def close(self):
+        """Send everything still queued and wait for in-flight batches"""
+        for key in list(self._pending):
+            self._dispatch(key)
+        if self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def stats(self) -> dict:
+        """Get coalescing statistics"""
+        return {
+            "enabled": True,
+            "max_wait_ms": self.max_wait * 1000,
+            "max_batch": self.max_batch,
+            "requests": self.requests,
+            "bypassed": self.bypassed,
+            "batches": self.batches,
+            "pending_requests": sum(len(entries) for entries in self._pending.values()),
+            "batch_fill": self.batch_fill.snapshot(),
+            "batch_requests": self.batch_requests.snapshot(),
+            "added_wait_ms": self.added_wait_ms.snapshot()
+        }
@@ -93,7 +93,22 @@ MODEL_PROVIDERS = {
 
 # Batch configuration
 DEFAULT_BATCH_SIZE = int(os.getenv("BATCH_SIZE", "32"))
-MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "128"))
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "128"))  # Texts per provider call (default for every provider)
+
+# Requests with more texts or tokens than one provider call allows are split into
+# sub-batches, SPLIT_MAX_PARALLEL of them in flight per request, reassembled in order
+MAX_INPUT_TEXTS = int(os.getenv("MAX_INPUT_TEXTS", "16384"))  # Texts per request (memory bound)
+SPLIT_MAX_PARALLEL = int(os.getenv("EMBEDDINGS_SPLIT_MAX_PARALLEL", "4"))
+MAX_BATCH_TOKENS = int(os.getenv("MAX_BATCH_TOKENS", "100000"))  # Tokens per provider call (default for every provider)
+
+# Per-provider call limits: (max texts, max tokens)
+PROVIDER_BATCH_LIMITS = {
+    provider: (
+        int(os.getenv(f"{provider.upper()}_MAX_BATCH_ITEMS", str(MAX_BATCH_SIZE))),
+        int(os.getenv(f"{provider.upper()}_MAX_BATCH_TOKENS", str(MAX_BATCH_TOKENS)))
+    )
+    for provider in ("nebius", "sambanova", "jina")
+}
 
 # Concurrency configuration (parallel API calls)
 MAX_CONCURRENT_REQUESTS = 50
@@ -106,6 +121,21 @@ ENABLE_CACHING = os.getenv("ENABLE_CACHING", "true").lower() == "true"
 CACHE_TTL = int(os.getenv("CACHE_TTL", "7200"))  # 2 hours default
 CACHE_MAX_SIZE = int(os.getenv("CACHE_MAX_SIZE", "10000"))  # 10000 entries
 
+# Persistent cache tier (optional): float16 vectors in a local SQLite file shared by
+# all worker processes on the host and kept across restarts
+DISK_CACHE_ENABLED = os.getenv("EMBEDDINGS_DISK_CACHE_ENABLED", "false").lower() == "true"
+DISK_CACHE_PATH = os.getenv(
+    "EMBEDDINGS_DISK_CACHE_PATH", str(Path(__file__).resolve().parent / "state" / "embeddings_cache.db")
+)
+DISK_CACHE_MAX_BYTES = int(os.getenv("EMBEDDINGS_DISK_CACHE_MAX_BYTES", str(2 * 1024 ** 3)))  # 2 GiB of vectors
+DISK_CACHE_TTL = int(os.getenv("EMBEDDINGS_DISK_CACHE_TTL", "0"))  # seconds, 0 = never expire
+
+# Request coalescing (optional): concurrent small requests for the same model are held up to
+# COALESCE_MAX_WAIT_MS and sent to the provider as one batch of up to COALESCE_MAX_BATCH texts
+COALESCE_ENABLED = os.getenv("EMBEDDINGS_COALESCE_ENABLED", "false").lower() == "true"
+COALESCE_MAX_WAIT_MS = float(os.getenv("EMBEDDINGS_COALESCE_MAX_WAIT_MS", "5"))
+COALESCE_MAX_BATCH = min(int(os.getenv("EMBEDDINGS_COALESCE_MAX_BATCH", "64")), MAX_BATCH_SIZE)
+
 # Rate limit handling
 ENABLE_RETRY = os.getenv("ENABLE_RETRY", "true").lower() == "true"
 MAX_RETRIES = int(os.getenv("MAX_RETRIES", "3"))
@@ -11,13 +11,16 @@ import httpx
 import uvicorn
 import time
 import asyncio
+import sqlite3
 from contextlib import asynccontextmanager
-from typing import List
+from typing import List, Optional
 
 # Import configurations and models
 from config import *
 from models import *
-from cache import embeddings_cache
+from cache import DiskEmbeddingsCache, EmbeddingsCache, normalize_text
+from coalescer import RequestCoalescer
+from vector_codec import VECTOR_ENCODING_FLOAT, VECTOR_ENCODINGS, encode_vector
 
 # ============================================================================
 # Service Initialization
@@ -29,13 +32,20 @@ TOTAL_REQUESTS = 0
 # Global HTTP client with connection pooling
 http_client = None
 
+# Per-process LRU cache; optional host-wide disk tier (created in lifespan)
+embeddings_cache = EmbeddingsCache(max_size=CACHE_MAX_SIZE, ttl=CACHE_TTL)
+disk_cache = None
+
+# Optional micro-batching of concurrent small requests (created in lifespan)
+coalescer = None
+
 # Semaphore for concurrent request limiting
 request_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup/shutdown"""
-    global http_client
+    global http_client, disk_cache, coalescer
 
     # Startup
     print("=" * 80)
@@ -52,7 +62,13 @@ async def lifespan(app: FastAPI):
     print(f"Model Dimension: {MODEL_DIMENSIONS[DEFAULT_MODEL]}")
     print(f"Model Provider: {get_provider_for_model(DEFAULT_MODEL)}")
     print(f"Caching enabled: {ENABLE_CACHING} (TTL={CACHE_TTL}s, Max={CACHE_MAX_SIZE})")
+    if ENABLE_CACHING and DISK_CACHE_ENABLED:
+        disk_cache = DiskEmbeddingsCache(DISK_CACHE_PATH, DISK_CACHE_MAX_BYTES, DISK_CACHE_TTL)
+        print(f"Disk cache: {DISK_CACHE_PATH} (float16, Max={DISK_CACHE_MAX_BYTES} bytes)")
     print(f"Max concurrent requests: {MAX_CONCURRENT_REQUESTS}")
+    if COALESCE_ENABLED:
+        coalescer = RequestCoalescer(embed_with_provider, COALESCE_MAX_WAIT_MS, COALESCE_MAX_BATCH)
+        print(f"Request coalescing: wait<={COALESCE_MAX_WAIT_MS}ms, batch<={COALESCE_MAX_BATCH} texts")
     print("=" * 80)
 
     # Create persistent HTTP client with connection pooling
@@ -87,7 +103,11 @@ async def lifespan(app: FastAPI):
     yield
 
     # Shutdown
+    if coalescer:
+        await coalescer.close()
     await http_client.aclose()
+    if disk_cache:
+        disk_cache.close()
     print("Embeddings Service shut down")
 
 app = FastAPI(
@@ -142,6 +162,29 @@ def count_tokens_approx(texts: List[str]) -> int:
     """Approximate token count (4 chars ≈ 1 token)"""
     return sum(len(text) // 4 for text in texts)
 
+def split_batches(token_counts: List[int], max_items: int, max_tokens: int) -> List[range]:
+    """
+    Split texts into consecutive provider-sized sub-batches
+
+    Args:
+        token_counts: Tokens per text (exact or estimated)
+        max_items: Maximum texts per sub-batch
+        max_tokens: Maximum tokens per sub-batch (a longer single text gets a sub-batch of its own)
+
+    Returns:
+        Index ranges of the sub-batches, in order
+    """
+    batches = []
+    start, tokens = 0, 0
+    for i, count in enumerate(token_counts):
+        if i > start and (i - start >= max_items or tokens + count > max_tokens):
+            batches.append(range(start, i))
+            start, tokens = i, 0
+        tokens += count
+    if start < len(token_counts):
+        batches.append(range(start, len(token_counts)))
+    return batches
+
 async def call_nebius_api(texts: List[str], model: str) -> dict:
     """
     Call Nebius AI Studio embeddings API
@@ -336,6 +379,95 @@ def get_provider_for_model(model: str) -> str:
     # Default to nebius if unknown
     return "nebius"
 
+async def embed_with_provider(
+    texts: List[str],
+    model: str,
+    provider: str,
+    token_counts: Optional[List[int]] = None
+) -> List[List[float]]:
+    """
+    Embed texts with the model's provider, in as many calls as its batch limits require
+
+    Sub-batches (PROVIDER_BATCH_LIMITS items/tokens) run SPLIT_MAX_PARALLEL at a
+    time; if one fails, the others are cancelled and its error is raised.
+
+    Args:
+        texts: Texts to embed
+        model: Model name
+        provider: Provider of the model
+        token_counts: Exact tokens per text (None = len/4 estimate)
+
+    Returns:
+        One vector per text, in input order
+
+    Raises:
+        HTTPException 503 if the provider is not configured, or on API errors
+    """
+    if token_counts is None or len(token_counts) != len(texts):
+        token_counts = [len(text) // 4 for text in texts]
+    max_items, max_tokens = PROVIDER_BATCH_LIMITS.get(provider, (MAX_BATCH_SIZE, MAX_BATCH_TOKENS))
+    batches = split_batches(token_counts, max_items, max_tokens)
+    if len(batches) == 1:
+        return await call_provider(texts, model, provider)
+
+    limiter = asyncio.Semaphore(SPLIT_MAX_PARALLEL)
+
+    async def _run(batch: range) -> List[List[float]]:
+        async with limiter:
+            return await call_provider(texts[batch.start:batch.stop], model, provider)
+
+    tasks = [asyncio.create_task(_run(batch)) for batch in batches]
+    try:
+        results = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+    return [vector for result in results for vector in result]
+
+async def call_provider(texts: List[str], model: str, provider: str) -> List[List[float]]:
+    """
+    Embed texts with one call to the model's provider
+
+    Returns:
+        One vector per text, in input order
+
+    Raises:
+        HTTPException 503 if the provider is not configured, or on API errors
+    """
+    # Call appropriate API based on provider
+    if provider == "jina":
+        if not JINA_API_KEY:
+            raise HTTPException(
+                status_code=503,
+                detail="Jina AI provider not configured. Please set JINA_API_KEY."
+            )
+        api_response = await call_jina_api(texts, model)
+    elif provider == "sambanova":
+        if not SAMBANOVA_API_KEY:
+            raise HTTPException(
+                status_code=503,
+                detail="SambaNova AI provider not configured. Please set SAMBANOVA_API_KEY."
+            )
+        api_response = await call_sambanova_api(texts, model)
+    else:  # nebius
+        if not NEBIUS_API_KEY:
+            raise HTTPException(
+                status_code=503,
+                detail="Nebius AI provider not configured. Please set NEBIUS_API_KEY."
+            )
+        api_response = await call_nebius_api(texts, model)
+
+    # Extract embeddings from API response
+    # All providers follow OpenAI format: {"data": [{"embedding": [...], "index": 0}, ...]}
+    items = sorted(api_response.get("data", []), key=lambda item: item["index"])
+    if len(items) != len(texts):
+        raise HTTPException(
+            status_code=502,
+            detail=f"{provider} API returned {len(items)} embeddings for {len(texts)} texts"
+        )
+    return [item["embedding"] for item in items]
+
 # ============================================================================
 # API Endpoints
 # ============================================================================
@@ -395,15 +527,39 @@ async def health_check():
 
 @app.get("/cache/stats")
 async def cache_stats():
-    """Get cache statistics"""
-    return embeddings_cache.stats()
+    """Get cache statistics (disk tier under "disk")"""
+    stats = embeddings_cache.stats()
+    stats["disk"] = await asyncio.to_thread(disk_cache.stats) if disk_cache else {"enabled": False}
+    return stats
 
 @app.post("/cache/clear")
 async def clear_cache():
-    """Clear all cached embeddings"""
+    """Clear all cached embeddings (the disk tier for every worker on the host)"""
     embeddings_cache.clear()
+    if disk_cache:
+        await asyncio.to_thread(disk_cache.clear)
     return {"status": "ok", "message": "Cache cleared successfully"}
 
+@app.get("/coalescer/stats")
+async def coalescer_stats():
+    """Get request coalescing statistics (batch fill and added wait histograms)"""
+    return coalescer.stats() if coalescer else {"enabled": False}
+
+async def disk_cache_lookup(texts: List[str], model: str, normalize: bool) -> dict:
+    """Disk tier lookup; a failing disk tier is reported and treated as a miss"""
+    try:
+        return await asyncio.to_thread(disk_cache.get_many, texts, model, normalize)
+    except sqlite3.Error as e:
+        print(f"⚠️  Disk cache lookup failed: {e}")
+        return {}
+
+async def disk_cache_store(texts: List[str], model: str, normalize: bool, embeddings: List[List[float]]):
+    """Write vectors to the disk tier; failures only cost future hits"""
+    try:
+        await asyncio.to_thread(disk_cache.set_many, texts, model, normalize, embeddings)
+    except sqlite3.Error as e:
+        print(f"⚠️  Disk cache write failed: {e}")
+
 @app.post("/v1/embeddings", response_model=DenseEmbeddingResponse)
 async def create_dense_embeddings(request: EmbeddingRequest):
     """
@@ -420,7 +576,8 @@ async def create_dense_embeddings(request: EmbeddingRequest):
     {
         "input": "Your text here",
         "model": "jina-embeddings-v3",  // or "intfloat/e5-mistral-7b-instruct"
-        "normalize": true
+        "normalize": true,
+        "encoding_format": "float"  // or "base64" (LE float32), "base64_float16"
     }
 
     Response:
@@ -433,9 +590,21 @@ async def create_dense_embeddings(request: EmbeddingRequest):
         ],
         "model": "jina-embeddings-v3",
         "dense_dimension": 1024,  // Varies by model (from model registry)
-        "source": "jina_api",  // or "nebius_api"
+        "source": "jina_api",  // or "nebius_api"; "cache" if every vector was cached
+        "cache_hits": 0,
+        "cache_misses": 1,
+        "cache_hit_ratio": 0.0,
         ...
     }
+
+    With a base64 encoding_format each dense_embedding is a base64 string of
+    the packed little-endian vector instead of a JSON array (~4x smaller,
+    decoded without float parsing by the orchestrator and storage).
+
+    Caching is per text: cached vectors are merged with freshly embedded ones
+    in input order, and only the missed texts (each distinct one once) are
+    sent to the provider - split into provider-sized sub-batches when they
+    exceed its item or token limit.
     """
     try:
         # Convert input to list
@@ -444,83 +613,93 @@ async def create_dense_embeddings(request: EmbeddingRequest):
         if not texts:
             raise HTTPException(status_code=400, detail="Input cannot be empty")
 
-        # Validate batch size
-        if len(texts) > MAX_BATCH_SIZE:
+        # Validate batch size (larger-than-provider batches are split, see embed_with_provider)
+        if len(texts) > MAX_INPUT_TEXTS:
             raise HTTPException(
                 status_code=400,
-                detail=f"Batch size {len(texts)} exceeds maximum {MAX_BATCH_SIZE}"
+                detail=f"Batch size {len(texts)} exceeds maximum {MAX_INPUT_TEXTS}"
             )
 
-        # Check cache first
-        cached_result = None
-        if ENABLE_CACHING:
-            cached_result = embeddings_cache.get(texts, request.model, request.normalize)
-
-        if cached_result:
-            # Return cached embeddings
-            return DenseEmbeddingResponse(**cached_result)
+        if request.encoding_format not in VECTOR_ENCODINGS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown encoding_format '{request.encoding_format}' (supported: {', '.join(VECTOR_ENCODINGS)})"
+            )
 
-        # Cache miss - determine provider and call API
+        # Check cache first (per text: only the missed texts go to the provider)
         start_time = time.time()
         provider = get_provider_for_model(request.model)
-
-        # Call appropriate API based on provider
-        if provider == "jina":
-            if not JINA_API_KEY:
-                raise HTTPException(
-                    status_code=503,
-                    detail="Jina AI provider not configured. Please set JINA_API_KEY."
-                )
-            api_response = await call_jina_api(texts, request.model)
-        elif provider == "sambanova":
-            if not SAMBANOVA_API_KEY:
-                raise HTTPException(
-                    status_code=503,
-                    detail="SambaNova AI provider not configured. Please set SAMBANOVA_API_KEY."
-                )
-            api_response = await call_sambanova_api(texts, request.model)
-        else:  # nebius
-            if not NEBIUS_API_KEY:
-                raise HTTPException(
-                    status_code=503,
-                    detail="Nebius AI provider not configured. Please set NEBIUS_API_KEY."
-                )
-            api_response = await call_nebius_api(texts, request.model)
-
-        processing_time = (time.time() - start_time) * 1000
-
-        # Extract embeddings from API response
-        # Both Nebius and Jina follow OpenAI format: {"data": [{"embedding": [...], "index": 0}, ...]}
-        embedding_data = []
-        for item in api_response.get("data", []):
-            embedding_data.append(
-                DenseEmbeddingData(
-                    dense_embedding=item["embedding"],
-                    index=item["index"]
-                )
-            )
+        cached_vectors, cache_age = {}, None
+        disk_hits = 0
+        if ENABLE_CACHING:
+            cached_vectors, cache_age = embeddings_cache.get_many(texts, request.model, request.normalize)
+            if disk_cache and len(cached_vectors) < len(texts):
+                # Second tier: vectors embedded by another worker or before a restart
+                positions = [i for i in range(len(texts)) if i not in cached_vectors]
+                found = await disk_cache_lookup([texts[i] for i in positions], request.model, request.normalize)
+                if found:
+                    promoted = {positions[j]: vector for j, vector in found.items()}
+                    embeddings_cache.set_many(
+                        [texts[i] for i in promoted], request.model, request.normalize, list(promoted.values())
+                    )
+                    cached_vectors.update(promoted)
+                    disk_hits = len(promoted)
+
+        # Identical missed texts are embedded once
+        missed_positions = {}  # normalized text -> positions in texts
+        for i, text in enumerate(texts):
+            if i not in cached_vectors:
+                missed_positions.setdefault(normalize_text(text), []).append(i)
+        missed_texts = [texts[positions[0]] for positions in missed_positions.values()]
+        missed_tokens = None
+        if request.token_counts and len(request.token_counts) == len(texts):
+            missed_tokens = [request.token_counts[positions[0]] for positions in missed_positions.values()]
+
+        vectors = dict(cached_vectors)
+        if missed_texts:
+            if coalescer:
+                fresh = await coalescer.embed(missed_texts, request.model, provider, missed_tokens)
+            else:
+                fresh = await embed_with_provider(missed_texts, request.model, provider, missed_tokens)
+            for positions, vector in zip(missed_positions.values(), fresh):
+                for i in positions:
+                    vectors[i] = vector
+            if ENABLE_CACHING:
+                embeddings_cache.set_many(missed_texts, request.model, request.normalize, fresh)
+                if disk_cache:
+                    await disk_cache_store(missed_texts, request.model, request.normalize, fresh)
 
         # Get dimension from first embedding
-        dense_dimension = len(embedding_data[0].dense_embedding) if embedding_data else MODEL_DIMENSIONS.get(
+        dense_dimension = len(vectors[0]) if vectors else MODEL_DIMENSIONS.get(
             request.model, MODEL_DIMENSIONS[DEFAULT_MODEL])
 
-        response = DenseEmbeddingResponse(
+        if request.encoding_format != VECTOR_ENCODING_FLOAT:
+            try:
+                vectors = {i: encode_vector(vector, request.encoding_format) for i, vector in vectors.items()}
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=f"{e} - use encoding_format=base64")
+
+        processing_time = (time.time() - start_time) * 1000
+        embedding_data = [DenseEmbeddingData(dense_embedding=vectors[i], index=i) for i in range(len(texts))]
+
+        return DenseEmbeddingResponse(
             data=embedding_data,
             model=request.model,
             dense_dimension=dense_dimension,
-            total_tokens=count_tokens_approx(texts),
+            encoding_format=request.encoding_format,
+            total_tokens=sum(request.token_counts) if request.token_counts and len(request.token_counts) == len(texts)
+            else count_tokens_approx(texts),
             api_version=API_VERSION,
             processing_time_ms=processing_time,
-            cached=False,
-            source=f"{provider}_api"
+            cached=not missed_texts,
+            cache_age_seconds=cache_age,
+            cache_hits=len(cached_vectors),
+            cache_disk_hits=disk_hits,
+            cache_misses=len(texts) - len(cached_vectors),
+            cache_hit_ratio=round(len(cached_vectors) / len(texts), 4),
+            source=f"{provider}_api" if missed_texts else "cache"
         )
 
-        # Cache the result
-        if ENABLE_CACHING:
-            embeddings_cache.set(texts, request.model, request.normalize, response.dict())
-
-        return response
-
     except HTTPException:
         raise
     except Exception as e:
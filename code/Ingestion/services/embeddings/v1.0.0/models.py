@@ -16,6 +16,8 @@ class EmbeddingRequest(BaseModel):
     input: Union[str, List[str]] = Field(..., description="Text or list of texts to embed")
     model: str = Field(default=DEFAULT_MODEL, description="Embedding model name")
     normalize: bool = Field(default=True, description="Normalize embeddings to unit length")
+    token_counts: Optional[List[int]] = Field(default=None, description="Exact per-text token counts from the caller (skips the len/4 estimate)")
+    encoding_format: str = Field(default="float", description="Vector encoding: float (JSON array), base64 (little-endian float32) or base64_float16")
 
 # ============================================================================
 # Response Models
@@ -23,7 +25,7 @@ class EmbeddingRequest(BaseModel):
 
 class DenseEmbeddingData(BaseModel):
     """Single dense embedding result"""
-    dense_embedding: List[float] = Field(..., description="Dense semantic vector")
+    dense_embedding: Union[List[float], str] = Field(..., description="Dense semantic vector (base64 string unless encoding_format=float)")
     index: int = Field(..., description="Index in the input batch")
 
 class DenseEmbeddingResponse(BaseModel):
@@ -31,11 +33,16 @@ class DenseEmbeddingResponse(BaseModel):
     data: List[DenseEmbeddingData]
     model: str
     dense_dimension: int = Field(..., description="Dense vector dimension")
+    encoding_format: str = Field(default="float", description="Encoding of the dense_embedding values")
     total_tokens: Optional[int] = None
     api_version: str
     processing_time_ms: float = Field(..., description="Processing time in milliseconds")
-    cached: bool = Field(default=False, description="Whether result was served from cache")
-    cache_age_seconds: Optional[float] = Field(default=None, description="Age of cached result")
+    cached: bool = Field(default=False, description="Whether every vector was served from cache")
+    cache_age_seconds: Optional[float] = Field(default=None, description="Age of the oldest cached vector used")
+    cache_hits: int = Field(default=0, description="Texts served from the per-text cache")
+    cache_disk_hits: int = Field(default=0, description="Of cache_hits, texts served from the disk tier (float16)")
+    cache_misses: int = Field(default=0, description="Texts not found in the cache")
+    cache_hit_ratio: float = Field(default=0.0, description="cache_hits / texts in this request")
     source: str = Field(default="nebius_api", description="Source of embeddings (nebius_api)")
 
 class HealthResponse(BaseModel):
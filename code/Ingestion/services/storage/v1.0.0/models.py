@@ -4,7 +4,7 @@ Milvus Storage Service v1.0.0 - Pydantic Models
 """
 
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union
 import config
 
 # ============================================================================
@@ -50,7 +50,7 @@ class ChunkData(BaseModel):
     token_count: int = Field(default=0, description="Token count")
 
     # Vector field (1)
-    dense_vector: List[float] = Field(..., description="Dense semantic vector (dimension set by model)")
+    dense_vector: Union[List[float], str] = Field(..., description="Dense semantic vector (dimension set by model); base64 string per InsertRequest.vector_encoding")
 
     # Base metadata (7 fields with semantic expansion)
     keywords: Optional[str] = Field(default="", max_length=500, description="Extracted keywords")
@@ -69,6 +69,8 @@ class InsertRequest(BaseModel):
     collection_name: str = Field(..., description="Milvus collection name")
     chunks: List[ChunkData] = Field(..., description="List of chunks to insert")
     create_collection: bool = Field(default=True, description="Create collection if not exists")
+    upsert: bool = Field(default=False, description="Replace existing entities with the same id instead of adding duplicates")
+    vector_encoding: str = Field(default="float", description="Encoding of string dense_vector values: base64 (little-endian float32) or base64_float16; arrays are always accepted")
     source_document: Optional[str] = Field(default=None, description="Source document path/name for collection description")
     preset_name: Optional[str] = Field(default=None, description="Model preset name for collection description")
     metadata_model_used: Optional[str] = Field(default=None, description="Actual metadata model used (overrides preset)")
@@ -89,7 +91,11 @@ class InsertResponse(BaseModel):
 class UpdateRequest(BaseModel):
     collection_name: str = Field(..., description="Milvus collection name")
     filter: str = Field(..., description="Filter expression")
-    updates: Dict[str, Any] = Field(..., description="Fields to update")
+    updates: Dict[str, Any] = Field(default_factory=dict, description="Fields to update")
+    updates_by_id: Optional[Dict[str, Dict[str, Any]]] = Field(
+        default=None,
+        description="Per-chunk fields to update, keyed by chunk id (applied after updates)"
+    )
     tenant_id: Optional[str] = Field(default=None, description="Filter by tenant")
 
 class UpdateResponse(BaseModel):
@@ -115,6 +121,25 @@ class DeleteResponse(BaseModel):
     processing_time_ms: float
     api_version: Optional[str] = None
 
+# ============================================================================
+# QUERY Operation Models
+# ============================================================================
+
+class QueryRequest(BaseModel):
+    collection_name: str = Field(..., description="Milvus collection name")
+    filter: str = Field(..., description="Filter expression")
+    output_fields: Optional[List[str]] = Field(default=None, description="Fields to return (default: all)")
+    tenant_id: Optional[str] = Field(default=None, description="Filter by tenant")
+    limit: int = Field(default=10000, ge=1, le=16384, description="Maximum entities to return")
+
+class QueryResponse(BaseModel):
+    success: bool
+    results: List[Dict[str, Any]]
+    total_results: int
+    collection_name: str
+    processing_time_ms: float
+    api_version: Optional[str] = None
+
 # ============================================================================
 # SEARCH Operation Models
 # ============================================================================
@@ -237,7 +237,8 @@ def insert_chunks(
     source_document: str = None,
     preset_name: str = None,
     metadata_model_used: str = None,
-    embedding_model_used: str = None
+    embedding_model_used: str = None,
+    upsert: bool = False
 ) -> Dict[str, Any]:
     """
     Insert chunks into collection
@@ -248,6 +249,7 @@ def insert_chunks(
         create_if_not_exists: Create collection if it doesn't exist
         source_document: Optional source document path/name for collection description
         preset_name: Optional preset name for collection description
+        upsert: Replace entities whose id already exists (Milvus upsert) instead of adding duplicates
 
     Returns:
         Dict with success status, inserted_count, chunk_ids
@@ -260,7 +262,7 @@ def insert_chunks(
             if create_if_not_exists:
                 # Detect dimension from first chunk's dense_vector
                 dimension = None
-                if chunks and chunks[0].dense_vector:
+                if chunks and len(chunks[0].dense_vector):
                     dimension = len(chunks[0].dense_vector)
                     print(f"✓ Detected vector dimension: {dimension} from chunk data")
 
@@ -291,8 +293,8 @@ def insert_chunks(
         # Prepare data (convert chunks to column format)
         data = prepare_insert_data(chunks)
 
-        # Insert
-        insert_result = collection.insert(data)
+        # Insert (upsert overwrites same-id entities, so a failed write leaves the old ones in place)
+        insert_result = collection.upsert(data) if upsert else collection.insert(data)
 
         # Optional flush to ensure data is immediately visible (controlled by AUTO_FLUSH_AFTER_INSERT config)
         if config.AUTO_FLUSH_AFTER_INSERT:
@@ -349,7 +351,7 @@ def prepare_insert_data(chunks: List[ChunkData], dimension: int = None) -> List[
 
     # Populate columns
     for chunk in chunks:
-        chunk_dict = chunk.model_dump()
+        chunk_dict = dict(chunk)  # Not model_dump(): keeps decoded NumPy vectors as they are
 
         for field in all_fields:
             if field in chunk_dict:
@@ -399,7 +401,8 @@ def update_chunks(
     collection_name: str,
     filter_expr: str,
     updates: Dict[str, Any],
-    tenant_id: Optional[str] = None
+    tenant_id: Optional[str] = None,
+    updates_by_id: Optional[Dict[str, Dict[str, Any]]] = None
 ) -> Dict[str, Any]:
     """
     Update chunks matching filter
@@ -415,6 +418,8 @@ def update_chunks(
         filter_expr: Filter expression (e.g., 'id in ["chunk1", "chunk2"]')
         updates: Dict of fields to update
         tenant_id: Optional tenant filter for multi-tenancy
+        updates_by_id: Optional per-chunk fields keyed by chunk id (applied after updates),
+            so chunks with different values are rewritten in one query/delete/insert round
 
     Returns:
         Dict with success status and updated_count
@@ -450,6 +455,8 @@ def update_chunks(
         for entity in results:
             for field, value in updates.items():
                 entity[field] = value
+            if updates_by_id:
+                entity.update(updates_by_id.get(entity["id"], {}))
             entity["updated_at"] = updated_at
 
         # Delete old entities
@@ -484,6 +491,79 @@ def update_chunks(
         }
 
 
+# ============================================================================
+# QUERY Operation
+# ============================================================================
+
+def query_chunks(
+    collection_name: str,
+    filter_expr: str,
+    output_fields: Optional[List[str]] = None,
+    tenant_id: Optional[str] = None,
+    limit: int = 10000
+) -> Dict[str, Any]:
+    """
+    Fetch chunks matching filter (scalar query, no vector search)
+
+    Used for incremental re-ingestion: returns stored text/vectors/metadata
+    for a document so unchanged chunks can be reused.
+
+    Args:
+        collection_name: Target collection
+        filter_expr: Filter expression (e.g., 'document_id == "doc123"')
+        output_fields: Fields to return (default: all fields)
+        tenant_id: Optional tenant filter for multi-tenancy
+        limit: Maximum entities to return
+
+    Returns:
+        Dict with success status and results
+    """
+    start_time = time.time()
+
+    try:
+        collection = get_collection(collection_name)
+        if not collection:
+            return {"success": False, "error": "Collection not found"}
+
+        # Add tenant filter if provided
+        if tenant_id:
+            filter_expr = f"({filter_expr}) and tenant_id == '{tenant_id}'"
+
+        collection.load()
+        results = collection.query(
+            expr=filter_expr,
+            output_fields=output_fields or ["*"],
+            limit=limit
+        )
+
+        # Milvus returns numpy-backed vectors - convert to plain lists for JSON
+        entities = []
+        for entity in results:
+            entity = dict(entity)
+            if "dense_vector" in entity and entity["dense_vector"] is not None:
+                entity["dense_vector"] = [float(x) for x in entity["dense_vector"]]
+            entities.append(entity)
+        entities.sort(key=lambda e: e.get("chunk_index", 0))
+
+        return {
+            "success": True,
+            "results": entities,
+            "collection_name": collection_name,
+            "processing_time_ms": (time.time() - start_time) * 1000
+        }
+
+    except Exception as e:
+        error_details = traceback.format_exc()
+        print(f"✗ Query failed: {e}")
+        print(f"Error details:\n{error_details}")
+        return {
+            "success": False,
+            "error": f"{str(e)} | Details: {error_details[:500]}",
+            "collection_name": collection_name,
+            "processing_time_ms": (time.time() - start_time) * 1000
+        }
+
+
 # ============================================================================
 # DELETE Operation
 # ============================================================================
@@ -13,11 +13,13 @@ from pymilvus import utility
 
 import config
 import operations
+from vector_codec import decode_vector_array
 from models import (
     HealthResponse, VersionResponse,
     InsertRequest, InsertResponse,
     UpdateRequest, UpdateResponse,
     DeleteRequest, DeleteResponse,
+    QueryRequest, QueryResponse,
     SearchRequest, SearchResponse,
     CreateCollectionRequest, CreateCollectionResponse,
     CollectionInfoResponse, DeleteCollectionResponse,
@@ -141,6 +143,7 @@ async def get_version():
             "/v1/insert - Insert chunks",
             "/v1/update - Update chunks",
             "/v1/delete - Delete chunks",
+            "/v1/query - Fetch chunks by filter",
             "/v1/search - Hybrid search",
             "/v1/collection/{name} - Collection info",
             "/v1/collection/create - Create collection",
@@ -179,7 +182,18 @@ async def insert_chunks_endpoint(request: InsertRequest):
         ]
     }
     ```
+
+    Vectors may instead be sent as base64 strings of packed little-endian
+    floats ("vector_encoding": "base64" for float32, "base64_float16");
+    they are decoded straight into NumPy arrays for the Milvus insert.
     """
+    try:
+        for i, chunk in enumerate(request.chunks):
+            if isinstance(chunk.dense_vector, str) or request.vector_encoding != "float":
+                chunk.dense_vector = decode_vector_array(chunk.dense_vector, request.vector_encoding)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Chunk {i}: {e}")
+
     result = operations.insert_chunks(
         collection_name=request.collection_name,
         chunks=request.chunks,
@@ -187,7 +201,8 @@ async def insert_chunks_endpoint(request: InsertRequest):
         source_document=request.source_document,
         preset_name=request.preset_name,
         metadata_model_used=request.metadata_model_used,
-        embedding_model_used=request.embedding_model_used
+        embedding_model_used=request.embedding_model_used,
+        upsert=request.upsert
     )
 
     if not result["success"]:
@@ -228,12 +243,16 @@ async def update_chunks_endpoint(request: UpdateRequest):
         "tenant_id": "client_acme"
     }
     ```
+
+    Different values per chunk (e.g. backfilled metadata): filter on the ids
+    and pass "updates_by_id": {"<chunk_id>": {"summary": "..."}, ...}
     """
     result = operations.update_chunks(
         collection_name=request.collection_name,
         filter_expr=request.filter,
         updates=request.updates,
-        tenant_id=request.tenant_id
+        tenant_id=request.tenant_id,
+        updates_by_id=request.updates_by_id
     )
 
     if not result["success"]:
@@ -319,6 +338,48 @@ async def delete_by_id_endpoint(
     )
 
 
+# ============================================================================
+# QUERY Operation
+# ============================================================================
+
+@app.post("/v1/query", response_model=QueryResponse)
+async def query_chunks_endpoint(request: QueryRequest):
+    """
+    Fetch stored chunks by filter (no vector search)
+
+    Use case: incremental re-ingestion reads a document's existing chunks
+    (text, vectors, metadata) to reuse the unchanged ones
+
+    Example:
+    ```json
+    {
+        "collection_name": "client_acme_products_v3",
+        "filter": "document_id == 'doc_123'",
+        "tenant_id": "client_acme"
+    }
+    ```
+    """
+    result = operations.query_chunks(
+        collection_name=request.collection_name,
+        filter_expr=request.filter,
+        output_fields=request.output_fields,
+        tenant_id=request.tenant_id,
+        limit=request.limit
+    )
+
+    if not result["success"]:
+        raise HTTPException(status_code=400, detail=result.get("error", "Query failed"))
+
+    return QueryResponse(
+        success=True,
+        results=result["results"],
+        total_results=len(result["results"]),
+        collection_name=request.collection_name,
+        processing_time_ms=result["processing_time_ms"],
+        api_version=config.API_VERSION
+    )
+
+
 # ============================================================================
 # SEARCH Operation
 # ============================================================================
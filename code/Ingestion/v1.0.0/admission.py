@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Per-tenant fair admission scheduling for the Ingestion Pipeline API v1.0.0
+
+Replaces the single global ingestion semaphore with a weighted fair queue
+keyed on tenant_id. Every waiting request gets a virtual start tag
+(start-time fair queuing); when a slot frees up it goes to the tenant whose
+head request has the smallest tag. A tenant with a deep backlog therefore
+gets its weighted share of slots instead of all of them, and a small
+tenant's single document is admitted at the next free slot.
+
+Each tenant is also capped on concurrent slots (so a burst can't occupy the
+whole pipeline before anyone else arrives) and on queued requests (overflow
+is rejected instead of buffered).
+
+The whole queue is bounded too: once the number of waiting requests or the
+expected wait (queued chunks x recent seconds-per-chunk / slots) passes its
+limit, new requests are shed with a Retry-After estimate instead of queuing.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed (tenant queue full or admission queue over its bounds)"""
+
+    def __init__(self, tenant_id: str, message: str, retry_after: int):
+        super().__init__(message)
+        self.tenant_id = tenant_id
+        self.retry_after = retry_after
+
+
+class Ticket:
+    """
+    One admitted request (returned by acquire, passed back to release)
+
+    Set ticket.chunks to the number of chunks actually processed before
+    release; it feeds the seconds-per-chunk rate used for Retry-After.
+    """
+
+    __slots__ = ("tenant_id", "wait_ms", "cost", "chunks", "admitted_at")
+
+    def __init__(self, tenant_id: str, wait_ms: float, cost: float):
+        self.tenant_id = tenant_id
+        self.wait_ms = wait_ms
+        self.cost = cost
+        self.chunks: Optional[int] = None
+        self.admitted_at = time.monotonic()
+
+
+class _TenantState:
+    """Queue, virtual clock and stats of one tenant"""
+
+    def __init__(self, weight: float):
+        self.weight = weight
+        self.active = 0
+        self.queue: Deque[tuple] = deque()  # (start_tag, enqueued_at, future, cost)
+        self.last_finish = 0.0
+
+        # Stats
+        self.admitted = 0
+        self.rejected = 0
+        self.recent_waits_ms: Deque[float] = deque(maxlen=256)
+
+
+class FairScheduler:
+    """Weighted fair-queuing admission with per-tenant concurrency and queue caps"""
+
+    def __init__(
+        self,
+        capacity: int,
+        tenant_max_concurrent: int,
+        tenant_max_queued: int,
+        weights: Optional[Dict[str, float]] = None,
+        default_weight: float = 1.0,
+        max_queued: int = 0,
+        max_expected_wait_s: float = 0.0,
+        retry_after_max_s: int = 300
+    ):
+        """
+        Initialize scheduler
+
+        Args:
+            capacity: Total concurrent ingestions across all tenants
+            tenant_max_concurrent: Concurrent ingestions allowed per tenant
+            tenant_max_queued: Waiting requests allowed per tenant before rejecting
+            weights: Per-tenant share weights (higher = larger share of slots)
+            default_weight: Weight for tenants not listed in weights
+            max_queued: Waiting requests allowed across all tenants before shedding (0 = unbounded)
+            max_expected_wait_s: Shed when the expected queue wait exceeds this (0 = disabled)
+            retry_after_max_s: Upper bound for the Retry-After estimate
+        """
+        self.capacity = capacity
+        self.tenant_max_concurrent = max(1, min(tenant_max_concurrent, capacity))
+        self.tenant_max_queued = tenant_max_queued
+        self.weights = weights or {}
+        self.default_weight = default_weight
+        self.max_queued = max_queued
+        self.max_expected_wait_s = max_expected_wait_s
+        self.retry_after_max_s = retry_after_max_s
+
+        self._active = 0
+        self._active_cost = 0.0
+        self._queued_cost = 0.0
+        self._virtual_time = 0.0
+        self._tenants: Dict[str, _TenantState] = {}
+
+        # Seconds one slot spends per chunk (EWMA over completed requests)
+        self._seconds_per_chunk: Optional[float] = None
+        self.shed = 0
+
+    def _tenant(self, tenant_id: str) -> _TenantState:
+        state = self._tenants.get(tenant_id)
+        if state is None:
+            weight = self.weights.get(tenant_id, self.default_weight)
+            state = self._tenants[tenant_id] = _TenantState(max(weight, 1e-6))
+        return state
+
+    def expected_wait(self) -> Optional[float]:
+        """
+        Estimated seconds a newly queued request would wait for a slot
+
+        None until at least one request has completed (no rate observed yet).
+        """
+        if self._seconds_per_chunk is None:
+            return None
+        # Running requests are on average half done
+        backlog = self._queued_cost + self._active_cost / 2
+        return backlog * self._seconds_per_chunk / self.capacity
+
+    def retry_after(self) -> int:
+        """Seconds a shed client should wait before retrying (whole seconds, >= 1)"""
+        wait = self.expected_wait()
+        if wait is None:
+            return 1
+        return max(1, min(self.retry_after_max_s, math.ceil(wait)))
+
+    def _reject(self, tenant: _TenantState, tenant_id: str, message: str):
+        tenant.rejected += 1
+        self.shed += 1
+        raise AdmissionRejected(tenant_id, message, self.retry_after())
+
+    async def acquire(self, tenant_id: str, cost: float = 1.0, shed: bool = True) -> Ticket:
+        """
+        Wait for an ingestion slot for tenant_id
+
+        Args:
+            tenant_id: Tenant the request belongs to
+            cost: Estimated chunks of the request (advances the tenant's virtual clock)
+            shed: Apply the global queue bounds (False for callers that are already bounded, e.g. job workers)
+
+        Raises:
+            AdmissionRejected: If the tenant already has tenant_max_queued waiting requests,
+                or (shed=True) the admission queue is over max_queued / max_expected_wait_s
+        """
+        tenant = self._tenant(tenant_id)
+        if len(tenant.queue) >= self.tenant_max_queued:
+            self._reject(
+                tenant, tenant_id,
+                f"Tenant '{tenant_id}' has {len(tenant.queue)} ingestions queued (limit {self.tenant_max_queued})"
+            )
+
+        must_wait = self._active >= self.capacity or tenant.active >= self.tenant_max_concurrent or self.queued() > 0
+        if shed and must_wait:
+            if self.max_queued and self.queued() >= self.max_queued:
+                self._reject(tenant, tenant_id, f"Ingestion queue is full ({self.queued()} requests waiting)")
+            expected = self.expected_wait()
+            if self.max_expected_wait_s and expected is not None and expected > self.max_expected_wait_s:
+                self._reject(
+                    tenant, tenant_id,
+                    f"Expected queue wait {expected:.1f}s exceeds limit of {self.max_expected_wait_s:g}s"
+                )
+
+        # Start tag: a tenant returning from idle starts at the current virtual time,
+        # a backlogged tenant continues after its previous request
+        start_tag = max(self._virtual_time, tenant.last_finish)
+        tenant.last_finish = start_tag + cost / tenant.weight
+
+        enqueued_at = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        entry = (start_tag, enqueued_at, future, cost)
+        tenant.queue.append(entry)
+        self._queued_cost += cost
+        self._dispatch()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted in the same tick we were cancelled - hand the slot back
+                self._finish(tenant_id, cost)
+            else:
+                try:
+                    tenant.queue.remove(entry)
+                    self._queued_cost -= cost
+                except ValueError:
+                    pass
+            raise
+
+        wait_ms = (time.monotonic() - enqueued_at) * 1000
+        tenant.admitted += 1
+        tenant.recent_waits_ms.append(wait_ms)
+        return Ticket(tenant_id, wait_ms, cost)
+
+    def release(self, ticket: Ticket, failed: bool = False):
+        """
+        Return the slot held by ticket
+
+        Requests that ran the full pipeline report ticket.chunks, which updates
+        the seconds-per-chunk rate; failed requests and partial work don't.
+        """
+        if ticket.chunks and not failed:
+            sample = (time.monotonic() - ticket.admitted_at) / ticket.chunks
+            if self._seconds_per_chunk is None:
+                self._seconds_per_chunk = sample
+            else:
+                self._seconds_per_chunk = 0.8 * self._seconds_per_chunk + 0.2 * sample
+        self._finish(ticket.tenant_id, ticket.cost)
+
+    def _finish(self, tenant_id: str, cost: float):
+        self._active -= 1
+        self._active_cost -= cost
+        self._tenants[tenant_id].active -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        """Grant free slots to the eligible tenant with the smallest head start tag"""
+        while self._active < self.capacity:
+            best_id, best_tag = None, None
+            for tenant_id, tenant in self._tenants.items():
+                if not tenant.queue or tenant.active >= self.tenant_max_concurrent:
+                    continue
+                tag = tenant.queue[0][0]
+                if best_tag is None or tag < best_tag:
+                    best_id, best_tag = tenant_id, tag
+            if best_id is None:
+                return
+
+            tenant = self._tenants[best_id]
+            _, _, future, cost = tenant.queue.popleft()
+            self._queued_cost -= cost
+            if future.done():
+                continue  # Cancelled while queued
+            self._virtual_time = max(self._virtual_time, best_tag)
+            self._active += 1
+            self._active_cost += cost
+            tenant.active += 1
+            future.set_result(None)
+
+    def queued(self) -> int:
+        """Total requests waiting for a slot"""
+        return sum(len(tenant.queue) for tenant in self._tenants.values())
+
+    def stats(self) -> Dict[str, Any]:
+        """Get scheduler statistics (global and per tenant)"""
+        tenants = {}
+        for tenant_id, tenant in self._tenants.items():
+            waits = sorted(tenant.recent_waits_ms)
+            tenants[tenant_id] = {
+                "weight": tenant.weight,
+                "active": tenant.active,
+                "queued": len(tenant.queue),
+                "admitted": tenant.admitted,
+                "rejected": tenant.rejected,
+                "queue_wait_ms_p50": round(waits[len(waits) // 2], 1) if waits else None,
+                "queue_wait_ms_p95": round(waits[min(len(waits) - 1, int(len(waits) * 0.95))], 1) if waits else None
+            }
+        expected = self.expected_wait()
+        return {
+            "capacity": self.capacity,
+            "active": self._active,
+            "queued": self.queued(),
+            "queued_chunks_estimate": round(self._queued_cost, 1),
+            "max_queued": self.max_queued,
+            "max_expected_wait_s": self.max_expected_wait_s,
+            "expected_wait_s": round(expected, 2) if expected is not None else None,
+            "seconds_per_chunk": round(self._seconds_per_chunk, 4) if self._seconds_per_chunk else None,
+            "shed": self.shed,
+            "tenant_max_concurrent": self.tenant_max_concurrent,
+            "tenant_max_queued": self.tenant_max_queued,
+            "tenants": tenants
+        }
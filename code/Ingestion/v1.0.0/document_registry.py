@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Ingested document registry for the Ingestion Pipeline API v1.0.0
+
+SQLite record of the version (content hash) last ingested for each
+(tenant_id, collection_name, document_id), with the ingestion result. The API
+uses it to answer a repeated ingestion of an unchanged document without
+re-chunking, re-extracting metadata, re-embedding or re-inserting.
+
+Documents ingested with auto_split are stored as segment documents; the
+segments table links each parent document id to its segment document ids.
+"""
+
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlite_store import SQLiteStore
+
+
+class DocumentRegistry(SQLiteStore):
+    """SQLite map of (tenant, collection, document) -> ingested content hash + result"""
+
+    def __init__(self, db_path: str):
+        """
+        Initialize registry
+
+        Args:
+            db_path: Path to the SQLite database file (created if missing)
+        """
+        super().__init__(db_path)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS documents (
+                tenant_id TEXT NOT NULL,
+                collection_name TEXT NOT NULL,
+                document_id TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                chunks_inserted INTEGER NOT NULL,
+                result_json TEXT NOT NULL,
+                ingested_at REAL NOT NULL,
+                PRIMARY KEY (tenant_id, collection_name, document_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_documents_collection ON documents (collection_name);
+            CREATE TABLE IF NOT EXISTS segments (
+                tenant_id TEXT NOT NULL,
+                collection_name TEXT NOT NULL,
+                parent_document_id TEXT NOT NULL,
+                segment_index INTEGER NOT NULL,
+                document_id TEXT NOT NULL,
+                PRIMARY KEY (tenant_id, collection_name, parent_document_id, segment_index)
+            );
+            CREATE INDEX IF NOT EXISTS idx_segments_parent ON segments (collection_name, parent_document_id);
+        """)
+
+    def get(self, tenant_id: str, collection_name: str, document_id: str) -> Optional[Dict[str, Any]]:
+        """Registered version of a document, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM documents WHERE tenant_id = ? AND collection_name = ? AND document_id = ?",
+                (tenant_id, collection_name, document_id)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "content_hash": row["content_hash"],
+            "chunks_inserted": row["chunks_inserted"],
+            "result": json.loads(row["result_json"]),
+            "ingested_at": row["ingested_at"]
+        }
+
+    def record(self, tenant_id: str, collection_name: str, document_id: str,
+               content_hash: str, chunks_inserted: int, result: Dict[str, Any]):
+        """Register the version just stored (replaces any previous version)"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO documents (tenant_id, collection_name, document_id, content_hash,"
+                " chunks_inserted, result_json, ingested_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (tenant_id, collection_name, document_id, content_hash, chunks_inserted,
+                 json.dumps(result), time.time())
+            )
+
+    def replace_segments(self, tenant_id: str, collection_name: str, parent_document_id: str,
+                         segment_ids: List[str]) -> List[str]:
+        """
+        Link a parent document to its segment documents (in segment order)
+
+        Returns:
+            Previously linked segment ids that are no longer part of the parent
+        """
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                previous = [row["document_id"] for row in self._conn.execute(
+                    "SELECT document_id FROM segments WHERE tenant_id = ? AND collection_name = ? AND parent_document_id = ?",
+                    (tenant_id, collection_name, parent_document_id)
+                )]
+                self._conn.execute(
+                    "DELETE FROM segments WHERE tenant_id = ? AND collection_name = ? AND parent_document_id = ?",
+                    (tenant_id, collection_name, parent_document_id)
+                )
+                self._conn.executemany(
+                    "INSERT INTO segments (tenant_id, collection_name, parent_document_id, segment_index, document_id)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    [(tenant_id, collection_name, parent_document_id, index, segment_id)
+                     for index, segment_id in enumerate(segment_ids)]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return [segment_id for segment_id in previous if segment_id not in segment_ids]
+
+    def segments(self, collection_name: str, parent_document_id: str) -> List[str]:
+        """Segment document ids of a parent document (any tenant), in segment order"""
+        with self._lock:
+            return [row["document_id"] for row in self._conn.execute(
+                "SELECT document_id FROM segments WHERE collection_name = ? AND parent_document_id = ?"
+                " ORDER BY tenant_id, segment_index",
+                (collection_name, parent_document_id)
+            )]
+
+    def forget(self, collection_name: str, document_id: Optional[str] = None, keep_segments: bool = False,
+               tenant_id: Optional[str] = None) -> int:
+        """
+        Drop entries (and segment links) for one document or a whole collection
+
+        keep_segments keeps a document's segment links (only its own whole-document entry is dropped);
+        tenant_id limits the drop to one tenant (default: every tenant)
+        """
+        tenant_clause, tenant_params = ("", ()) if tenant_id is None else (" AND tenant_id = ?", (tenant_id,))
+        with self._lock:
+            if document_id is None:
+                self._conn.execute(
+                    "DELETE FROM segments WHERE collection_name = ?" + tenant_clause, (collection_name, *tenant_params)
+                )
+                cursor = self._conn.execute(
+                    "DELETE FROM documents WHERE collection_name = ?" + tenant_clause, (collection_name, *tenant_params)
+                )
+            else:
+                if not keep_segments:
+                    self._conn.execute(
+                        "DELETE FROM segments WHERE collection_name = ? AND parent_document_id = ?" + tenant_clause,
+                        (collection_name, document_id, *tenant_params)
+                    )
+                cursor = self._conn.execute(
+                    "DELETE FROM documents WHERE collection_name = ? AND document_id = ?" + tenant_clause,
+                    (collection_name, document_id, *tenant_params)
+                )
+        return cursor.rowcount
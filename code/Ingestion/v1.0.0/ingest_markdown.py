@@ -9,6 +9,22 @@ import sys
 import time
 from pathlib import Path
 
+MAX_THROTTLE_RETRIES = 5  # Retries when the API sheds load (HTTP 429)
+
+def post_with_retry_after(url: str, payload: dict, timeout: int = 180) -> requests.Response:
+    """POST, waiting out HTTP 429 responses for the server's Retry-After before retrying"""
+    for attempt in range(MAX_THROTTLE_RETRIES + 1):
+        response = requests.post(url, json=payload, timeout=timeout)
+        if response.status_code != 429 or attempt == MAX_THROTTLE_RETRIES:
+            return response
+        try:
+            delay = float(response.headers.get("Retry-After", "5"))
+        except ValueError:
+            delay = 5.0
+        print(f"   ⏳ Ingestion API busy (429), retrying in {delay:.0f}s ({attempt + 1}/{MAX_THROTTLE_RETRIES})")
+        time.sleep(delay)
+    return response
+
 def ingest_markdown_file(
     file_path: str,
     collection: str = "test_collection",
@@ -53,17 +69,15 @@ def ingest_markdown_file(
     start_time = time.time()
 
     try:
-        response = requests.post(
-            f"{api_url}/v1/ingest",
-            json=payload,
-            timeout=180
-        )
+        response = post_with_retry_after(f"{api_url}/v1/ingest", payload, timeout=180)
 
         elapsed = time.time() - start_time
 
         if response.status_code == 200:
             result = response.json()
             print(f"\n✅ SUCCESS!")
+            if result.get('unchanged'):
+                print(f"   Unchanged: already stored, nothing reprocessed")
             print(f"   Document ID: {result.get('document_id')}")
             print(f"   Total Chunks: {result.get('total_chunks')}")
             print(f"   Collection: {result.get('collection_name')}")
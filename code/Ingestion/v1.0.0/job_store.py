@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Durable ingestion job queue for the Ingestion Pipeline API v1.0.0
+
+SQLite-backed store for asynchronous ingestion jobs. Each job keeps its
+request, per-stage progress/timings and stage checkpoints (chunks, metadata,
+vectors), so a job interrupted by a restart resumes at the first incomplete
+stage instead of starting over.
+"""
+
+import json
+import sqlite3
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from sqlite_store import SQLiteStore
+
+# Job states
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+# Pipeline stages tracked per job (in execution order)
+JOB_STAGES = ["chunking", "metadata", "embeddings", "storage"]
+
+
+class JobStore(SQLiteStore):
+    """SQLite job queue with stage checkpoints (safe to share between asyncio tasks via threads)"""
+
+    def __init__(self, db_path: str):
+        """
+        Initialize store
+
+        Args:
+            db_path: Path to the SQLite database file (created if missing)
+        """
+        super().__init__(db_path)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                document_id TEXT,
+                tenant_id TEXT,
+                request_json TEXT NOT NULL,
+                progress_json TEXT NOT NULL,
+                result_json TEXT,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at);
+            CREATE TABLE IF NOT EXISTS job_checkpoints (
+                job_id TEXT NOT NULL,
+                name TEXT NOT NULL,
+                data_json TEXT NOT NULL,
+                PRIMARY KEY (job_id, name)
+            );
+        """)
+
+    # ------------------------------------------------------------------
+    # Job lifecycle
+    # ------------------------------------------------------------------
+
+    def create(self, request: Dict[str, Any]) -> str:
+        """Persist a new queued job and return its id"""
+        job_id = f"job_{uuid.uuid4().hex}"
+        now = time.time()
+        progress = {stage: {"status": "pending"} for stage in JOB_STAGES}
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, status, document_id, tenant_id, request_json, progress_json,"
+                " created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, JOB_QUEUED, request.get("document_id"), request.get("tenant_id"),
+                 json.dumps(request), json.dumps(progress), now, now)
+            )
+        return job_id
+
+    def claim_next(self) -> Optional[Dict[str, Any]]:
+        """Atomically move the oldest queued job to running and return it"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT id FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1",
+                    (JOB_QUEUED,)
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, attempts = attempts + 1, updated_at = ?,"
+                    " started_at = COALESCE(started_at, ?) WHERE id = ?",
+                    (JOB_RUNNING, now, now, row["id"])
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return self.get(row["id"])
+
+    def requeue_interrupted(self) -> int:
+        """Return jobs left running by a previous process to the queue (called at startup)"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE status = ?",
+                (JOB_QUEUED, time.time(), JOB_RUNNING)
+            )
+        return cursor.rowcount
+
+    def update_progress(self, job_id: str, stage: str, **fields):
+        """Merge fields into one stage's progress entry"""
+        with self._lock:
+            row = self._conn.execute("SELECT progress_json FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return
+            progress = json.loads(row["progress_json"])
+            progress.setdefault(stage, {}).update(fields)
+            self._conn.execute(
+                "UPDATE jobs SET progress_json = ?, updated_at = ? WHERE id = ?",
+                (json.dumps(progress), time.time(), job_id)
+            )
+
+    def complete(self, job_id: str, result: Dict[str, Any]):
+        """Mark job completed, store its result and drop its checkpoints"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result_json = ?, error = NULL, updated_at = ?, finished_at = ?"
+                " WHERE id = ?",
+                (JOB_COMPLETED, json.dumps(result), now, now, job_id)
+            )
+            self._conn.execute("DELETE FROM job_checkpoints WHERE job_id = ?", (job_id,))
+
+    def fail(self, job_id: str, error: str, retry: bool):
+        """Record a failure; requeue the job (keeping checkpoints) or mark it failed"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ?, finished_at = ? WHERE id = ?",
+                (JOB_QUEUED if retry else JOB_FAILED, error, now, None if retry else now, job_id)
+            )
+
+    # ------------------------------------------------------------------
+    # Checkpoints
+    # ------------------------------------------------------------------
+
+    def save_checkpoint(self, job_id: str, name: str, data: Any):
+        """Persist a stage output (overwrites any previous value)"""
+        payload = json.dumps(data)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO job_checkpoints (job_id, name, data_json) VALUES (?, ?, ?)",
+                (job_id, name, payload)
+            )
+
+    def load_checkpoint(self, job_id: str, name: str) -> Optional[Any]:
+        """Load a stage output, or None if the stage has not completed"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data_json FROM job_checkpoints WHERE job_id = ? AND name = ?",
+                (job_id, name)
+            ).fetchone()
+        return json.loads(row["data_json"]) if row else None
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job (without its request body)"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def get_request(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get the original ingestion request of a job"""
+        with self._lock:
+            row = self._conn.execute("SELECT request_json FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return json.loads(row["request_json"]) if row else None
+
+    def list(self, status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """List most recent jobs, optionally filtered by status"""
+        query = "SELECT * FROM jobs"
+        params: tuple = ()
+        if status:
+            query += " WHERE status = ?"
+            params = (status,)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        with self._lock:
+            rows = self._conn.execute(query, params + (limit,)).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs per status"""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+    @staticmethod
+    def _row_to_job(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "job_id": row["id"],
+            "status": row["status"],
+            "document_id": row["document_id"],
+            "tenant_id": row["tenant_id"],
+            "stages": json.loads(row["progress_json"]),
+            "result": json.loads(row["result_json"]) if row["result_json"] else None,
+            "error": row["error"],
+            "attempts": row["attempts"],
+            "created_at": row["created_at"],
+            "started_at": row["started_at"],
+            "finished_at": row["finished_at"],
+            "updated_at": row["updated_at"]
+        }
@@ -21,17 +21,21 @@ Author: CrawlEnginePro
 
 import os
 import sys
+import json
 import time
+import hashlib
 import httpx
 import logging
 import tiktoken
 from pathlib import Path
-from datetime import datetime
-from typing import List, Dict, Any, Optional
+from urllib.parse import quote, urlencode
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional, Tuple, Union
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, HTTPException, status
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field
+from fastapi import FastAPI, HTTPException, Request, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.requests import ClientDisconnect
+from pydantic import BaseModel, Field, ValidationError
 
 # Add shared directory to path FIRST (before imports that need it)
 SHARED_DIR = Path(__file__).resolve().parents[3] / "shared"
@@ -46,6 +50,17 @@ load_shared_env()
 # Import service_registry and model_registry
 from service_registry import get_registry
 from model_registry import DEFAULT_EMBEDDING_MODEL, get_embedding_dimension, get_llm_for_task, get_metadata_enum_for_model
+from vector_codec import VECTOR_ENCODING_FLOAT, check_encoding
+
+# Local modules
+from stage_batcher import StageBatcher
+from job_store import JobStore, JOB_STAGES
+from admission import FairScheduler, AdmissionRejected
+from document_registry import DocumentRegistry
+from near_duplicate import MinHashBuilder, NearDuplicateIndex, minhash_signature
+from stage_stats import StageThroughput
+from metadata_backfill import MetadataBackfillStore
+from upload_stream import StreamedText, UploadStream
 
 # ============================================================================
 # Configuration
@@ -64,11 +79,17 @@ PORT = int(os.getenv("INGESTION_API_PORT", "8060"))
 # Internal service URLs - using service_registry (environment-aware)
 registry = get_registry()
 CHUNKING_URL = registry.get_service_url('chunking')  # Already includes /v1/orchestrate
+CHUNKING_STREAM_URL = f"{CHUNKING_URL}/stream"  # Raw-body variant for streamed uploads
 METADATA_URL = registry.get_service_url('metadata')  # Already includes /v1/metadata
 EMBEDDINGS_URL = registry.get_service_url('embeddings')  # Already includes /v1/embeddings
 STORAGE_URL = registry.get_service_url('storage')  # Already includes /v1
 LLM_GATEWAY_URL = registry.get_service_url('llm_gateway')  # Already includes /v1/chat/completions
 
+# Dense vectors of the batched/job/update paths are requested from the embeddings service in this
+# encoding and handed to the storage insert as received: base64 (LE float32), base64_float16 (lossy)
+# or float (JSON arrays)
+VECTOR_ENCODING = check_encoding(os.getenv("VECTOR_ENCODING", "base64"))
+
 # Connection pooling for internal service calls
 CONNECTION_POOL_SIZE = int(os.getenv("CONNECTION_POOL_SIZE", "20"))
 CONNECTION_POOL_MAX = int(os.getenv("CONNECTION_POOL_MAX", "100"))
@@ -82,9 +103,62 @@ MIN_DOCUMENT_LENGTH = 50  # Minimum 50 characters
 MAX_COLLECTION_NAME_LENGTH = 255
 MAX_DOCUMENT_ID_LENGTH = 255
 
+# Oversized documents: MAX_CHUNKS_PER_DOCUMENT is enforced from a pre-chunk estimate (length / chunk stride);
+# with auto_split the document is ingested as linked segment documents instead
+SEGMENT_FILL_RATIO = float(os.getenv("SEGMENT_FILL_RATIO", "0.8"))  # Estimated chunks per segment / MAX_CHUNKS_PER_DOCUMENT
+MAX_SEGMENTS_PER_DOCUMENT = int(os.getenv("MAX_SEGMENTS_PER_DOCUMENT", "32"))
+
+# Streamed uploads (POST /v1/ingest/upload): body bytes are piped to the chunking orchestrator as they arrive
+UPLOAD_TIMEOUT = float(os.getenv("UPLOAD_TIMEOUT", "600"))  # seconds, upload + full pipeline
+UPLOAD_MAX_FIELD_BYTES = 65536  # Multipart form fields sent before the file part
+
 # Rate limiting (Pipeline Optimization: prevent pipeline overwhelm)
 MAX_CONCURRENT_INGESTIONS = int(os.getenv("MAX_CONCURRENT_INGESTIONS", "10"))
 
+# Per-tenant fair admission (weighted fair queuing over MAX_CONCURRENT_INGESTIONS slots)
+TENANT_MAX_CONCURRENT_INGESTIONS = int(os.getenv("TENANT_MAX_CONCURRENT_INGESTIONS", str(max(1, MAX_CONCURRENT_INGESTIONS - 2))))
+TENANT_MAX_QUEUED_INGESTIONS = int(os.getenv("TENANT_MAX_QUEUED_INGESTIONS", "100"))
+TENANT_WEIGHTS = {  # "tenant_a:2,tenant_b:0.5" - unlisted tenants get weight 1
+    name.strip(): float(weight)
+    for name, weight in (item.split(":", 1) for item in os.getenv("TENANT_WEIGHTS", "").split(",") if ":" in item)
+}
+
+# Load shedding: reject with 429 + Retry-After instead of queuing without bound
+ADMISSION_MAX_QUEUED = int(os.getenv("ADMISSION_MAX_QUEUED", "50"))  # 0 = unbounded
+ADMISSION_MAX_WAIT_S = float(os.getenv("ADMISSION_MAX_WAIT_S", "120"))  # Expected queue wait; 0 = disabled
+ADMISSION_RETRY_AFTER_MAX_S = int(os.getenv("ADMISSION_RETRY_AFTER_MAX_S", "300"))
+
+# Batch ingestion (cross-document stage batching for POST /v1/ingest/batch)
+EMBEDDINGS_MAX_BATCH = int(os.getenv("EMBEDDINGS_MAX_BATCH", "128"))  # Embeddings service MAX_BATCH_SIZE
+METADATA_MAX_BATCH = int(os.getenv("METADATA_MAX_BATCH", "40"))  # Stay under metadata service MAX_BATCH_SIZE=50
+BATCH_LINGER_MS = float(os.getenv("BATCH_LINGER_MS", "250"))  # Max wait for a partial batch to fill
+BATCH_MAX_INFLIGHT_DOCUMENTS = int(os.getenv("BATCH_MAX_INFLIGHT_DOCUMENTS", "50"))
+BATCH_MAX_INFLIGHT_CALLS = int(os.getenv("BATCH_MAX_INFLIGHT_CALLS", "4"))  # Per stage
+MIN_METADATA_LENGTH = 50  # Same threshold as the chunking orchestrator
+
+# Durable ingestion jobs (POST /v1/jobs) - local state survives restarts
+INGESTION_STATE_DIR = os.getenv("INGESTION_STATE_DIR", str(Path(__file__).resolve().parent / "state"))
+JOBS_DB_PATH = os.path.join(INGESTION_STATE_DIR, "ingestion_jobs.db")
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))  # seconds
+
+# Deferred metadata (metadata_timing=deferred): store chunks without LLM metadata, backfill it in the background
+METADATA_BACKFILL_DB_PATH = os.path.join(INGESTION_STATE_DIR, "metadata_backfill.db")
+METADATA_BACKFILL_WORKERS = int(os.getenv("METADATA_BACKFILL_WORKERS", "2"))
+METADATA_BACKFILL_BATCH = int(os.getenv("METADATA_BACKFILL_BATCH", "160"))  # Chunks extracted + patched per storage update
+
+# Idempotent ingestion: skip documents whose exact version is already stored
+DOCUMENTS_DB_PATH = os.path.join(INGESTION_STATE_DIR, "ingested_documents.db")
+
+# Near-duplicate detection: MinHash/LSH index of stored documents per tenant/collection
+NEAR_DUPLICATE_INDEX_ENABLED = os.getenv("NEAR_DUPLICATE_INDEX_ENABLED", "true").lower() == "true"
+NEAR_DUPLICATE_POLICY = os.getenv("NEAR_DUPLICATE_POLICY", "off")  # Default policy: off, flag, reject, link
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.9"))  # Estimated Jaccard similarity
+NEAR_DUPLICATE_NUM_PERM = int(os.getenv("NEAR_DUPLICATE_NUM_PERM", "128"))
+NEAR_DUPLICATE_BANDS = int(os.getenv("NEAR_DUPLICATE_BANDS", "16"))
+NEAR_DUPLICATE_SHINGLE_SIZE = int(os.getenv("NEAR_DUPLICATE_SHINGLE_SIZE", "5"))  # Words per shingle
+NEAR_DUPLICATES_DB_PATH = os.path.join(INGESTION_STATE_DIR, "near_duplicates.db")
+
 # Retry configuration (Resilience: handle transient failures)
 MAX_RETRIES = int(os.getenv("MAX_RETRIES", "3"))
 RETRY_BASE_DELAY = float(os.getenv("RETRY_BASE_DELAY", "1.0"))  # seconds
@@ -98,12 +172,22 @@ logger = logging.getLogger(__name__)
 # HTTP Client & Lifespan Management
 # ============================================================================
 http_client = None
-ingestion_semaphore = None  # Rate limiter for concurrent ingestions
+admission_scheduler = None  # Per-tenant fair admission for concurrent ingestions
+job_store = None  # Durable job queue (SQLite)
+job_wakeup = None  # Signals idle job workers that a job was queued
+job_workers = []
+document_registry = None  # Content hash of the version stored per document
+near_duplicate_index = None  # MinHash signatures of stored documents
+stage_throughput = StageThroughput()  # Recent per-stage ms/chunk (dry-run latency estimates)
+backfill_store = None  # Deferred metadata backfills (SQLite)
+backfill_wakeup = None
+backfill_workers = []
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup/shutdown"""
-    global http_client, ingestion_semaphore
+    global http_client, admission_scheduler, job_store, job_wakeup, job_workers, document_registry, near_duplicate_index
+    global backfill_store, backfill_wakeup, backfill_workers
 
     # Startup
     logger.info("=" * 80)
@@ -118,7 +202,8 @@ async def lifespan(app: FastAPI):
     logger.info(f"  Storage:     {STORAGE_URL}")
     logger.info(f"  LLM Gateway: {LLM_GATEWAY_URL}")
     logger.info("")
-    logger.info(f"Rate Limiting: Max {MAX_CONCURRENT_INGESTIONS} concurrent ingestions")
+    logger.info(f"Rate Limiting: Max {MAX_CONCURRENT_INGESTIONS} concurrent ingestions "
+                f"({TENANT_MAX_CONCURRENT_INGESTIONS} per tenant, {TENANT_MAX_QUEUED_INGESTIONS} queued per tenant)")
     logger.info("")
     logger.info("Checking dependency health...")
 
@@ -131,9 +216,38 @@ async def lifespan(app: FastAPI):
         timeout=httpx.Timeout(CONNECTION_TIMEOUT)
     )
 
-    # Initialize rate limiter for ingestion requests
+    # Initialize fair admission scheduler for ingestion requests
     import asyncio
-    ingestion_semaphore = asyncio.Semaphore(MAX_CONCURRENT_INGESTIONS)
+    admission_scheduler = FairScheduler(
+        capacity=MAX_CONCURRENT_INGESTIONS,
+        tenant_max_concurrent=TENANT_MAX_CONCURRENT_INGESTIONS,
+        tenant_max_queued=TENANT_MAX_QUEUED_INGESTIONS,
+        weights=TENANT_WEIGHTS,
+        max_queued=ADMISSION_MAX_QUEUED,
+        max_expected_wait_s=ADMISSION_MAX_WAIT_S,
+        retry_after_max_s=ADMISSION_RETRY_AFTER_MAX_S
+    )
+
+    # Durable job queue: requeue jobs interrupted by the last shutdown, then start workers
+    job_store = JobStore(JOBS_DB_PATH)
+    resumed = job_store.requeue_interrupted()
+    job_wakeup = asyncio.Event()
+    job_workers = [asyncio.create_task(job_worker(i)) for i in range(MAX_CONCURRENT_INGESTIONS)]
+    logger.info(f"Job Queue: {JOBS_DB_PATH} ({MAX_CONCURRENT_INGESTIONS} workers, {resumed} interrupted jobs resumed)")
+
+    document_registry = DocumentRegistry(DOCUMENTS_DB_PATH)
+    logger.info(f"Document Registry: {DOCUMENTS_DB_PATH}")
+
+    # Deferred metadata backfill: resume backfills interrupted by the last shutdown
+    backfill_store = MetadataBackfillStore(METADATA_BACKFILL_DB_PATH)
+    resumed = backfill_store.requeue_interrupted()
+    backfill_wakeup = asyncio.Event()
+    backfill_workers = [asyncio.create_task(backfill_worker(i)) for i in range(METADATA_BACKFILL_WORKERS)]
+    logger.info(f"Metadata Backfill: {METADATA_BACKFILL_DB_PATH} ({METADATA_BACKFILL_WORKERS} workers, {resumed} interrupted backfills resumed)")
+
+    if NEAR_DUPLICATE_INDEX_ENABLED:
+        near_duplicate_index = NearDuplicateIndex(NEAR_DUPLICATES_DB_PATH, NEAR_DUPLICATE_NUM_PERM, NEAR_DUPLICATE_BANDS)
+        logger.info(f"Near-Duplicate Index: {NEAR_DUPLICATES_DB_PATH} (default policy {NEAR_DUPLICATE_POLICY}, threshold {NEAR_DUPLICATE_THRESHOLD:g})")
 
     # Quick health check on startup (non-blocking)
     services_to_check = {
@@ -178,7 +292,15 @@ async def lifespan(app: FastAPI):
 
     yield
 
-    # Shutdown
+    # Shutdown (running jobs stay "running" in the store and resume on next start)
+    for worker in job_workers + backfill_workers:
+        worker.cancel()
+    await asyncio.gather(*job_workers, *backfill_workers, return_exceptions=True)
+    job_store.close()
+    backfill_store.close()
+    document_registry.close()
+    if near_duplicate_index:
+        near_duplicate_index.close()
     await http_client.aclose()
     logger.info(f"Shutting down {SERVICE_NAME}")
 
@@ -225,7 +347,7 @@ class IngestDocumentRequest(BaseModel):
     )
 
     # Chunking parameters (passed to Chunking Service)
-    chunking_method: str = Field(default="recursive", description="Chunking method: recursive, markdown, token")
+    chunking_method: str = Field(default="recursive", description="Chunking method: recursive, markdown, token, native, token_native")
     max_chunk_size: int = Field(default=1000, ge=100, le=10000, description="Maximum chunk size in characters")
     chunk_overlap: int = Field(default=300, ge=0, le=1000, description="Overlap between chunks in characters")
     separators: Optional[List[str]] = Field(default=None, description="Custom separators for recursive chunking")
@@ -234,6 +356,11 @@ class IngestDocumentRequest(BaseModel):
 
     # Metadata parameters (passed to Metadata Service via Chunking Service)
     generate_metadata: bool = Field(default=True, description="Generate semantic metadata for chunks")
+    metadata_mode: str = Field(default="basic", description="Metadata extraction mode")
+    metadata_timing: str = Field(
+        default="inline",
+        description="inline (metadata before storing) or deferred (store searchable vectors first, backfill metadata in the background)"
+    )
     keywords_count: str = Field(default="5", description="Number of keywords to extract per chunk (e.g., '5', '5-10')")
     topics_count: str = Field(default="3", description="Number of topics to extract per chunk (e.g., '3', '2-5')")
     questions_count: str = Field(default="3", description="Number of questions to generate per chunk (e.g., '3', '3-5')")
@@ -247,6 +374,33 @@ class IngestDocumentRequest(BaseModel):
     storage_mode: str = Field(default="new_collection", description="Storage mode: none, new_collection, existing")
     create_collection_if_missing: bool = Field(default=True, description="Auto-create collection if it doesn't exist")
 
+    # Exact chunk deduplication (passed to Chunking Service)
+    dedup_scope: str = Field(default="request", description="Reuse metadata/vectors for identical chunks: none, request, collection")
+
+    # Near-duplicate detection (MinHash/LSH against the collection's stored documents)
+    near_duplicate_policy: Optional[str] = Field(
+        default=None,
+        description="off, flag (ingest and report the match), reject (409), link (record a link, don't ingest). Default: NEAR_DUPLICATE_POLICY"
+    )
+    near_duplicate_threshold: Optional[float] = Field(default=None, ge=0.5, le=1.0, description="Estimated Jaccard similarity (default: NEAR_DUPLICATE_THRESHOLD)")
+
+    # Idempotency
+    force: bool = Field(default=False, description="Re-ingest even if this exact version is already stored")
+
+    # Planning
+    dry_run: bool = Field(default=False, description="Only chunk and count: return chunks, tokens, planned model calls and a latency estimate")
+
+    # Oversized documents
+    auto_split: bool = Field(
+        default=False,
+        description="Ingest documents estimated above MAX_CHUNKS_PER_DOCUMENT as linked segment documents "
+                    "(<document_id>__seg000, ...) processed in parallel, instead of rejecting them with 413"
+    )
+
+class IngestUploadRequest(IngestDocumentRequest):
+    """Parameters of a streamed upload (query string and/or multipart form fields); the body is the text"""
+    text: str = Field(default="", description="Not used - the document is the request body")
+
 class IngestDocumentResponse(BaseModel):
     """Response model for document ingestion"""
     success: bool
@@ -257,6 +411,21 @@ class IngestDocumentResponse(BaseModel):
     chunks_inserted: int
     processing_time_ms: float
     stages: Dict[str, Any]
+    queue_wait_ms: float = Field(default=0.0, description="Time spent waiting for an ingestion slot (per-tenant fair queue)")
+    content_hash: Optional[str] = Field(default=None, description="Version hash (text + chunking params + model ids)")
+    unchanged: bool = Field(default=False, description="True if this version was already stored and nothing was reprocessed")
+    near_duplicate: Optional[Dict[str, Any]] = Field(default=None, description="Near-duplicate match: document_id, similarity, policy, action")
+    dry_run: bool = Field(default=False, description="True if nothing was processed beyond chunking (see plan)")
+    plan: Optional[Dict[str, Any]] = Field(default=None, description="dry_run only: chunks, tokens, metadata/embedding calls and estimated latency")
+    segments: Optional[List[Dict[str, Any]]] = Field(default=None, description="auto_split: per-segment document_id, characters, chunks and timing")
+    metadata_backfill: Optional[Dict[str, Any]] = Field(default=None, description="metadata_timing=deferred: backfill status and status_url")
+
+class JobCreatedResponse(BaseModel):
+    """Response model for asynchronous ingestion job submission"""
+    job_id: str
+    status: str
+    document_id: str
+    status_url: str
 
 class CreateCollectionRequest(BaseModel):
     """Request model for creating a new collection"""
@@ -269,13 +438,24 @@ class DeleteCollectionRequest(BaseModel):
     collection_name: str = Field(..., description="Name of the collection to delete")
 
 class UpdateDocumentRequest(BaseModel):
-    """Request model for updating (delete + re-insert) a document"""
+    """Request model for updating a document (incremental: only changed chunks are reprocessed)"""
     text: str = Field(..., description="Updated document text content", min_length=50)
     collection_name: str = Field(..., description="Target collection name")
     tenant_id: str = Field(default="default", description="Tenant ID for multi-tenancy")
     chunking_mode: str = Field(default="comprehensive", description="Chunking mode")
     metadata_mode: str = Field(default="basic", description="Metadata extraction mode")
 
+    # Must match the parameters the document was originally ingested with for chunks to be reused
+    chunking_method: str = Field(default="recursive", description="Chunking method: recursive, markdown, token, native, token_native")
+    max_chunk_size: int = Field(default=1000, ge=100, le=10000, description="Maximum chunk size in characters")
+    chunk_overlap: int = Field(default=300, ge=0, le=1000, description="Overlap between chunks in characters")
+    separators: Optional[List[str]] = Field(default=None, description="Custom separators for recursive chunking")
+    markdown_headers: Optional[List[str]] = Field(default=None, description="Headers to split on for markdown chunking")
+    encoding: str = Field(default="cl100k_base", description="Tokenizer encoding (cl100k_base for GPT-4)")
+    generate_metadata: bool = Field(default=True, description="Generate semantic metadata for new/changed chunks")
+    embedding_model: str = Field(default=DEFAULT_EMBEDDING_MODEL, description="Embedding model (must match stored vectors)")
+    incremental: bool = Field(default=True, description="Reuse unchanged chunks (false = delete everything and re-ingest)")
+
 class DeleteDocumentRequest(BaseModel):
     """Request model for deleting a document"""
     document_id: str = Field(..., description="Document ID to delete")
@@ -365,60 +545,173 @@ async def retry_with_exponential_backoff(
     # Should never reach here, but just in case
     raise last_exception
 
+TOKEN_CHUNKING_METHODS = ("token", "token_native")  # max_chunk_size/chunk_overlap in tokens, not characters
+
+def chunk_stride_chars(chunking_method: str, max_chunk_size: int, chunk_overlap: int) -> int:
+    """Characters each chunk advances through the text (size - overlap, ~4 characters per token)"""
+    chars_per_unit = 4 if chunking_method in TOKEN_CHUNKING_METHODS else 1
+    overlap = min(chunk_overlap, max_chunk_size // 2)  # Chunkers cap overlap to guarantee progress
+    return max((max_chunk_size - overlap) * chars_per_unit, 1)
+
+def estimate_chunk_count(text: str, max_chunk_size: int, chunk_overlap: int,
+                         chunking_method: str = "recursive", markdown_headers: Optional[List[str]] = None) -> int:
+    """
+    Chunk count before chunking: document length / effective chunk stride
+
+    Markdown chunking splits on headers rather than size, so it counts header lines instead.
+    """
+    if chunking_method == "markdown":
+        prefixes = tuple(f"{header} " for header in (markdown_headers or ["#", "##", "###"]))
+        return 1 + sum(1 for line in text.splitlines() if line.startswith(prefixes))
+    return max(1, -(-len(text) // chunk_stride_chars(chunking_method, max_chunk_size, chunk_overlap)))
+
+def estimate_document_chunks(doc: IngestDocumentRequest) -> int:
+    """estimate_chunk_count with the document's chunking parameters"""
+    return estimate_chunk_count(doc.text, doc.max_chunk_size, doc.chunk_overlap, doc.chunking_method, doc.markdown_headers)
+
+def check_chunk_limit(estimated_chunks: int):
+    """Reject a document whose pre-chunk estimate exceeds MAX_CHUNKS_PER_DOCUMENT (413)"""
+    if estimated_chunks > MAX_CHUNKS_PER_DOCUMENT:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Document is estimated at {estimated_chunks} chunks, exceeding limit of {MAX_CHUNKS_PER_DOCUMENT} "
+                   f"- set auto_split=true to ingest it as linked segment documents"
+        )
+
+@asynccontextmanager
+async def admitted(tenant_id: str, cost: float = 1.0, shed: bool = True):
+    """
+    Hold one ingestion slot for tenant_id (per-tenant weighted fair queuing)
+
+    Yields the admission ticket (ticket.wait_ms = time spent queued). Set
+    ticket.chunks once the pipeline has run so Retry-After estimates track
+    the recent per-chunk processing rate.
+
+    Args:
+        tenant_id: Tenant the request belongs to
+        cost: Estimated chunks (see estimate_chunk_count)
+        shed: Reject when the admission queue is over its bounds (False for already-bounded callers)
+
+    Raises:
+        HTTPException: 429 with Retry-After if the request is shed
+    """
+    try:
+        ticket = await admission_scheduler.acquire(tenant_id, cost=cost, shed=shed)
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    failed = True
+    try:
+        yield ticket
+        failed = False
+    finally:
+        admission_scheduler.release(ticket, failed=failed)
+
 # ============================================================================
 # Internal Service Functions
 # ============================================================================
-async def call_chunking_service(request: IngestDocumentRequest) -> Dict[str, Any]:
+def build_orchestration_request(request: IngestDocumentRequest, **overrides) -> Dict[str, Any]:
+    """
+    Translate an ingestion request into a Chunking Orchestrator request
+
+    Keyword overrides replace individual fields (e.g. storage_mode="none"
+    for chunk-only calls).
+    """
+    # Build metadata config
+    metadata_config = {
+        "keywords_count": str(request.keywords_count),
+        "topics_count": str(request.topics_count),
+        "questions_count": str(request.questions_count),
+        "summary_length": request.summary_length
+    }
+
+    # Build full orchestration request
+    orchestration_request = {
+        # Text and document ID
+        "text": request.text,
+        "document_id": request.document_id,
+
+        # Chunking configuration
+        "method": request.chunking_method,
+        "max_chunk_size": request.max_chunk_size,
+        "chunk_overlap": request.chunk_overlap,
+        "separators": request.separators,
+        "markdown_headers": request.markdown_headers,
+        "encoding": request.encoding,
+
+        # Metadata generation
+        "generate_metadata": request.generate_metadata,
+        "metadata_config": metadata_config,
+
+        # Embeddings generation
+        "generate_embeddings": request.generate_embeddings,
+
+        # Storage configuration
+        # Translate user-facing storage_mode to chunking service enum values
+        "storage_mode": "new" if request.storage_mode == "new_collection" else request.storage_mode,
+        "collection_name": request.collection_name,
+        "tenant_id": request.tenant_id,
+        "dedup_scope": request.dedup_scope,
+
+        # Only counts/timings are read back - don't ship chunks and vectors over the wire
+        "response_mode": "summary"
+    }
+    orchestration_request.update(overrides)
+    return orchestration_request
+
+async def call_chunking_service(request: IngestDocumentRequest, **overrides) -> Dict[str, Any]:
     """
     Call internal chunking service with full parameter pass-through
 
     This passes all chunking, metadata, embedding, and storage parameters
     to the Chunking Orchestrator Service which coordinates the full pipeline.
+    Keyword overrides are applied to the orchestration request (e.g. dry_run=True).
     """
     try:
-        # Build metadata config
-        metadata_config = {
-            "keywords_count": str(request.keywords_count),
-            "topics_count": str(request.topics_count),
-            "questions_count": str(request.questions_count),
-            "summary_length": request.summary_length
-        }
+        response = await http_client.post(
+            CHUNKING_URL,
+            json=build_orchestration_request(request, **overrides),
+            timeout=120.0
+        )
+        response.raise_for_status()
+        return response.json()
+    except httpx.HTTPError as e:
+        logger.error(f"Chunking service error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Chunking service error: {str(e)}"
+        )
 
-        # Build full orchestration request
-        orchestration_request = {
-            # Text and document ID
-            "text": request.text,
-            "document_id": request.document_id,
-
-            # Chunking configuration
-            "method": request.chunking_method,
-            "max_chunk_size": request.max_chunk_size,
-            "chunk_overlap": request.chunk_overlap,
-            "separators": request.separators,
-            "markdown_headers": request.markdown_headers,
-            "encoding": request.encoding,
-
-            # Metadata generation
-            "generate_metadata": request.generate_metadata,
-            "metadata_config": metadata_config,
-
-            # Embeddings generation
-            "generate_embeddings": request.generate_embeddings,
-
-            # Storage configuration
-            # Translate user-facing storage_mode to chunking service enum values
-            "storage_mode": "new" if request.storage_mode == "new_collection" else request.storage_mode,
-            "collection_name": request.collection_name,
-            "tenant_id": request.tenant_id
-        }
+async def call_chunking_only(request: IngestDocumentRequest) -> List[Dict[str, Any]]:
+    """
+    Chunk a document without running metadata, embeddings or storage
+
+    Used by pipelines that run the later stages themselves (batch ingestion).
 
+    Returns:
+        List of chunk dicts (text, index, char_count, token_count, ...)
+    """
+    async def _call():
         response = await http_client.post(
             CHUNKING_URL,
-            json=orchestration_request,
+            json=build_orchestration_request(
+                request,
+                generate_metadata=False,
+                generate_embeddings=False,
+                storage_mode="none",
+                response_mode="full"
+            ),
             timeout=120.0
         )
         response.raise_for_status()
         return response.json()
+
+    try:
+        result = await retry_with_exponential_backoff(_call)
+        return result.get("chunks", [])
     except httpx.HTTPError as e:
         logger.error(f"Chunking service error: {e}")
         raise HTTPException(
@@ -699,9 +992,10 @@ async def call_storage_service_insert(
     collection_name: str,
     chunks: List[Dict[str, Any]],
     tenant_id: str = "default",
-    create_collection: bool = True
+    create_collection: bool = True,
+    upsert: bool = False
 ) -> Dict[str, Any]:
-    """Call internal storage service for insertion"""
+    """Call internal storage service for insertion (upsert=True replaces chunks with the same id)"""
     try:
         response = await http_client.post(
             f"{STORAGE_URL}/insert",
@@ -709,7 +1003,9 @@ async def call_storage_service_insert(
                 "collection_name": collection_name,
                 "chunks": chunks,
                 "tenant_id": tenant_id,
-                "create_collection": create_collection
+                "create_collection": create_collection,
+                "upsert": upsert,
+                "vector_encoding": VECTOR_ENCODING  # Encoded vectors; array vectors are accepted alongside
             },
             timeout=120.0
         )
@@ -799,6 +1095,1405 @@ async def call_storage_service_delete_document(
             detail=f"Storage service error: {str(e)}"
         )
 
+async def call_storage_service_query(
+    collection_name: str,
+    filter_expr: str,
+    tenant_id: Optional[str] = None,
+    output_fields: Optional[List[str]] = None,
+    limit: int = 10000
+) -> List[Dict[str, Any]]:
+    """Call internal storage service to fetch stored chunks by filter (sorted by chunk_index)"""
+    async def _call():
+        response = await http_client.post(
+            f"{STORAGE_URL}/query",
+            json={
+                "collection_name": collection_name,
+                "filter": filter_expr,
+                "tenant_id": tenant_id,
+                "output_fields": output_fields,
+                "limit": limit
+            },
+            timeout=60.0
+        )
+        response.raise_for_status()
+        return response.json()
+
+    try:
+        result = await retry_with_exponential_backoff(_call)
+        return result.get("results", [])
+    except httpx.HTTPError as e:
+        logger.error(f"Storage service error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Storage service error: {str(e)}"
+        )
+
+async def call_storage_service_delete_chunks(
+    collection_name: str,
+    chunk_ids: List[str]
+) -> Dict[str, Any]:
+    """Call internal storage service to delete specific chunks by id"""
+    try:
+        response = await http_client.post(
+            f"{STORAGE_URL}/delete",
+            json={
+                "collection_name": collection_name,
+                "filter": f"id in {json.dumps(chunk_ids)}"
+            },
+            timeout=30.0
+        )
+        response.raise_for_status()
+        return response.json()
+    except httpx.HTTPError as e:
+        logger.error(f"Storage service error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Storage service error: {str(e)}"
+        )
+
+async def call_storage_service_update(
+    collection_name: str,
+    updates_by_id: Dict[str, Dict[str, Any]],
+    tenant_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """Call internal storage service to patch fields of specific chunks (different values per chunk id)"""
+    async def _call():
+        response = await http_client.post(
+            f"{STORAGE_URL}/update",
+            json={
+                "collection_name": collection_name,
+                "filter": f"id in {json.dumps(list(updates_by_id))}",
+                "updates_by_id": updates_by_id,
+                "tenant_id": tenant_id
+            },
+            timeout=120.0
+        )
+        response.raise_for_status()
+        return response.json()
+
+    try:
+        return await retry_with_exponential_backoff(_call)
+    except httpx.HTTPError as e:
+        logger.error(f"Storage service error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Storage service error: {str(e)}"
+        )
+
+# ============================================================================
+# Batch Ingestion Helpers (cross-document stage batching)
+# ============================================================================
+METADATA_FIELDS = [
+    "keywords", "topics", "questions", "summary",
+    "semantic_keywords", "entity_relationships", "attributes"
+]
+
+def build_storage_chunk(
+    document_id: str,
+    tenant_id: str,
+    index: int,
+    text: str,
+    token_count: int,
+    dense_vector: Union[List[float], str],
+    metadata: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Build a Storage Service chunk record (same layout as the Chunking Orchestrator)"""
+    metadata = metadata or {}
+    timestamp_now = datetime.now(timezone.utc).isoformat()
+    chunk = {
+        "id": f"{document_id}_chunk_{index:04d}",
+        "document_id": document_id,
+        "chunk_index": index,
+        "text": text,
+        "dense_vector": dense_vector,
+        "tenant_id": tenant_id,
+        "char_count": len(text),
+        "token_count": token_count,
+        "created_at": timestamp_now,
+        "updated_at": timestamp_now
+    }
+    for field in METADATA_FIELDS:
+        chunk[field] = metadata.get(field, "") or ""
+    return chunk
+
+def build_metadata_chunk_request(request: IngestDocumentRequest, chunk_id: str, text: str) -> Dict[str, Any]:
+    """Build one entry of a Metadata Service /batch request"""
+    return {
+        "text": text,
+        "chunk_id": chunk_id,
+        "extraction_mode": "basic",
+        "model": get_metadata_enum_for_model(METADATA_MODEL),
+        "keywords_count": str(request.keywords_count),
+        "topics_count": str(request.topics_count),
+        "questions_count": str(request.questions_count),
+        "summary_length": request.summary_length
+    }
+
+def make_embeddings_flush(model: str):
+    """
+    Create a StageBatcher flush function for one embedding model
+
+    Vectors are returned as the embeddings service sent them (base64 strings
+    under VECTOR_ENCODING) - they only pass through to the storage insert.
+    """
+    async def _flush(texts: List[str]) -> List[Union[List[float], str]]:
+        async def _call():
+            response = await http_client.post(
+                EMBEDDINGS_URL,
+                json={
+                    "input": texts,
+                    "model": model,
+                    "normalize": True,
+                    "encoding_format": VECTOR_ENCODING
+                },
+                timeout=120.0
+            )
+            response.raise_for_status()
+            return response.json()
+
+        result = await retry_with_exponential_backoff(_call)
+        data = sorted(result.get("data", []), key=lambda x: x["index"])
+        if result.get("encoding_format", VECTOR_ENCODING_FLOAT) not in (VECTOR_ENCODING, VECTOR_ENCODING_FLOAT):
+            raise ValueError(f"Embeddings service returned {result['encoding_format']} vectors, expected {VECTOR_ENCODING}")
+        return [item["dense_embedding"] for item in data]
+    return _flush
+
+async def metadata_batch_flush(chunk_requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """StageBatcher flush function for the Metadata Service /batch endpoint"""
+    async def _call():
+        response = await http_client.post(
+            f"{METADATA_URL}/batch",
+            json={"chunks": chunk_requests},
+            timeout=120.0
+        )
+        response.raise_for_status()
+        return response.json()
+
+    result = await retry_with_exponential_backoff(_call)
+    metadata_results = []
+    for item in result.get("results", []):
+        # Failed extractions come back with an "Error: ..." summary - store empty metadata instead
+        if str(item.get("summary", "")).startswith("Error:") and not item.get("keywords"):
+            metadata_results.append({})
+        else:
+            metadata_results.append(item)
+    return metadata_results
+
+async def ingest_document_batched(
+    doc: IngestDocumentRequest,
+    embedding_batchers: Dict[str, StageBatcher],
+    metadata_batcher: StageBatcher,
+    storage_locks: Dict[str, asyncio.Lock]
+) -> Dict[str, Any]:
+    """
+    Run one document of a batch through the pipeline using shared stage batchers
+
+    Chunking is done per document; metadata and embeddings work is handed to
+    batchers shared by every document in the batch; storage is one insert per
+    document once all its chunks are ready. The document holds its tenant's
+    admission slot from chunking through storage.
+    """
+    pipeline_start = time.time()
+    estimated_chunks = estimate_document_chunks(doc)
+    if doc.dry_run or (doc.auto_split and estimated_chunks > MAX_CHUNKS_PER_DOCUMENT):
+        # Plans and segmented documents take the single-document path
+        return (await ingest_document(doc)).model_dump()
+    check_chunk_limit(estimated_chunks)
+    deferred = metadata_deferred(doc)
+
+    content_hash = document_version_hash(doc)
+    unchanged = await find_unchanged_document(doc, content_hash)
+    if unchanged:
+        return unchanged.model_dump()
+    signature, near_duplicate = await screen_near_duplicate(doc)
+    if near_duplicate and near_duplicate["action"] == "linked":
+        return (await link_near_duplicate(doc, signature, near_duplicate, content_hash)).model_dump()
+
+    # The whole per-document pipeline counts against the tenant's admission share
+    async with admitted(doc.tenant_id, cost=estimated_chunks, shed=False) as ticket:
+        # Stage 1: Chunking (per document)
+        chunk_start = time.time()
+        chunks = await call_chunking_only(doc)
+        chunking_time = (time.time() - chunk_start) * 1000
+
+        if not chunks:
+            raise HTTPException(status_code=500, detail="Chunking produced no results")
+        if len(chunks) > MAX_CHUNKS_PER_DOCUMENT:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Document produced {len(chunks)} chunks, exceeding limit of {MAX_CHUNKS_PER_DOCUMENT}"
+            )
+
+        texts = [chunk["text"] for chunk in chunks]
+        storing = doc.storage_mode != "none"
+        if storing and not doc.generate_embeddings:
+            raise HTTPException(status_code=400, detail="Cannot store without embeddings. Set generate_embeddings=true")
+
+        # Stage 2 & 3: Metadata + Embeddings (queued into shared cross-document batches)
+        stage_start = time.time()
+        embedding_futures = []
+        if doc.generate_embeddings:
+            if doc.embedding_model not in embedding_batchers:
+                embedding_batchers[doc.embedding_model] = StageBatcher(
+                    name=f"embeddings[{doc.embedding_model}]",
+                    batch_size=EMBEDDINGS_MAX_BATCH,
+                    flush_fn=make_embeddings_flush(doc.embedding_model),
+                    max_linger_ms=BATCH_LINGER_MS,
+                    max_inflight_batches=BATCH_MAX_INFLIGHT_CALLS
+                )
+            embedding_futures = embedding_batchers[doc.embedding_model].submit(texts)
+
+        metadata_indices = []
+        metadata_futures = []
+        if doc.generate_metadata and not deferred:
+            metadata_indices = [i for i, text in enumerate(texts) if len(text.strip()) >= MIN_METADATA_LENGTH]
+            metadata_futures = metadata_batcher.submit([
+                build_metadata_chunk_request(doc, f"{doc.document_id}_chunk_{i:04d}", texts[i])
+                for i in metadata_indices
+            ])
+
+        embeddings = await asyncio.gather(*embedding_futures) if embedding_futures else []
+        metadata_results = await asyncio.gather(*metadata_futures, return_exceptions=True) if metadata_futures else []
+        stage_time = (time.time() - stage_start) * 1000
+
+        metadata_by_index = {}
+        metadata_failed = 0
+        for i, result in zip(metadata_indices, metadata_results):
+            if isinstance(result, Exception) or not result:
+                metadata_failed += 1
+                continue
+            metadata_by_index[i] = result
+
+        # Stage 4: Storage (one insert per document, serialized per collection)
+        chunks_inserted = 0
+        storage_time = 0.0
+        if storing:
+            storage_chunks = [
+                build_storage_chunk(
+                    document_id=doc.document_id,
+                    tenant_id=doc.tenant_id,
+                    index=i,
+                    text=text,
+                    token_count=chunks[i].get("token_count", 0),
+                    dense_vector=embeddings[i],
+                    metadata=metadata_by_index.get(i)
+                )
+                for i, text in enumerate(texts)
+            ]
+            storage_start = time.time()
+            lock = storage_locks.setdefault(doc.collection_name, asyncio.Lock())
+            async with lock:
+                storage_result = await call_storage_service_insert(
+                    collection_name=doc.collection_name,
+                    chunks=storage_chunks,
+                    tenant_id=doc.tenant_id,
+                    create_collection=doc.create_collection_if_missing
+                )
+            chunks_inserted = storage_result.get("inserted_count", 0)
+            storage_time = (time.time() - storage_start) * 1000
+        ticket.chunks = len(chunks)
+
+    response = IngestDocumentResponse(
+        success=True,
+        document_id=doc.document_id,
+        collection_name=doc.collection_name,
+        tenant_id=doc.tenant_id,
+        chunks_created=len(chunks),
+        chunks_inserted=chunks_inserted,
+        processing_time_ms=(time.time() - pipeline_start) * 1000,
+        queue_wait_ms=ticket.wait_ms,
+        content_hash=content_hash,
+        near_duplicate=near_duplicate,
+        stages={
+            "chunking": {"time_ms": chunking_time, "chunks_created": len(chunks)},
+            "metadata": {
+                "time_ms": stage_time if doc.generate_metadata and not deferred else 0,
+                "generated": doc.generate_metadata and not deferred,
+                "deferred": deferred,
+                "successful": len(metadata_by_index),
+                "failed": metadata_failed,
+                "batched": True
+            },
+            "embeddings": {
+                "time_ms": stage_time if doc.generate_embeddings else 0,
+                "generated": doc.generate_embeddings,
+                "model": doc.embedding_model,
+                "batched": True
+            },
+            "storage": {
+                "time_ms": storage_time,
+                "stored": chunks_inserted > 0,
+                "collection_name": doc.collection_name if storing else None
+            }
+        }
+    )
+    if near_duplicate:
+        response.stages["near_duplicate"] = near_duplicate
+    await register_ingested_document(doc, content_hash, response)
+    await index_near_duplicate_signature(doc, signature, chunks_inserted)
+    if deferred:
+        response.metadata_backfill = await queue_metadata_backfill(doc, chunks_inserted)
+    return response.model_dump()
+
+# ============================================================================
+# Incremental Re-ingestion Helpers
+# ============================================================================
+def chunk_content_hash(text: str) -> str:
+    """Content hash used to match new chunks against stored ones"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def plan_incremental_update(
+    document_id: str,
+    new_texts: List[str],
+    existing: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Diff a document's new chunk set against its stored chunks
+
+    Each new chunk is matched (by content hash) to a stored chunk with the same
+    text, preferring the one already at the same position.
+
+    Returns:
+        Dict with:
+        - unchanged: new indices whose stored chunk is already correct (left untouched)
+        - renumbered: {new index: stored entity} reused with a new chunk_index
+        - reprocess: new indices that need metadata + embeddings
+        - stale_ids: stored chunk ids to delete
+    """
+    by_hash: Dict[str, List[Dict[str, Any]]] = {}
+    for entity in existing:
+        by_hash.setdefault(chunk_content_hash(entity.get("text", "")), []).append(entity)
+
+    unchanged, renumbered, reprocess = [], {}, []
+    keep_ids = set()
+    for i, text in enumerate(new_texts):
+        candidates = by_hash.get(chunk_content_hash(text))
+        if not candidates:
+            reprocess.append(i)
+            continue
+        match = next((e for e in candidates if e.get("chunk_index") == i), candidates[0])
+        candidates.remove(match)
+        if match.get("chunk_index") == i and match.get("id") == f"{document_id}_chunk_{i:04d}":
+            unchanged.append(i)
+            keep_ids.add(match["id"])
+        else:
+            renumbered[i] = match
+
+    stale_ids = [entity["id"] for entity in existing if entity["id"] not in keep_ids]
+    return {"unchanged": unchanged, "renumbered": renumbered, "reprocess": reprocess, "stale_ids": stale_ids}
+
+async def embed_texts(texts: List[str], model: str) -> List[Union[List[float], str]]:
+    """Embed texts in provider-sized batches (bounded parallelism, order preserved)"""
+    flush = make_embeddings_flush(model)
+    batches = [texts[i:i + EMBEDDINGS_MAX_BATCH] for i in range(0, len(texts), EMBEDDINGS_MAX_BATCH)]
+    limiter = asyncio.Semaphore(BATCH_MAX_INFLIGHT_CALLS)
+
+    async def _run(batch: List[str]) -> List[Union[List[float], str]]:
+        async with limiter:
+            return await flush(batch)
+
+    results = await asyncio.gather(*[_run(batch) for batch in batches])
+    return [vector for batch in results for vector in batch]
+
+async def extract_metadata(doc: IngestDocumentRequest, texts_by_index: Dict[int, str]) -> Dict[int, Dict[str, Any]]:
+    """Extract metadata for the given chunks via Metadata Service /batch; returns {chunk_index: metadata}"""
+    indices = [i for i, text in texts_by_index.items() if len(text.strip()) >= MIN_METADATA_LENGTH]
+    batches = [indices[i:i + METADATA_MAX_BATCH] for i in range(0, len(indices), METADATA_MAX_BATCH)]
+    limiter = asyncio.Semaphore(BATCH_MAX_INFLIGHT_CALLS)
+
+    async def _run(batch_indices: List[int]) -> List[Dict[str, Any]]:
+        async with limiter:
+            return await metadata_batch_flush([
+                build_metadata_chunk_request(doc, f"{doc.document_id}_chunk_{i:04d}", texts_by_index[i])
+                for i in batch_indices
+            ])
+
+    results = await asyncio.gather(*[_run(batch) for batch in batches])
+    metadata_by_index = {}
+    for batch_indices, batch_results in zip(batches, results):
+        for i, metadata in zip(batch_indices, batch_results):
+            if metadata:
+                metadata_by_index[i] = metadata
+    return metadata_by_index
+
+async def iter_ndjson_lines(request: Request):
+    """Yield non-empty lines of an NDJSON request body as they arrive"""
+    buffer = b""
+    async for data in request.stream():
+        buffer += data
+        while b"\n" in buffer:
+            line, buffer = buffer.split(b"\n", 1)
+            if line.strip():
+                yield line
+    if buffer.strip():
+        yield buffer
+
+class UploadingStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse that starts while its handler is still reading the request body
+
+    Starlette's StreamingResponse listens for the client disconnect by calling
+    receive() alongside the stream, which would swallow body messages the handler
+    has not read yet. Here the handler's body reader watches for the disconnect
+    instead (see ingest_batch).
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+# ============================================================================
+# Idempotent Ingestion Helpers (content-addressed document versions)
+# ============================================================================
+VERSION_HASH_FIELDS = [
+    "text", "chunking_method", "max_chunk_size", "chunk_overlap", "separators", "markdown_headers", "encoding",
+    "generate_metadata", "keywords_count", "topics_count", "questions_count", "summary_length",
+    "generate_embeddings", "embedding_model"
+]
+
+def document_version(doc: IngestDocumentRequest) -> Dict[str, Any]:
+    """The text, every parameter that shapes the stored chunks, and the model ids"""
+    version = {field: getattr(doc, field) for field in VERSION_HASH_FIELDS}
+    version["metadata_model"] = METADATA_MODEL if doc.generate_metadata else None
+    return version
+
+def document_version_hash(doc: IngestDocumentRequest) -> str:
+    """sha256 of document_version (streamed uploads compute the same hash with StreamedText)"""
+    return hashlib.sha256(json.dumps(document_version(doc), sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+async def find_unchanged_document(doc: IngestDocumentRequest, content_hash: str) -> Optional[IngestDocumentResponse]:
+    """
+    Return the previous result if this exact version is already stored
+
+    The registry entry is only trusted if storage still holds the same number
+    of chunks for the document (it may have been deleted or re-ingested
+    elsewhere); otherwise the entry is dropped and the caller ingests normally.
+    """
+    if doc.force or doc.storage_mode == "none":
+        return None
+
+    check_start = time.time()
+    entry = await asyncio.to_thread(document_registry.get, doc.tenant_id, doc.collection_name, doc.document_id)
+    if entry is None or entry["content_hash"] != content_hash:
+        return None
+
+    try:
+        stored = await call_storage_service_query(
+            collection_name=doc.collection_name,
+            filter_expr=f'document_id == "{doc.document_id}"',
+            tenant_id=doc.tenant_id,
+            output_fields=["id"],
+            limit=entry["chunks_inserted"] + 1
+        )
+    except HTTPException as e:
+        logger.warning(f"Could not verify stored version of {doc.document_id}, re-ingesting: {e.detail}")
+        return None
+
+    if len(stored) != entry["chunks_inserted"]:
+        logger.info(f"Registered version of {doc.document_id} no longer in storage ({len(stored)}/{entry['chunks_inserted']} chunks) - re-ingesting")
+        await asyncio.to_thread(
+            document_registry.forget, doc.collection_name, doc.document_id, tenant_id=doc.tenant_id
+        )
+        return None
+
+    logger.info(f"Document {doc.document_id} unchanged (version {content_hash[:12]}) - skipping ingestion")
+    result = entry["result"]
+    return IngestDocumentResponse(
+        success=True,
+        document_id=doc.document_id,
+        collection_name=doc.collection_name,
+        tenant_id=doc.tenant_id,
+        chunks_created=result.get("chunks_created", entry["chunks_inserted"]),
+        chunks_inserted=entry["chunks_inserted"],
+        processing_time_ms=(time.time() - check_start) * 1000,
+        stages={
+            "idempotency": {
+                "time_ms": (time.time() - check_start) * 1000,
+                "ingested_at": datetime.fromtimestamp(entry["ingested_at"], tz=timezone.utc).isoformat(),
+                "original_processing_time_ms": result.get("processing_time_ms")
+            }
+        },
+        content_hash=content_hash,
+        unchanged=True
+    )
+
+async def register_ingested_document(doc: IngestDocumentRequest, content_hash: str, response: IngestDocumentResponse):
+    """Record the version just stored so an identical re-ingest is skipped"""
+    if doc.storage_mode == "none" or response.chunks_inserted <= 0:
+        return
+    await asyncio.to_thread(
+        document_registry.record,
+        doc.tenant_id, doc.collection_name, doc.document_id, content_hash,
+        response.chunks_inserted, response.model_dump()
+    )
+
+# ============================================================================
+# Oversized Documents (pre-chunk limit check, split into linked segments)
+# ============================================================================
+SEGMENT_BREAKS = ("\n#", "\n\n", "\n", ". ", " ")  # Preferred segment boundaries, best first
+SEGMENT_PLAN_TOTALS = ("chunks", "tokens", "characters", "computed_chunks", "computed_tokens",
+                       "metadata_calls", "embedding_calls", "storage_inserts")
+
+def segment_document_id(document_id: str, segment_index: int) -> str:
+    """Document id of one segment of a split document"""
+    return f"{document_id}__seg{segment_index:03d}"
+
+def split_document_segments(text: str, segment_chars: int) -> List[str]:
+    """
+    Cut text into segments of at most segment_chars
+
+    Each cut is at the last header, paragraph, line, sentence or word break
+    in the second half of the window (character cut if there is none), so
+    segments stay between half and full size. A final segment too short to
+    ingest is merged into the previous one.
+    """
+    segments = []
+    start = 0
+    while len(text) - start > segment_chars:
+        limit = start + segment_chars
+        end = limit
+        for separator in SEGMENT_BREAKS:
+            pos = text.rfind(separator, start + segment_chars // 2, limit)
+            if pos != -1:
+                end = pos + (1 if separator == "\n#" else len(separator))  # Headers start the next segment
+                break
+        segments.append(text[start:end])
+        start = end
+    segments.append(text[start:])
+    if len(segments) > 1 and len(segments[-1].strip()) < MIN_DOCUMENT_LENGTH:
+        tail = segments.pop()
+        segments[-1] += tail
+    return segments
+
+async def link_document_segments(doc: IngestDocumentRequest, segment_ids: List[str]) -> int:
+    """Record a document's segments and delete segments left over from a previous split (returns their count)"""
+    if doc.storage_mode == "none":
+        return 0
+    stale = await asyncio.to_thread(
+        document_registry.replace_segments, doc.tenant_id, doc.collection_name, doc.document_id, segment_ids
+    )
+    for segment_id in stale:
+        await call_storage_service_delete_document(collection_name=doc.collection_name, document_id=segment_id)
+        await forget_document_versions(doc.collection_name, segment_id)
+    if stale:
+        logger.info(f"Deleted {len(stale)} stale segments of {doc.document_id}")
+    return len(stale)
+
+async def ingest_segments(request: IngestDocumentRequest, estimated_chunks: int) -> IngestDocumentResponse:
+    """
+    Ingest an oversized document as linked segment documents
+
+    Segments are sized for SEGMENT_FILL_RATIO x MAX_CHUNKS_PER_DOCUMENT
+    estimated chunks and run through the normal single-document path in
+    parallel (at most the tenant's concurrent ingestion share at once). Each
+    segment is its own idempotent document, so retrying after a partial
+    failure only processes the segments that did not complete.
+
+    Raises:
+        HTTPException 413: more than MAX_SEGMENTS_PER_DOCUMENT segments needed
+        HTTPException: status of the first failed segment, if any failed
+    """
+    split_start = time.time()
+    segment_chars = max(int(len(request.text) * MAX_CHUNKS_PER_DOCUMENT * SEGMENT_FILL_RATIO / estimated_chunks),
+                        MIN_DOCUMENT_LENGTH)
+    texts = split_document_segments(request.text, segment_chars)
+    if len(texts) > MAX_SEGMENTS_PER_DOCUMENT:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Document is estimated at {estimated_chunks} chunks and would need {len(texts)} segments, "
+                   f"exceeding limit of {MAX_SEGMENTS_PER_DOCUMENT}"
+        )
+    segment_requests = [
+        request.model_copy(update={"text": text, "document_id": segment_document_id(request.document_id, index), "auto_split": False})
+        for index, text in enumerate(texts)
+    ]
+    split_time = (time.time() - split_start) * 1000
+    logger.info(f"Splitting {request.document_id} (~{estimated_chunks} chunks) into {len(texts)} segments of <= {segment_chars} characters")
+
+    parallel = asyncio.Semaphore(admission_scheduler.tenant_max_concurrent)
+
+    async def _run(segment: IngestDocumentRequest) -> IngestDocumentResponse:
+        async with parallel:
+            return await ingest_document(segment)
+
+    results = await asyncio.gather(*(_run(segment) for segment in segment_requests), return_exceptions=True)
+    failures = [(index, e) for index, e in enumerate(results) if isinstance(e, BaseException)]
+    if failures:
+        index, error = failures[0]
+        if not isinstance(error, HTTPException):
+            error = HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Pipeline processing error: {error}")
+        raise HTTPException(
+            status_code=error.status_code,
+            detail=f"{len(failures)} of {len(texts)} segments of {request.document_id} failed "
+                   f"(segment {index}: {error.detail}) - completed segments are skipped on retry",
+            headers=error.headers
+        )
+
+    segments = []
+    for index, (text, result) in enumerate(zip(texts, results)):
+        segment = {
+            "document_id": result.document_id,
+            "segment_index": index,
+            "characters": len(text),
+            "chunks_created": result.chunks_created,
+            "chunks_inserted": result.chunks_inserted,
+            "unchanged": result.unchanged,
+            "processing_time_ms": round(result.processing_time_ms, 1)
+        }
+        if result.near_duplicate:
+            segment["near_duplicate"] = result.near_duplicate
+        if result.metadata_backfill:
+            segment["metadata_backfill"] = result.metadata_backfill["status"]
+        if result.plan:
+            segment["plan"] = {key: result.plan.get(key) for key in ("chunks", "computed_chunks", "exceeds_max_chunks", "unchanged", "estimate")}
+        segments.append(segment)
+
+    plan = None
+    stale_deleted = 0
+    whole_deleted = 0
+    if request.dry_run:
+        plan = {key: sum(result.plan.get(key, 0) for result in results) for key in SEGMENT_PLAN_TOTALS}
+        plan["estimated_chunks"] = estimated_chunks
+        plan["segments"] = len(texts)
+        plan["exceeds_max_chunks"] = any(result.plan.get("exceeds_max_chunks") for result in results)
+        plan["unchanged"] = all(result.plan.get("unchanged") for result in results)
+    elif request.storage_mode != "none":
+        # Previously stored whole - drop that copy so search does not return the document twice
+        # (mirrors link_document_segments(doc, []) on the whole-document path)
+        whole_result = await call_storage_service_delete_document(
+            collection_name=request.collection_name, document_id=request.document_id
+        )
+        whole_deleted = whole_result.get("deleted_count", 0)
+        await forget_document_versions(request.collection_name, request.document_id, keep_segments=True)
+        stale_deleted = await link_document_segments(request, [segment.document_id for segment in segment_requests])
+
+    return IngestDocumentResponse(
+        success=True,
+        document_id=request.document_id,
+        collection_name=request.collection_name,
+        tenant_id=request.tenant_id,
+        chunks_created=sum(result.chunks_created for result in results),
+        chunks_inserted=sum(result.chunks_inserted for result in results),
+        processing_time_ms=(time.time() - split_start) * 1000,
+        stages={
+            "split": {
+                "time_ms": split_time,
+                "estimated_chunks": estimated_chunks,
+                "segments": len(texts),
+                "segment_max_chars": segment_chars,
+                "stale_segments_deleted": stale_deleted,
+                "whole_document_chunks_deleted": whole_deleted
+            }
+        },
+        queue_wait_ms=max(result.queue_wait_ms for result in results),
+        content_hash=document_version_hash(request),
+        unchanged=all(result.unchanged for result in results),
+        dry_run=request.dry_run,
+        plan=plan,
+        segments=segments,
+        metadata_backfill={"status": "queued", "status_url": backfill_status_url(request)}
+        if any(result.metadata_backfill for result in results) else None
+    )
+
+def orchestration_stages(request: IngestDocumentRequest, orchestration_result: Dict[str, Any],
+                         deferred: bool) -> Dict[str, Any]:
+    """Per-stage timings and outcomes from a Chunking Orchestrator response"""
+    stages = {
+        "chunking": {
+            "time_ms": orchestration_result.get("chunking_time_ms", 0),
+            "chunks_created": orchestration_result.get("total_chunks", 0)
+        },
+        "metadata": {
+            "time_ms": orchestration_result.get("metadata_time_ms", 0),
+            "generated": orchestration_result.get("metadata_generated", False),
+            "deferred": deferred
+        },
+        "embeddings": {
+            "time_ms": orchestration_result.get("embeddings_time_ms", 0),
+            "generated": orchestration_result.get("embeddings_generated", False),
+            "model": request.embedding_model
+        },
+        "storage": {
+            "time_ms": orchestration_result.get("storage_time_ms", 0),
+            "stored": orchestration_result.get("stored_in_milvus", False),
+            "collection_name": orchestration_result.get("collection_name")
+        }
+    }
+    if orchestration_result.get("dedup"):
+        stages["dedup"] = orchestration_result["dedup"]
+    return stages
+
+# ============================================================================
+# Dry-Run Planning (chunk and count only, no model calls)
+# ============================================================================
+async def plan_ingestion(request: IngestDocumentRequest) -> IngestDocumentResponse:
+    """
+    Plan an ingestion without running it
+
+    The orchestrator chunks the document, counts tokens and plans its slices
+    (including exact-duplicate reuse) but calls no model and stores nothing.
+    Latency is estimated from the stage throughput of recent ingestions plus
+    the current expected admission queue wait.
+    """
+    plan_start = time.time()
+    result = await call_chunking_service(request, dry_run=True)
+    return await build_plan_response(
+        request, result, plan_start, estimate_document_chunks(request), document_version_hash(request)
+    )
+
+async def build_plan_response(request: IngestDocumentRequest, result: Dict[str, Any], plan_start: float,
+                              estimated_chunks: int, content_hash: str) -> IngestDocumentResponse:
+    """Turn the orchestrator's dry-run result into the plan response (with a latency estimate)"""
+    plan = dict(result.get("dry_run_plan") or {})
+    if not plan:
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Chunking service returned no dry-run plan")
+
+    estimate = stage_throughput.estimate(plan["chunks"], plan["computed_chunks"])
+    queue_wait = admission_scheduler.expected_wait()
+    estimate["queue_wait_ms"] = round(queue_wait * 1000, 1) if queue_wait is not None else None
+    estimate["max_concurrent_ingestions"] = MAX_CONCURRENT_INGESTIONS
+    estimate["tenant_max_concurrent_ingestions"] = admission_scheduler.tenant_max_concurrent
+    plan["dedup"] = result.get("dedup")
+    plan["estimate"] = estimate
+    plan["estimated_chunks"] = estimated_chunks
+    plan["exceeds_max_chunks"] = plan["chunks"] > MAX_CHUNKS_PER_DOCUMENT
+
+    # A real run would return immediately for an already stored version
+    plan["unchanged"] = await find_unchanged_document(request, content_hash) is not None
+
+    return IngestDocumentResponse(
+        success=True,
+        document_id=request.document_id,
+        collection_name=request.collection_name,
+        tenant_id=request.tenant_id,
+        chunks_created=plan["chunks"],
+        chunks_inserted=0,
+        processing_time_ms=(time.time() - plan_start) * 1000,
+        stages={"chunking": {"time_ms": result.get("chunking_time_ms", 0), "chunks_created": plan["chunks"]}},
+        dry_run=True,
+        plan=plan
+    )
+
+# ============================================================================
+# Near-Duplicate Detection Helpers (MinHash/LSH per tenant/collection)
+# ============================================================================
+NEAR_DUPLICATE_POLICIES = ("off", "flag", "reject", "link")
+
+def near_duplicate_policy(doc: IngestDocumentRequest) -> str:
+    """
+    The document's effective near-duplicate policy
+
+    Raises:
+        HTTPException 400: unknown policy
+    """
+    policy = doc.near_duplicate_policy or NEAR_DUPLICATE_POLICY
+    if policy not in NEAR_DUPLICATE_POLICIES:
+        raise HTTPException(status_code=400, detail=f"near_duplicate_policy must be one of: {', '.join(NEAR_DUPLICATE_POLICIES)}")
+    return policy
+
+async def screen_near_duplicate(doc: IngestDocumentRequest) -> Tuple[Optional[List[int]], Optional[Dict[str, Any]]]:
+    """
+    Compute the document's MinHash signature and apply its near-duplicate policy
+
+    Runs before chunking, so rejected and linked documents cost no pipeline work.
+
+    Returns:
+        (signature, match) - signature is None when the index is disabled or the
+        document isn't stored; match is the most similar stored document above
+        the threshold (None for policy off or no match)
+
+    Raises:
+        HTTPException 409: policy reject and a near-duplicate is stored
+    """
+    policy = near_duplicate_policy(doc)
+    if near_duplicate_index is None or doc.storage_mode == "none":
+        return None, None
+
+    check_start = time.time()
+    signature = await asyncio.to_thread(minhash_signature, doc.text, NEAR_DUPLICATE_NUM_PERM, NEAR_DUPLICATE_SHINGLE_SIZE)
+    if signature is None or policy == "off":
+        return signature, None
+
+    threshold = doc.near_duplicate_threshold or NEAR_DUPLICATE_THRESHOLD
+    match = await asyncio.to_thread(
+        near_duplicate_index.find, doc.tenant_id, doc.collection_name, signature, threshold, doc.document_id
+    )
+    if match is None:
+        return signature, None
+
+    match.update(policy=policy, threshold=threshold, time_ms=round((time.time() - check_start) * 1000, 2))
+    logger.info(f"Document {doc.document_id} is a near-duplicate of {match['document_id']} "
+                f"(estimated Jaccard {match['similarity']:.3f}, policy {policy})")
+    if policy == "reject":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Document {doc.document_id} is a near-duplicate of {match['document_id']} "
+                   f"(estimated Jaccard {match['similarity']:.3f} >= {threshold:g})"
+        )
+    match["action"] = "linked" if policy == "link" else "flagged"
+    return signature, match
+
+async def link_near_duplicate(doc: IngestDocumentRequest, signature: List[int], match: Dict[str, Any],
+                              content_hash: str) -> IngestDocumentResponse:
+    """Record doc as a link to the stored document it duplicates instead of ingesting it"""
+    await asyncio.to_thread(
+        near_duplicate_index.record, doc.tenant_id, doc.collection_name, doc.document_id, signature,
+        match["canonical_document_id"]
+    )
+    return IngestDocumentResponse(
+        success=True,
+        document_id=doc.document_id,
+        collection_name=doc.collection_name,
+        tenant_id=doc.tenant_id,
+        chunks_created=0,
+        chunks_inserted=0,
+        processing_time_ms=match["time_ms"],
+        stages={"near_duplicate": match},
+        content_hash=content_hash,
+        near_duplicate=match
+    )
+
+async def index_near_duplicate_signature(doc: IngestDocumentRequest, signature: Optional[List[int]], chunks_inserted: int):
+    """Add a stored document to the near-duplicate index"""
+    if signature is None or chunks_inserted <= 0:
+        return
+    await asyncio.to_thread(near_duplicate_index.record, doc.tenant_id, doc.collection_name, doc.document_id, signature)
+
+async def forget_document_versions(collection_name: str, document_id: Optional[str] = None,
+                                   keep_segments: bool = False):
+    """
+    Drop a document (or collection) from the version registry, metadata backfills and the near-duplicate index
+
+    keep_segments keeps the document's segment links (only its whole-document entries are dropped)
+    """
+    await asyncio.to_thread(document_registry.forget, collection_name, document_id, keep_segments)
+    await asyncio.to_thread(backfill_store.forget, collection_name, document_id)
+    if near_duplicate_index:
+        await asyncio.to_thread(near_duplicate_index.forget, collection_name, document_id)
+
+# ============================================================================
+# Deferred Metadata Backfill (store vectors first, patch metadata afterwards)
+# ============================================================================
+METADATA_TIMINGS = ("inline", "deferred")
+BACKFILL_PARAM_FIELDS = ("keywords_count", "topics_count", "questions_count", "summary_length")
+
+def metadata_deferred(doc: IngestDocumentRequest) -> bool:
+    """
+    True if the document's metadata is extracted after its chunks are stored
+
+    Raises:
+        HTTPException 400: unknown metadata_timing
+    """
+    if doc.metadata_timing not in METADATA_TIMINGS:
+        raise HTTPException(status_code=400, detail=f"metadata_timing must be one of: {', '.join(METADATA_TIMINGS)}")
+    return doc.metadata_timing == "deferred" and doc.generate_metadata and doc.storage_mode != "none"
+
+def backfill_status_url(doc: IngestDocumentRequest) -> str:
+    """Progress endpoint of a document's metadata backfill"""
+    query = urlencode({"collection_name": doc.collection_name, "tenant_id": doc.tenant_id})
+    return f"/v1/documents/{quote(doc.document_id, safe='')}/metadata-backfill?{query}"
+
+async def queue_metadata_backfill(doc: IngestDocumentRequest, chunks_inserted: int) -> Optional[Dict[str, Any]]:
+    """Queue metadata extraction for a document just stored without it"""
+    if chunks_inserted <= 0:
+        return None
+    params = {field: getattr(doc, field) for field in BACKFILL_PARAM_FIELDS}
+    await asyncio.to_thread(backfill_store.enqueue, doc.tenant_id, doc.collection_name, doc.document_id, params)
+    backfill_wakeup.set()
+    return {"status": "queued", "status_url": backfill_status_url(doc)}
+
+async def run_metadata_backfill(entry: Dict[str, Any]):
+    """
+    Extract metadata for a document's stored chunks and patch it into storage
+
+    Only chunks still missing metadata are processed, in METADATA_BACKFILL_BATCH
+    groups (one storage update each), so a restarted backfill resumes where it
+    stopped. Stops quietly once the entry is re-queued (document re-ingested)
+    or dropped (document deleted).
+    """
+    document_id = entry["document_id"]
+    doc = IngestDocumentRequest.model_construct(
+        document_id=document_id, collection_name=entry["collection_name"], tenant_id=entry["tenant_id"], **entry["params"]
+    )
+    try:
+        stored = await call_storage_service_query(
+            collection_name=doc.collection_name,
+            filter_expr=f'document_id == "{document_id}"',
+            tenant_id=doc.tenant_id,
+            output_fields=["id", "chunk_index", "text", *METADATA_FIELDS]
+        )
+        pending = [
+            chunk for chunk in stored
+            if len(str(chunk.get("text", "")).strip()) >= MIN_METADATA_LENGTH
+            and not any(chunk.get(field) for field in METADATA_FIELDS)
+        ]
+        total, done, failed = len(stored), len(stored) - len(pending), 0
+        logger.info(f"Metadata backfill {document_id}: {len(pending)}/{total} chunks to extract (attempt {entry['attempts']})")
+
+        for start in range(0, len(pending), METADATA_BACKFILL_BATCH):
+            if not await asyncio.to_thread(backfill_store.update_progress, entry, total, done, failed):
+                logger.info(f"Metadata backfill {document_id}: superseded, stopping")
+                return
+            batch = pending[start:start + METADATA_BACKFILL_BATCH]
+            metadata_by_index = await extract_metadata(doc, {chunk["chunk_index"]: chunk["text"] for chunk in batch})
+            updates_by_id = {}
+            for chunk in batch:
+                metadata = metadata_by_index.get(chunk["chunk_index"])
+                if metadata:
+                    updates_by_id[chunk["id"]] = {field: metadata.get(field, "") or "" for field in METADATA_FIELDS}
+            if updates_by_id and await asyncio.to_thread(backfill_store.update_progress, entry, total, done, failed):
+                await call_storage_service_update(doc.collection_name, updates_by_id, doc.tenant_id)
+            done += len(updates_by_id)
+            failed += len(batch) - len(updates_by_id)
+
+        await asyncio.to_thread(backfill_store.update_progress, entry, total, done, failed)
+        await asyncio.to_thread(backfill_store.complete, entry)
+        logger.info(f"Metadata backfill {document_id}: completed ({done}/{total} chunks, {failed} failed)")
+    except asyncio.CancelledError:
+        # Shutdown - the backfill stays "running" and is resumed on restart
+        raise
+    except Exception as e:
+        if isinstance(e, HTTPException):
+            error = str(e.detail)
+            retryable = not (400 <= e.status_code < 500 and e.status_code != 429)
+        else:
+            error = str(e)
+            retryable = True
+        retry = retryable and entry["attempts"] < JOB_MAX_ATTEMPTS
+        logger.error(f"Metadata backfill {document_id}: failed ({error}){' - will retry' if retry else ''}")
+        await asyncio.to_thread(backfill_store.fail, entry, error, retry)
+
+async def backfill_worker(worker_id: int):
+    """Worker loop: claim queued metadata backfills and run them"""
+    while True:
+        entry = await asyncio.to_thread(backfill_store.claim_next)
+        if entry is None:
+            try:
+                await asyncio.wait_for(backfill_wakeup.wait(), timeout=JOB_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            backfill_wakeup.clear()
+            continue
+        await run_metadata_backfill(entry)
+
+# ============================================================================
+# Streamed Uploads (document body piped to the orchestrator as it arrives)
+# ============================================================================
+UPLOAD_LIST_FIELDS = ("separators", "markdown_headers")
+
+def parse_upload_params(query_items: List[Tuple[str, str]], form_fields: Dict[str, List[str]]) -> IngestUploadRequest:
+    """
+    Build the upload parameters from query string items and multipart form fields
+
+    Form fields win over query parameters; separators/markdown_headers may repeat.
+
+    Raises:
+        HTTPException 422: invalid parameters
+    """
+    params: Dict[str, Any] = {}
+    items = list(query_items) + [(name, value) for name, values in form_fields.items() for value in values]
+    for name, value in items:
+        if name in UPLOAD_LIST_FIELDS:
+            params.setdefault(name, []).append(value)
+        else:
+            params[name] = value
+    params.pop("text", None)
+    try:
+        return IngestUploadRequest(**params)
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=e.errors())
+
+async def ingest_streamed_document(doc: IngestUploadRequest, upload: UploadStream,
+                                   content_length: Optional[int]) -> IngestDocumentResponse:
+    """
+    Pipe an uploaded document to the chunking orchestrator and run the full pipeline
+
+    The bytes are forwarded unchanged as they arrive (the orchestrator chunks
+    segments while the upload continues); on the way they are measured for
+    the size limits, the version hash and the near-duplicate signature. Limits
+    that are exceeded abort the upload mid-stream.
+
+    Unlike POST /v1/ingest, the version hash is only known once the document
+    has been processed, so uploads are never skipped as unchanged, and
+    near-duplicates are reported (action "flagged") but not rejected or linked.
+    """
+    if doc.auto_split:
+        raise HTTPException(status_code=400, detail="auto_split is not supported for streamed uploads - use POST /v1/ingest")
+    deferred = metadata_deferred(doc)
+    policy = near_duplicate_policy(doc)
+    stride = chunk_stride_chars(doc.chunking_method, doc.max_chunk_size, doc.chunk_overlap)
+    screening = near_duplicate_index is not None and doc.storage_mode != "none"
+    measured = StreamedText(
+        document_version(doc),
+        MinHashBuilder(NEAR_DUPLICATE_NUM_PERM, NEAR_DUPLICATE_SHINGLE_SIZE) if screening else None
+    )
+    rejection: List[HTTPException] = []
+
+    def _reject(status_code: int, detail: str) -> HTTPException:
+        rejection.append(HTTPException(status_code=status_code, detail=detail))
+        return rejection[0]
+
+    def _check_limits():
+        if measured.characters > MAX_DOCUMENT_SIZE:
+            raise _reject(status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                          f"Document exceeds {MAX_DOCUMENT_SIZE} characters")
+        # Markdown chunk counts depend on header lines; the post-chunking check covers them
+        estimated = -(-measured.characters // stride)
+        if doc.chunking_method != "markdown" and estimated > MAX_CHUNKS_PER_DOCUMENT:
+            raise _reject(status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                          f"Document is estimated at more than {MAX_CHUNKS_PER_DOCUMENT} chunks "
+                          f"- ingest it with POST /v1/ingest and auto_split=true")
+
+    async def _body():
+        try:
+            async for data in upload.iter_bytes():
+                measured.update(data)
+                _check_limits()
+                yield data
+            measured.update(b"", final=True)
+        except UnicodeDecodeError as e:
+            raise _reject(400, f"Document body is not valid UTF-8: {e}")
+        except ValueError as e:
+            raise _reject(400, f"Invalid upload body: {e}")
+        _check_limits()
+        if measured.characters < MIN_DOCUMENT_LENGTH:
+            raise _reject(400, f"Document must be at least {MIN_DOCUMENT_LENGTH} characters")
+
+    orchestration_request = build_orchestration_request(
+        doc, **({"generate_metadata": False} if deferred else {}), **({"dry_run": True} if doc.dry_run else {})
+    )
+    orchestration_request.pop("text")
+    cost = max(1, min(-(-(content_length or 0) // stride), MAX_CHUNKS_PER_DOCUMENT))
+
+    async with admitted(doc.tenant_id, cost=cost) as ticket:
+        logger.info(f"Ingesting streamed document: {doc.document_id} into collection: {doc.collection_name}")
+        pipeline_start = time.time()
+        try:
+            response = await http_client.post(
+                CHUNKING_STREAM_URL,
+                content=_body(),
+                headers={
+                    "Content-Type": "application/octet-stream",
+                    "X-Orchestration-Request": json.dumps(orchestration_request)
+                },
+                timeout=UPLOAD_TIMEOUT
+            )
+            response.raise_for_status()
+            orchestration_result = response.json()
+        except HTTPException:
+            raise
+        except httpx.HTTPStatusError as e:
+            # Orchestrator rejections (invalid parameters, body) are the client's to fix
+            code = e.response.status_code
+            logger.error(f"Chunking service error: {e}")
+            raise HTTPException(
+                status_code=code if 400 <= code < 500 else status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Chunking service error: {e.response.text or str(e)}"
+            )
+        except Exception as e:
+            if rejection:  # Raised by _body() while uploading (possibly wrapped by the HTTP client)
+                raise rejection[0]
+            logger.error(f"Chunking service error: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Chunking service error: {str(e)}"
+            )
+
+        content_hash = measured.content_hash()
+        estimated_chunks = max(1, -(-measured.characters // stride))
+        if doc.dry_run:
+            return await build_plan_response(doc, orchestration_result, pipeline_start, estimated_chunks, content_hash)
+
+        chunks_created = orchestration_result.get("total_chunks", 0)
+        chunks_inserted = orchestration_result.get("collection_name") and chunks_created or 0
+        if chunks_created > MAX_CHUNKS_PER_DOCUMENT:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Document produced {chunks_created} chunks, exceeding limit of {MAX_CHUNKS_PER_DOCUMENT}"
+            )
+        ticket.chunks = chunks_created
+
+        stages = orchestration_stages(doc, orchestration_result, deferred)
+        stages["upload"] = {
+            "bytes": measured.bytes,
+            "characters": measured.characters,
+            "filename": upload.filename,
+            **(orchestration_result.get("stream") or {})
+        }
+
+        # Near-duplicates can only be looked up now that the whole text has been seen
+        signature = measured.signature()
+        near_duplicate = None
+        if screening and signature is not None and policy != "off":
+            threshold = doc.near_duplicate_threshold or NEAR_DUPLICATE_THRESHOLD
+            near_duplicate = await asyncio.to_thread(
+                near_duplicate_index.find, doc.tenant_id, doc.collection_name, signature, threshold, doc.document_id
+            )
+            if near_duplicate:
+                near_duplicate.update(policy=policy, threshold=threshold, action="flagged")
+                stages["near_duplicate"] = near_duplicate
+
+        pipeline_time = (time.time() - pipeline_start) * 1000
+        response = IngestDocumentResponse(
+            success=True,
+            document_id=doc.document_id,
+            collection_name=doc.collection_name,
+            tenant_id=doc.tenant_id,
+            chunks_created=chunks_created,
+            chunks_inserted=chunks_inserted,
+            processing_time_ms=pipeline_time,
+            stages=stages,
+            queue_wait_ms=ticket.wait_ms,
+            content_hash=content_hash,
+            near_duplicate=near_duplicate
+        )
+        logger.info(f"Streamed pipeline complete: {measured.characters} characters, "
+                    f"{chunks_created} chunks created, {chunks_inserted} chunks stored")
+        await register_ingested_document(doc, content_hash, response)
+        await index_near_duplicate_signature(doc, signature, chunks_inserted)
+        await link_document_segments(doc, [])
+        if deferred:
+            response.metadata_backfill = await queue_metadata_backfill(doc, chunks_inserted)
+        stage_throughput.record(stages, chunks_created, pipeline_time)
+        return response
+
+# ============================================================================
+# Durable Ingestion Jobs (stage checkpoints in the job store)
+# ============================================================================
+async def run_job_embeddings_stage(job_id: str, doc: IngestDocumentRequest, texts: List[str]) -> List[Union[List[float], str]]:
+    """Embed all chunks of a job in checkpointed batches (completed batches are skipped on resume)"""
+    batches = [texts[i:i + EMBEDDINGS_MAX_BATCH] for i in range(0, len(texts), EMBEDDINGS_MAX_BATCH)]
+    results: List[Optional[List[List[float]]]] = [
+        await asyncio.to_thread(job_store.load_checkpoint, job_id, f"embeddings_{b}")
+        for b in range(len(batches))
+    ]
+    done = sum(len(batches[b]) for b, r in enumerate(results) if r is not None)
+    stage_start = time.time()
+    await asyncio.to_thread(job_store.update_progress, job_id, "embeddings",
+                            status="running", done=done, total=len(texts))
+
+    flush = make_embeddings_flush(doc.embedding_model)
+    limiter = asyncio.Semaphore(BATCH_MAX_INFLIGHT_CALLS)
+
+    async def _run_batch(b: int):
+        nonlocal done
+        async with limiter:
+            vectors = await flush(batches[b])
+        await asyncio.to_thread(job_store.save_checkpoint, job_id, f"embeddings_{b}", vectors)
+        results[b] = vectors
+        done += len(vectors)
+        await asyncio.to_thread(job_store.update_progress, job_id, "embeddings", done=done)
+
+    await asyncio.gather(*[_run_batch(b) for b, r in enumerate(results) if r is None])
+
+    await asyncio.to_thread(job_store.update_progress, job_id, "embeddings",
+                            status="completed", time_ms=(time.time() - stage_start) * 1000,
+                            model=doc.embedding_model)
+    return [vector for batch in results for vector in batch]
+
+async def run_job_metadata_stage(job_id: str, doc: IngestDocumentRequest, texts: List[str]) -> Dict[int, Dict[str, Any]]:
+    """Extract metadata for a job in checkpointed batches; returns {chunk_index: metadata}"""
+    indices = [i for i, text in enumerate(texts) if len(text.strip()) >= MIN_METADATA_LENGTH]
+    batches = [indices[i:i + METADATA_MAX_BATCH] for i in range(0, len(indices), METADATA_MAX_BATCH)]
+    results: List[Optional[List[Dict[str, Any]]]] = [
+        await asyncio.to_thread(job_store.load_checkpoint, job_id, f"metadata_{b}")
+        for b in range(len(batches))
+    ]
+    done = sum(len(batches[b]) for b, r in enumerate(results) if r is not None)
+    stage_start = time.time()
+    await asyncio.to_thread(job_store.update_progress, job_id, "metadata",
+                            status="running", done=done, total=len(indices),
+                            skipped_short=len(texts) - len(indices))
+
+    limiter = asyncio.Semaphore(BATCH_MAX_INFLIGHT_CALLS)
+
+    async def _run_batch(b: int):
+        nonlocal done
+        requests_batch = [
+            build_metadata_chunk_request(doc, f"{doc.document_id}_chunk_{i:04d}", texts[i])
+            for i in batches[b]
+        ]
+        async with limiter:
+            metadata = await metadata_batch_flush(requests_batch)
+        await asyncio.to_thread(job_store.save_checkpoint, job_id, f"metadata_{b}", metadata)
+        results[b] = metadata
+        done += len(metadata)
+        await asyncio.to_thread(job_store.update_progress, job_id, "metadata", done=done)
+
+    await asyncio.gather(*[_run_batch(b) for b, r in enumerate(results) if r is None])
+
+    metadata_by_index = {}
+    for batch_indices, batch_results in zip(batches, results):
+        for i, metadata in zip(batch_indices, batch_results):
+            if metadata:
+                metadata_by_index[i] = metadata
+
+    await asyncio.to_thread(job_store.update_progress, job_id, "metadata",
+                            status="completed", time_ms=(time.time() - stage_start) * 1000,
+                            successful=len(metadata_by_index), failed=len(indices) - len(metadata_by_index))
+    return metadata_by_index
+
+async def execute_ingestion_job(job: Dict[str, Any], doc: IngestDocumentRequest) -> Dict[str, Any]:
+    """
+    Run (or resume) an ingestion job stage by stage
+
+    Chunking → (Metadata ‖ Embeddings) → Storage. Each stage's output is
+    checkpointed, so a restarted job resumes at the first incomplete stage.
+    """
+    job_id = job["job_id"]
+    pipeline_start = time.time()
+
+    # Stage 1: Chunking
+    chunks = await asyncio.to_thread(job_store.load_checkpoint, job_id, "chunks")
+    if chunks is None:
+        await asyncio.to_thread(job_store.update_progress, job_id, "chunking", status="running")
+        chunk_start = time.time()
+        raw_chunks = await call_chunking_only(doc)
+        if not raw_chunks:
+            raise HTTPException(status_code=500, detail="Chunking produced no results")
+        if len(raw_chunks) > MAX_CHUNKS_PER_DOCUMENT:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Document produced {len(raw_chunks)} chunks, exceeding limit of {MAX_CHUNKS_PER_DOCUMENT}"
+            )
+        chunks = [{"text": c["text"], "token_count": c.get("token_count", 0)} for c in raw_chunks]
+        await asyncio.to_thread(job_store.save_checkpoint, job_id, "chunks", chunks)
+        await asyncio.to_thread(job_store.update_progress, job_id, "chunking",
+                                status="completed", time_ms=(time.time() - chunk_start) * 1000,
+                                chunks_created=len(chunks))
+
+    texts = [chunk["text"] for chunk in chunks]
+    storing = doc.storage_mode != "none"
+    if storing and not doc.generate_embeddings:
+        raise HTTPException(status_code=400, detail="Cannot store without embeddings. Set generate_embeddings=true")
+
+    # Stage 2 & 3: Metadata + Embeddings (parallel, batch-checkpointed)
+    deferred = metadata_deferred(doc)
+
+    async def _no_metadata():
+        await asyncio.to_thread(job_store.update_progress, job_id, "metadata", status="deferred" if deferred else "skipped")
+        return {}
+
+    async def _no_embeddings():
+        await asyncio.to_thread(job_store.update_progress, job_id, "embeddings", status="skipped")
+        return []
+
+    metadata_by_index, embeddings = await asyncio.gather(
+        run_job_metadata_stage(job_id, doc, texts) if doc.generate_metadata and not deferred else _no_metadata(),
+        run_job_embeddings_stage(job_id, doc, texts) if doc.generate_embeddings else _no_embeddings()
+    )
+
+    # Stage 4: Storage
+    chunks_inserted = 0
+    if storing:
+        if job["stages"].get("storage", {}).get("status") == "running":
+            # A previous attempt may have inserted part of the document - clear it before re-inserting
+            await call_storage_service_delete_document(doc.collection_name, doc.document_id)
+
+        await asyncio.to_thread(job_store.update_progress, job_id, "storage", status="running")
+        storage_start = time.time()
+        storage_result = await call_storage_service_insert(
+            collection_name=doc.collection_name,
+            chunks=[
+                build_storage_chunk(
+                    document_id=doc.document_id,
+                    tenant_id=doc.tenant_id,
+                    index=i,
+                    text=text,
+                    token_count=chunks[i].get("token_count", 0),
+                    dense_vector=embeddings[i],
+                    metadata=metadata_by_index.get(i)
+                )
+                for i, text in enumerate(texts)
+            ],
+            tenant_id=doc.tenant_id,
+            create_collection=doc.create_collection_if_missing
+        )
+        chunks_inserted = storage_result.get("inserted_count", 0)
+        await asyncio.to_thread(job_store.update_progress, job_id, "storage",
+                                status="completed", time_ms=(time.time() - storage_start) * 1000,
+                                inserted_count=chunks_inserted, collection_name=doc.collection_name)
+    else:
+        await asyncio.to_thread(job_store.update_progress, job_id, "storage", status="skipped")
+
+    final_job = await asyncio.to_thread(job_store.get, job_id)
+    return IngestDocumentResponse(
+        success=True,
+        document_id=doc.document_id,
+        collection_name=doc.collection_name,
+        tenant_id=doc.tenant_id,
+        chunks_created=len(chunks),
+        chunks_inserted=chunks_inserted,
+        processing_time_ms=(time.time() - pipeline_start) * 1000,
+        stages=final_job["stages"]
+    ).model_dump()
+
+async def run_ingestion_job(job: Dict[str, Any]):
+    """Execute one claimed job and record its outcome"""
+    job_id = job["job_id"]
+    try:
+        doc = IngestDocumentRequest(**await asyncio.to_thread(job_store.get_request, job_id))
+        logger.info(f"Job {job_id}: ingesting {doc.document_id} (attempt {job['attempts']}/{JOB_MAX_ATTEMPTS})")
+        if doc.auto_split and estimate_document_chunks(doc) > MAX_CHUNKS_PER_DOCUMENT:
+            # Segments are idempotent documents, so a retried job skips the ones already stored
+            result = await ingest_document(doc)
+            await asyncio.to_thread(job_store.complete, job_id, result.model_dump())
+            logger.info(f"Job {job_id}: completed as {len(result.segments)} segments ({result.chunks_created} chunks)")
+            return
+        content_hash = document_version_hash(doc)
+        unchanged = await find_unchanged_document(doc, content_hash)
+        if unchanged:
+            await asyncio.to_thread(job_store.complete, job_id, unchanged.model_dump())
+            logger.info(f"Job {job_id}: document unchanged, nothing to do")
+            return
+        signature, near_duplicate = await screen_near_duplicate(doc)
+        if near_duplicate and near_duplicate["action"] == "linked":
+            linked = await link_near_duplicate(doc, signature, near_duplicate, content_hash)
+            await asyncio.to_thread(job_store.complete, job_id, linked.model_dump())
+            logger.info(f"Job {job_id}: linked to near-duplicate {near_duplicate['canonical_document_id']}, nothing to do")
+            return
+        cost = estimate_document_chunks(doc)
+        async with admitted(doc.tenant_id, cost=cost, shed=False) as ticket:
+            result = await execute_ingestion_job(job, doc)
+            ticket.chunks = result["chunks_created"]
+        result["queue_wait_ms"] = ticket.wait_ms
+        result["content_hash"] = content_hash
+        result["near_duplicate"] = near_duplicate
+        await register_ingested_document(doc, content_hash, IngestDocumentResponse(**result))
+        await index_near_duplicate_signature(doc, signature, result["chunks_inserted"])
+        if metadata_deferred(doc):
+            result["metadata_backfill"] = await queue_metadata_backfill(doc, result["chunks_inserted"])
+        await asyncio.to_thread(job_store.complete, job_id, result)
+        logger.info(f"Job {job_id}: completed ({result['chunks_created']} chunks)")
+    except asyncio.CancelledError:
+        # Shutdown - the job stays "running" and is resumed from its checkpoints on restart
+        raise
+    except Exception as e:
+        if isinstance(e, HTTPException):
+            error = str(e.detail)
+            # Client errors will fail again - don't retry them (except 429 rate limiting)
+            retryable = not (400 <= e.status_code < 500 and e.status_code != 429)
+        else:
+            error = str(e)
+            retryable = True
+        retry = retryable and job["attempts"] < JOB_MAX_ATTEMPTS
+        logger.error(f"Job {job_id}: failed ({error}){' - will retry' if retry else ''}")
+        await asyncio.to_thread(job_store.fail, job_id, error, retry)
+
+async def job_worker(worker_id: int):
+    """Worker loop: claim queued jobs from the store and run them"""
+    while True:
+        job = await asyncio.to_thread(job_store.claim_next)
+        if job is None:
+            try:
+                await asyncio.wait_for(job_wakeup.wait(), timeout=JOB_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            job_wakeup.clear()
+            continue
+        await run_ingestion_job(job)
+
 # ============================================================================
 # API Endpoints
 # ============================================================================
@@ -812,6 +2507,11 @@ async def root():
         "endpoints": {
             "health": "/health",
             "ingest": "POST /v1/ingest",
+            "ingest_batch": "POST /v1/ingest/batch (NDJSON)",
+            "ingest_upload": "POST /v1/ingest/upload (streamed body)",
+            "create_job": "POST /v1/jobs",
+            "get_job": "GET /v1/jobs/{job_id}",
+            "admission": "GET /v1/admission",
             "create_collection": "POST /v1/collections",
             "delete_collection": "DELETE /v1/collections/{name}",
             "update_document": "PUT /v1/documents/{doc_id}",
@@ -911,6 +2611,11 @@ async def health_check():
         "response_time_ms": round((time.time() - start_time) * 1000, 2)
     }
 
+@app.get("/v1/admission")
+async def admission_stats():
+    """Per-tenant admission queue state: active slots, queued requests, recent queue wait"""
+    return admission_scheduler.stats()
+
 @app.post("/v1/ingest", response_model=IngestDocumentResponse)
 async def ingest_document(request: IngestDocumentRequest):
     """
@@ -918,10 +2623,46 @@ async def ingest_document(request: IngestDocumentRequest):
 
     Pipeline: Document → Chunking → Metadata → Embeddings → Storage
 
-    Rate Limited: Max {MAX_CONCURRENT_INGESTIONS} concurrent ingestions
+    Idempotent: if storage already holds this exact version of the document
+    (same text, chunking parameters and models), the previous result is
+    returned with unchanged=true and nothing is reprocessed (force=true overrides).
+
+    Rate Limited: Max {MAX_CONCURRENT_INGESTIONS} concurrent ingestions, shared fairly
+    between tenants (TENANT_WEIGHTS); each tenant may hold at most
+    {TENANT_MAX_CONCURRENT_INGESTIONS} slots and queue {TENANT_MAX_QUEUED_INGESTIONS}
+    more before getting HTTP 429. Requests are also shed with 429 + Retry-After
+    once {ADMISSION_MAX_QUEUED} requests are waiting or the expected queue wait
+    exceeds {ADMISSION_MAX_WAIT_S}s.
+
+    Dry run (dry_run=true): only chunk and count - returns the plan (chunks, tokens,
+    metadata/embedding calls) and a latency estimate without calling any model.
+
+    Oversized documents: MAX_CHUNKS_PER_DOCUMENT is checked against a pre-chunk
+    estimate (length / chunk stride) and rejected with 413 before any work, or
+    with auto_split=true ingested in parallel as linked segment documents.
     """
-    # Rate limiting: acquire semaphore (wait if limit reached)
-    async with ingestion_semaphore:
+    estimated_chunks = estimate_document_chunks(request)
+    if request.auto_split and estimated_chunks > MAX_CHUNKS_PER_DOCUMENT:
+        return await ingest_segments(request, estimated_chunks)
+    if request.dry_run:
+        return await plan_ingestion(request)
+    check_chunk_limit(estimated_chunks)
+
+    # Idempotency: this exact version (text + params + models) already stored -> return it
+    content_hash = document_version_hash(request)
+    unchanged = await find_unchanged_document(request, content_hash)
+    if unchanged:
+        return unchanged
+
+    # Near-duplicates: reject or link before any pipeline work (flag ingests and reports the match)
+    signature, near_duplicate = await screen_near_duplicate(request)
+    if near_duplicate and near_duplicate["action"] == "linked":
+        return await link_near_duplicate(request, signature, near_duplicate, content_hash)
+
+    deferred = metadata_deferred(request)
+
+    # Rate limiting: wait for this tenant's fair share of ingestion slots
+    async with admitted(request.tenant_id, cost=estimated_chunks) as ticket:
         logger.info(f"Ingesting document: {request.document_id} into collection: {request.collection_name}")
 
         pipeline_start = time.time()
@@ -939,7 +2680,8 @@ async def ingest_document(request: IngestDocumentRequest):
             logger.info(f"  - Embeddings: generate={request.generate_embeddings}, model={request.embedding_model}")
             logger.info(f"  - Storage: mode={request.storage_mode}, collection={request.collection_name}")
 
-            orchestration_result = await call_chunking_service(request)
+            # Deferred metadata: store searchable vectors now, metadata is backfilled afterwards
+            orchestration_result = await call_chunking_service(request, **({"generate_metadata": False} if deferred else {}))
 
             # Extract results from orchestration
             chunks_created = orchestration_result.get("total_chunks", 0)
@@ -951,34 +2693,18 @@ async def ingest_document(request: IngestDocumentRequest):
                     status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
                     detail=f"Document produced {chunks_created} chunks, exceeding limit of {MAX_CHUNKS_PER_DOCUMENT}"
                 )
+            ticket.chunks = chunks_created
 
             # Extract timing information from orchestration response
-            stages = {
-                "chunking": {
-                    "time_ms": orchestration_result.get("chunking_time_ms", 0),
-                    "chunks_created": chunks_created
-                },
-                "metadata": {
-                    "time_ms": orchestration_result.get("metadata_time_ms", 0),
-                    "generated": orchestration_result.get("metadata_generated", False)
-                },
-                "embeddings": {
-                    "time_ms": orchestration_result.get("embeddings_time_ms", 0),
-                    "generated": orchestration_result.get("embeddings_generated", False),
-                    "model": request.embedding_model
-                },
-                "storage": {
-                    "time_ms": orchestration_result.get("storage_time_ms", 0),
-                    "stored": orchestration_result.get("stored_in_milvus", False),
-                    "collection_name": orchestration_result.get("collection_name")
-                }
-            }
+            stages = orchestration_stages(request, orchestration_result, deferred)
+            if near_duplicate:
+                stages["near_duplicate"] = near_duplicate
 
             logger.info(f"Pipeline complete: {chunks_created} chunks created, {chunks_inserted} chunks stored")
 
             # Return response directly - orchestration service handled everything
             pipeline_time = (time.time() - pipeline_start) * 1000
-            return IngestDocumentResponse(
+            response = IngestDocumentResponse(
                 success=True,
                 document_id=request.document_id,
                 collection_name=request.collection_name,
@@ -986,8 +2712,18 @@ async def ingest_document(request: IngestDocumentRequest):
                 chunks_created=chunks_created,
                 chunks_inserted=chunks_inserted,
                 processing_time_ms=pipeline_time,
-                stages=stages
+                stages=stages,
+                queue_wait_ms=ticket.wait_ms,
+                content_hash=content_hash,
+                near_duplicate=near_duplicate
             )
+            await register_ingested_document(request, content_hash, response)
+            await index_near_duplicate_signature(request, signature, chunks_inserted)
+            await link_document_segments(request, [])  # Previously split - now stored whole
+            if deferred:
+                response.metadata_backfill = await queue_metadata_backfill(request, chunks_inserted)
+            stage_throughput.record(stages, chunks_created, pipeline_time)
+            return response
 
             # OLD CODE BELOW (UNREACHABLE - kept for reference, will be removed in next version)
             # Stage 2 & 3: Metadata Extraction + Embeddings Generation (PARALLEL)
@@ -1121,7 +2857,8 @@ async def ingest_document(request: IngestDocumentRequest):
                 chunks_created=chunks_created,
                 chunks_inserted=chunks_inserted,
                 processing_time_ms=processing_time_ms,
-                stages=stages
+                stages=stages,
+                queue_wait_ms=ticket.wait_ms
             )
 
         except HTTPException:
@@ -1133,6 +2870,205 @@ async def ingest_document(request: IngestDocumentRequest):
                 detail=f"Pipeline processing error: {str(e)}"
             )
 
+@app.post("/v1/ingest/batch")
+async def ingest_batch(request: Request):
+    """
+    Ingest many documents from one NDJSON stream
+
+    Each request line is an IngestDocumentRequest JSON object. The response
+    starts as soon as the first line arrives: documents start processing and
+    their results stream back while the body is still uploading. Chunks from
+    all documents are packed into shared embedding (up to EMBEDDINGS_MAX_BATCH)
+    and metadata (up to METADATA_MAX_BATCH) batches, so provider round-trips
+    scale with the total chunk count rather than the number of documents.
+
+    Response is NDJSON: one result line per document, in completion order,
+    followed by a final {"summary": {...}} line.
+    """
+    batch_start = time.time()
+    results: asyncio.Queue = asyncio.Queue()
+    inflight = asyncio.Semaphore(BATCH_MAX_INFLIGHT_DOCUMENTS)
+    embedding_batchers: Dict[str, StageBatcher] = {}
+    metadata_batcher = StageBatcher(
+        name="metadata",
+        batch_size=METADATA_MAX_BATCH,
+        flush_fn=metadata_batch_flush,
+        max_linger_ms=BATCH_LINGER_MS,
+        max_inflight_batches=BATCH_MAX_INFLIGHT_CALLS
+    )
+    storage_locks: Dict[str, asyncio.Lock] = {}
+    tasks = []
+
+    async def _run(line_no: int, doc: IngestDocumentRequest):
+        try:
+            result = await ingest_document_batched(doc, embedding_batchers, metadata_batcher, storage_locks)
+        except HTTPException as e:
+            result = {"success": False, "document_id": doc.document_id, "status_code": e.status_code, "error": e.detail}
+        except Exception as e:
+            logger.error(f"Batch document {doc.document_id} failed: {e}")
+            result = {"success": False, "document_id": doc.document_id, "status_code": 500, "error": str(e)}
+        finally:
+            inflight.release()
+        result["line"] = line_no
+        await results.put(result)
+
+    lines = iter_ndjson_lines(request)
+    try:
+        first_line = await lines.__anext__()
+    except StopAsyncIteration:
+        raise HTTPException(status_code=400, detail="Empty batch: expected one JSON document per line")
+
+    async def _start(line_no: int, line: bytes):
+        try:
+            doc = IngestDocumentRequest(**json.loads(line))
+        except (json.JSONDecodeError, ValidationError, TypeError) as e:
+            await results.put({"success": False, "line": line_no, "status_code": 422, "error": str(e)})
+            return
+        await inflight.acquire()
+        tasks.append(asyncio.create_task(_run(line_no, doc)))
+
+    async def _read():
+        """
+        Read the rest of the body, starting each document as soon as its line arrives
+
+        Puts the line count on results once the body is read, or None if the
+        client went away (during the upload or while results are streaming).
+        """
+        line_no = 1
+        try:
+            await _start(line_no, first_line)
+            async for line in lines:
+                line_no += 1
+                await _start(line_no, line)
+        except ClientDisconnect:
+            await results.put(None)
+            return
+        except Exception as e:
+            logger.error(f"Batch ingestion: reading the request body failed after {line_no} lines: {e}")
+            await results.put(None)
+            return
+        logger.info(f"Batch ingestion: {len(tasks)} documents queued from {line_no} lines")
+        await results.put(line_no)
+
+        # Body fully read: now the only message left is the disconnect
+        while (await request.receive())["type"] != "http.disconnect":
+            pass
+        await results.put(None)
+
+    reader = asyncio.create_task(_read())
+
+    async def _stream():
+        total_lines = None  # Known once the whole body has been read
+        emitted = 0
+        succeeded = 0
+        chunks_created = 0
+        try:
+            while total_lines is None or emitted < total_lines:
+                result = await results.get()
+                if result is None:
+                    logger.warning(f"Batch ingestion: client disconnected after {emitted} results")
+                    return
+                if isinstance(result, int):
+                    total_lines = result
+                    continue
+                emitted += 1
+                if result.get("success"):
+                    succeeded += 1
+                    chunks_created += result.get("chunks_created", 0)
+                yield json.dumps(result) + "\n"
+
+            await metadata_batcher.close()
+            for batcher in embedding_batchers.values():
+                await batcher.close()
+
+            yield json.dumps({
+                "summary": {
+                    "documents": total_lines,
+                    "succeeded": succeeded,
+                    "failed": total_lines - succeeded,
+                    "chunks_created": chunks_created,
+                    "processing_time_ms": (time.time() - batch_start) * 1000,
+                    "embeddings": {model: b.stats() for model, b in embedding_batchers.items()},
+                    "metadata": metadata_batcher.stats()
+                }
+            }) + "\n"
+        finally:
+            # Done, or the client went away - stop reading and stop any documents still in flight
+            reader.cancel()
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    return UploadingStreamingResponse(_stream(), media_type="application/x-ndjson")
+
+@app.post("/v1/ingest/upload", response_model=IngestDocumentResponse)
+async def ingest_upload(request: Request):
+    """
+    Ingest a document streamed as the request body
+
+    Body: the document as application/octet-stream / text/plain (UTF-8), or
+    as the file part of multipart/form-data. Parameters (same as POST
+    /v1/ingest except text) come from the query string and, for multipart,
+    from form fields sent before the file part.
+
+    The body is never buffered or re-serialized: its bytes are piped to the
+    chunking orchestrator, which chunks the document in segments while the
+    upload is still arriving. Size and chunk limits abort the upload as soon
+    as they are exceeded.
+    """
+    try:
+        upload = UploadStream(request, max_field_bytes=UPLOAD_MAX_FIELD_BYTES)
+        form_fields = await upload.fields()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid upload body: {e}")
+    doc = parse_upload_params(request.query_params.multi_items(), form_fields)
+
+    content_length = request.headers.get("content-length")
+    return await ingest_streamed_document(doc, upload, int(content_length) if content_length and content_length.isdigit() else None)
+
+@app.post("/v1/jobs", response_model=JobCreatedResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_ingestion_job(request: IngestDocumentRequest):
+    """
+    Queue a document for asynchronous ingestion
+
+    Returns immediately with a job id. The job is persisted in the local job
+    store and processed by the worker pool (MAX_CONCURRENT_INGESTIONS workers);
+    it survives restarts and resumes from its last completed stage.
+    Poll GET /v1/jobs/{job_id} for per-stage progress and timings.
+    """
+    if request.dry_run:
+        raise HTTPException(status_code=400, detail="dry_run is not supported for jobs - use POST /v1/ingest")
+    if not request.auto_split:
+        check_chunk_limit(estimate_document_chunks(request))
+    metadata_deferred(request)  # Reject an unknown metadata_timing now rather than in the worker
+    job_id = await asyncio.to_thread(job_store.create, request.model_dump())
+    job_wakeup.set()
+    logger.info(f"Queued job {job_id} for document: {request.document_id}")
+    return JobCreatedResponse(
+        job_id=job_id,
+        status="queued",
+        document_id=request.document_id,
+        status_url=f"/v1/jobs/{job_id}"
+    )
+
+@app.get("/v1/jobs/{job_id}")
+async def get_ingestion_job(job_id: str):
+    """Get job status, per-stage progress/timings and (when completed) the ingestion result"""
+    job = await asyncio.to_thread(job_store.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Job not found: {job_id}")
+    return job
+
+@app.get("/v1/jobs")
+async def list_ingestion_jobs(status_filter: Optional[str] = None, limit: int = 50):
+    """List recent jobs (optionally filtered by status) with queue counts"""
+    jobs = await asyncio.to_thread(job_store.list, status_filter, min(limit, 500))
+    return {
+        "jobs": jobs,
+        "counts": await asyncio.to_thread(job_store.counts),
+        "stages": JOB_STAGES
+    }
+
 @app.post("/v1/collections")
 async def create_collection(request: CreateCollectionRequest):
     """Create a new collection in the vector database"""
@@ -1155,6 +3091,7 @@ async def delete_collection(collection_name: str):
 
     try:
         result = await call_storage_service_delete_collection(collection_name)
+        await forget_document_versions(collection_name)
         return result
     except HTTPException:
         raise
@@ -1162,60 +3099,253 @@ async def delete_collection(collection_name: str):
 @app.put("/v1/documents/{document_id}")
 async def update_document(document_id: str, request: UpdateDocumentRequest):
     """
-    Update a document (delete old + insert new)
+    Update a document incrementally
+
+    The new text is chunked and each chunk's content hash is compared with the
+    chunks already stored for the document:
+    - unchanged chunks at the same position are left untouched
+    - unchanged chunks that moved keep their vectors/metadata and are renumbered
+    - only new or changed chunks go through metadata extraction and embeddings
+    - stored chunks that no longer exist are deleted
 
-    This is a simple update strategy: delete all chunks with the same document_id,
-    then re-ingest the updated document.
+    Set incremental=false for the old behaviour (delete all chunks + full re-ingest).
     """
     logger.info(f"Updating document: {document_id} in collection: {request.collection_name}")
+    update_start = time.time()
+
+    ingest_request = IngestDocumentRequest(
+        text=request.text,
+        document_id=document_id,
+        collection_name=request.collection_name,
+        tenant_id=request.tenant_id,
+        chunking_method=request.chunking_method,
+        max_chunk_size=request.max_chunk_size,
+        chunk_overlap=request.chunk_overlap,
+        separators=request.separators,
+        markdown_headers=request.markdown_headers,
+        encoding=request.encoding,
+        generate_metadata=request.generate_metadata,
+        embedding_model=request.embedding_model,
+        storage_mode="existing",
+        near_duplicate_policy="off"  # Same document_id - the signature is replaced, not screened
+    )
 
-    try:
-        # Step 1: Delete existing document
+    if await asyncio.to_thread(document_registry.segments, request.collection_name, document_id):
+        # Stored as segment documents: re-ingest them (unchanged segments are skipped, stale ones deleted)
+        ingest_request.auto_split = True
+        ingest_result = await ingest_document(ingest_request)
+        return {
+            "success": True,
+            "operation": "update",
+            "incremental": False,
+            "document_id": document_id,
+            "inserted_chunks": ingest_result.chunks_inserted,
+            "segments": ingest_result.segments,
+            "processing_time_ms": ingest_result.processing_time_ms
+        }
+    estimated_chunks = estimate_document_chunks(ingest_request)
+    check_chunk_limit(estimated_chunks)
+
+    if not request.incremental:
+        # Full replace: delete existing document, then re-ingest
         delete_result = await call_storage_service_delete_document(
             collection_name=request.collection_name,
             document_id=document_id
         )
         logger.info(f"Deleted {delete_result.get('deleted_count', 0)} old chunks")
-
-        # Step 2: Re-ingest updated document
-        ingest_request = IngestDocumentRequest(
-            text=request.text,
-            document_id=document_id,
-            collection_name=request.collection_name,
-            tenant_id=request.tenant_id,
-            chunking_mode=request.chunking_mode,
-            metadata_mode=request.metadata_mode,
-            skip_cache=True  # Force fresh processing for updated content
-        )
-
+        await forget_document_versions(request.collection_name, document_id)
         ingest_result = await ingest_document(ingest_request)
 
         return {
             "success": True,
             "operation": "update",
+            "incremental": False,
             "document_id": document_id,
             "deleted_chunks": delete_result.get("deleted_count", 0),
             "inserted_chunks": ingest_result.chunks_inserted,
             "processing_time_ms": ingest_result.processing_time_ms
         }
 
-    except HTTPException:
-        raise
+    async with admitted(request.tenant_id, cost=estimated_chunks) as ticket:
+        # Step 1: Chunk new text and load stored chunks (in parallel)
+        chunk_start = time.time()
+        new_chunks, existing = await asyncio.gather(
+            call_chunking_only(ingest_request),
+            call_storage_service_query(
+                collection_name=request.collection_name,
+                filter_expr=f'document_id == "{document_id}"',
+                tenant_id=request.tenant_id
+            )
+        )
+        chunking_time = (time.time() - chunk_start) * 1000
+        signature, _ = await screen_near_duplicate(ingest_request)
+
+        if not new_chunks:
+            raise HTTPException(status_code=500, detail="Chunking produced no results")
+        if len(new_chunks) > MAX_CHUNKS_PER_DOCUMENT:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Document produced {len(new_chunks)} chunks, exceeding limit of {MAX_CHUNKS_PER_DOCUMENT}"
+            )
+
+        # Step 2: Diff by content hash
+        texts = [chunk["text"] for chunk in new_chunks]
+        plan = plan_incremental_update(document_id, texts, existing)
+        reprocess = plan["reprocess"]
+        logger.info(
+            f"Incremental update {document_id}: {len(plan['unchanged'])} unchanged, "
+            f"{len(plan['renumbered'])} renumbered, {len(reprocess)} new/changed, "
+            f"{len(plan['stale_ids'])} stored chunks to replace"
+        )
+
+        # Step 3: Metadata + embeddings for new/changed chunks only
+        stage_start = time.time()
+        metadata_by_index, vectors = await asyncio.gather(
+            extract_metadata(ingest_request, {i: texts[i] for i in reprocess})
+            if request.generate_metadata else asyncio.sleep(0, result={}),
+            embed_texts([texts[i] for i in reprocess], request.embedding_model)
+        )
+        stage_time = (time.time() - stage_start) * 1000
+
+        # Step 4: Build records for renumbered (reused) and new chunks
+        upserts = []
+        for i, entity in plan["renumbered"].items():
+            chunk = build_storage_chunk(
+                document_id=document_id,
+                tenant_id=request.tenant_id,
+                index=i,
+                text=texts[i],
+                token_count=new_chunks[i].get("token_count", entity.get("token_count", 0)),
+                dense_vector=entity["dense_vector"],
+                metadata={field: entity.get(field, "") for field in METADATA_FIELDS}
+            )
+            chunk["created_at"] = entity.get("created_at", chunk["created_at"])
+            upserts.append(chunk)
+        for i, vector in zip(reprocess, vectors):
+            upserts.append(build_storage_chunk(
+                document_id=document_id,
+                tenant_id=request.tenant_id,
+                index=i,
+                text=texts[i],
+                token_count=new_chunks[i].get("token_count", 0),
+                dense_vector=vector,
+                metadata=metadata_by_index.get(i)
+            ))
+
+        # Step 5: Write the new records, then delete stored chunks that were not rewritten.
+        # Renumbered/changed chunks usually land on an id that is still stored, so they are
+        # upserted in place; if the write fails nothing has been deleted yet.
+        storage_start = time.time()
+        # Stored chunks now mix old and new work - no longer a single content-addressed version
+        # (forgotten first so an interrupted update is never taken for the old version)
+        await asyncio.to_thread(
+            document_registry.forget, request.collection_name, document_id, tenant_id=request.tenant_id
+        )
+        inserted_count = 0
+        if upserts:
+            upserts.sort(key=lambda c: c["chunk_index"])
+            insert_result = await call_storage_service_insert(
+                collection_name=request.collection_name,
+                chunks=upserts,
+                tenant_id=request.tenant_id,
+                create_collection=True,
+                upsert=True
+            )
+            inserted_count = insert_result.get("inserted_count", 0)
+
+        rewritten_ids = {chunk["id"] for chunk in upserts}
+        stale_ids = [chunk_id for chunk_id in plan["stale_ids"] if chunk_id not in rewritten_ids]
+        deleted_count = 0
+        if stale_ids:
+            delete_result = await call_storage_service_delete_chunks(request.collection_name, stale_ids)
+            deleted_count = delete_result.get("deleted_count", 0)
+        storage_time = (time.time() - storage_start) * 1000
+        await index_near_duplicate_signature(ingest_request, signature, len(texts))
+
+    return {
+        "success": True,
+        "operation": "update",
+        "incremental": True,
+        "document_id": document_id,
+        "chunks_total": len(texts),
+        "chunks_unchanged": len(plan["unchanged"]),
+        "chunks_renumbered": len(plan["renumbered"]),
+        "chunks_reprocessed": len(reprocess),
+        "deleted_chunks": deleted_count,
+        "inserted_chunks": inserted_count,
+        "processing_time_ms": (time.time() - update_start) * 1000,
+        "queue_wait_ms": ticket.wait_ms,
+        "stages": {
+            "chunking": {"time_ms": chunking_time, "chunks_created": len(texts), "chunks_stored_before": len(existing)},
+            "metadata_embeddings": {"time_ms": stage_time, "chunks": len(reprocess)},
+            "storage": {"time_ms": storage_time, "deleted": deleted_count, "inserted": inserted_count}
+        }
+    }
 
 @app.delete("/v1/documents/{document_id}")
 async def delete_document(document_id: str, collection_name: str):
-    """Delete a document and all its chunks from a collection"""
+    """Delete a document and all its chunks from a collection (including its segment documents)"""
     logger.info(f"Deleting document: {document_id} from collection: {collection_name}")
 
     try:
+        segment_ids = await asyncio.to_thread(document_registry.segments, collection_name, document_id)
         result = await call_storage_service_delete_document(
             collection_name=collection_name,
             document_id=document_id
         )
+        if segment_ids:
+            deleted = await asyncio.gather(*(
+                call_storage_service_delete_document(collection_name=collection_name, document_id=segment_id)
+                for segment_id in segment_ids
+            ))
+            result["deleted_count"] = result.get("deleted_count", 0) + sum(r.get("deleted_count", 0) for r in deleted)
+            result["segments_deleted"] = len(segment_ids)
+            for segment_id in segment_ids:
+                await forget_document_versions(collection_name, segment_id)
+        await forget_document_versions(collection_name, document_id)
         return result
     except HTTPException:
         raise
 
+@app.get("/v1/documents/{document_id}/metadata-backfill")
+async def get_metadata_backfill(document_id: str, collection_name: str, tenant_id: str = "default"):
+    """
+    Progress of a document's deferred metadata backfill
+
+    For a document ingested as segments (auto_split) the segments' progress is summed.
+    """
+    entry = await asyncio.to_thread(backfill_store.get, tenant_id, collection_name, document_id)
+    if entry is None:
+        segment_ids = await asyncio.to_thread(document_registry.segments, collection_name, document_id)
+        entries = [
+            segment for segment in await asyncio.gather(*(
+                asyncio.to_thread(backfill_store.get, tenant_id, collection_name, segment_id) for segment_id in segment_ids
+            )) if segment
+        ]
+        if not entries:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No metadata backfill for document: {document_id}")
+        statuses = {segment["status"] for segment in entries}
+        entry = {
+            "tenant_id": tenant_id,
+            "collection_name": collection_name,
+            "document_id": document_id,
+            "status": next((s for s in ("failed", "running", "queued") if s in statuses), "completed"),
+            "chunks_total": sum(segment["chunks_total"] for segment in entries),
+            "chunks_done": sum(segment["chunks_done"] for segment in entries),
+            "chunks_failed": sum(segment["chunks_failed"] for segment in entries),
+            "segments": entries
+        }
+    entry["progress"] = round(entry["chunks_done"] / entry["chunks_total"], 4) if entry["chunks_total"] else None
+    return entry
+
+@app.get("/v1/metadata-backfill")
+async def list_metadata_backfills(status_filter: Optional[str] = None, limit: int = 50):
+    """List recent metadata backfills (optionally filtered by status) with queue counts"""
+    return {
+        "backfills": await asyncio.to_thread(backfill_store.list, status_filter, min(limit, 500)),
+        "counts": await asyncio.to_thread(backfill_store.counts)
+    }
+
 # ============================================================================
 # Startup/Shutdown Events (Now handled by lifespan context manager above)
 # ============================================================================
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Deferred metadata backfill queue for the Ingestion Pipeline API v1.0.0
+
+Documents ingested with metadata_timing=deferred are stored (and searchable)
+with empty metadata fields. Each one gets an entry here; background workers
+claim entries, extract metadata for the document's stored chunks and patch
+them in storage, recording per-document progress. Chunks that already have
+metadata are skipped, so an interrupted backfill resumes where it stopped.
+
+Every enqueue bumps the entry's generation: a worker still running an older
+generation (the document was re-ingested meanwhile) stops writing progress.
+"""
+
+import json
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlite_store import SQLiteStore
+
+# Backfill states
+BACKFILL_QUEUED = "queued"
+BACKFILL_RUNNING = "running"
+BACKFILL_COMPLETED = "completed"
+BACKFILL_FAILED = "failed"
+
+
+class MetadataBackfillStore(SQLiteStore):
+    """SQLite queue of per-document metadata backfills with progress"""
+
+    def __init__(self, db_path: str):
+        """
+        Initialize store
+
+        Args:
+            db_path: Path to the SQLite database file (created if missing)
+        """
+        super().__init__(db_path)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS backfills (
+                tenant_id TEXT NOT NULL,
+                collection_name TEXT NOT NULL,
+                document_id TEXT NOT NULL,
+                generation INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                params_json TEXT NOT NULL,
+                chunks_total INTEGER NOT NULL DEFAULT 0,
+                chunks_done INTEGER NOT NULL DEFAULT 0,
+                chunks_failed INTEGER NOT NULL DEFAULT 0,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                PRIMARY KEY (tenant_id, collection_name, document_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_backfills_status ON backfills (status, created_at);
+        """)
+
+    def enqueue(self, tenant_id: str, collection_name: str, document_id: str, params: Dict[str, Any]) -> int:
+        """Queue (or re-queue) a document's backfill with fresh progress; returns its generation"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT generation FROM backfills WHERE tenant_id = ? AND collection_name = ? AND document_id = ?",
+                    (tenant_id, collection_name, document_id)
+                ).fetchone()
+                generation = (row["generation"] + 1) if row else 1
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO backfills (tenant_id, collection_name, document_id, generation, status,"
+                    " params_json, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (tenant_id, collection_name, document_id, generation, BACKFILL_QUEUED,
+                     json.dumps(params), now, now)
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return generation
+
+    def claim_next(self) -> Optional[Dict[str, Any]]:
+        """Atomically move the oldest queued backfill to running and return it (with params)"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT * FROM backfills WHERE status = ? ORDER BY created_at LIMIT 1", (BACKFILL_QUEUED,)
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                self._conn.execute(
+                    "UPDATE backfills SET status = ?, attempts = attempts + 1, updated_at = ?,"
+                    " started_at = COALESCE(started_at, ?)"
+                    " WHERE tenant_id = ? AND collection_name = ? AND document_id = ?",
+                    (BACKFILL_RUNNING, now, now, row["tenant_id"], row["collection_name"], row["document_id"])
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        entry = self._row_to_entry(row)
+        entry["status"] = BACKFILL_RUNNING
+        entry["attempts"] += 1
+        entry["params"] = json.loads(row["params_json"])
+        return entry
+
+    def requeue_interrupted(self) -> int:
+        """Return backfills left running by a previous process to the queue (called at startup)"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE backfills SET status = ?, updated_at = ? WHERE status = ?",
+                (BACKFILL_QUEUED, time.time(), BACKFILL_RUNNING)
+            )
+        return cursor.rowcount
+
+    def _update(self, entry: Dict[str, Any], assignments: str, values: tuple) -> bool:
+        """Apply an UPDATE to entry's row if its generation is still current"""
+        with self._lock:
+            cursor = self._conn.execute(
+                f"UPDATE backfills SET {assignments}, updated_at = ?"
+                " WHERE tenant_id = ? AND collection_name = ? AND document_id = ? AND generation = ?",
+                (*values, time.time(), entry["tenant_id"], entry["collection_name"], entry["document_id"],
+                 entry["generation"])
+            )
+        return cursor.rowcount > 0
+
+    def update_progress(self, entry: Dict[str, Any], chunks_total: int, chunks_done: int, chunks_failed: int) -> bool:
+        """Record progress; False if the entry was re-queued or forgotten meanwhile (stop working on it)"""
+        return self._update(
+            entry, "chunks_total = ?, chunks_done = ?, chunks_failed = ?", (chunks_total, chunks_done, chunks_failed)
+        )
+
+    def complete(self, entry: Dict[str, Any]) -> bool:
+        """Mark a backfill completed"""
+        return self._update(entry, "status = ?, error = NULL, finished_at = ?", (BACKFILL_COMPLETED, time.time()))
+
+    def fail(self, entry: Dict[str, Any], error: str, retry: bool) -> bool:
+        """Record a failure; re-queue the backfill or mark it failed"""
+        return self._update(
+            entry, "status = ?, error = ?, finished_at = ?",
+            (BACKFILL_QUEUED if retry else BACKFILL_FAILED, error, None if retry else time.time())
+        )
+
+    def get(self, tenant_id: str, collection_name: str, document_id: str) -> Optional[Dict[str, Any]]:
+        """Backfill status and progress of a document, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM backfills WHERE tenant_id = ? AND collection_name = ? AND document_id = ?",
+                (tenant_id, collection_name, document_id)
+            ).fetchone()
+        return self._row_to_entry(row) if row else None
+
+    def list(self, status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Most recently queued backfills, optionally filtered by status"""
+        query = "SELECT * FROM backfills"
+        params: tuple = ()
+        if status:
+            query += " WHERE status = ?"
+            params = (status,)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        with self._lock:
+            rows = self._conn.execute(query, params + (limit,)).fetchall()
+        return [self._row_to_entry(row) for row in rows]
+
+    def counts(self) -> Dict[str, int]:
+        """Number of backfills per status"""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) AS n FROM backfills GROUP BY status").fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+    def forget(self, collection_name: str, document_id: Optional[str] = None, tenant_id: Optional[str] = None) -> int:
+        """Drop backfills for one document or a whole collection (of one tenant, or every tenant)"""
+        tenant_clause, tenant_params = ("", ()) if tenant_id is None else (" AND tenant_id = ?", (tenant_id,))
+        with self._lock:
+            if document_id is None:
+                cursor = self._conn.execute(
+                    "DELETE FROM backfills WHERE collection_name = ?" + tenant_clause, (collection_name, *tenant_params)
+                )
+            else:
+                cursor = self._conn.execute(
+                    "DELETE FROM backfills WHERE collection_name = ? AND document_id = ?" + tenant_clause,
+                    (collection_name, document_id, *tenant_params)
+                )
+        return cursor.rowcount
+
+    @staticmethod
+    def _row_to_entry(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "tenant_id": row["tenant_id"],
+            "collection_name": row["collection_name"],
+            "document_id": row["document_id"],
+            "generation": row["generation"],
+            "status": row["status"],
+            "chunks_total": row["chunks_total"],
+            "chunks_done": row["chunks_done"],
+            "chunks_failed": row["chunks_failed"],
+            "attempts": row["attempts"],
+            "error": row["error"],
+            "created_at": row["created_at"],
+            "started_at": row["started_at"],
+            "finished_at": row["finished_at"],
+            "updated_at": row["updated_at"]
+        }
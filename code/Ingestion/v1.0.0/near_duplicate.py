@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate document detection for the Ingestion Pipeline API v1.0.0
+
+MinHash signatures over word shingles, with a local LSH index per
+(tenant_id, collection_name). Slightly edited revisions of a document share
+most shingles, so their signatures agree in most positions; LSH banding finds
+them without comparing against every stored document.
+
+Signatures use one-permutation hashing: each shingle is hashed once, the hash
+picks a bin and the minimum per bin is kept, and empty bins are filled from
+the next non-empty bin (rotation densification). The Jaccard estimate is the
+fraction of equal positions, as with classic k-permutation MinHash, at the
+cost of one hash per shingle instead of num_perm.
+"""
+
+import hashlib
+import re
+import struct
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set
+
+from sqlite_store import SQLiteStore
+
+_WORD = re.compile(r"\w+")
+
+
+def shingle_hashes(text: str, shingle_size: int) -> Set[int]:
+    """64-bit hashes of the lowercase word shingles of text"""
+    words = _WORD.findall(text.lower())
+    if len(words) < shingle_size:
+        grams = [" ".join(words)] if words else []
+    else:
+        grams = (" ".join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1))
+    return {_gram_hash(gram) for gram in grams}
+
+
+def _gram_hash(gram: str) -> int:
+    return int.from_bytes(hashlib.blake2b(gram.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class MinHashBuilder:
+    """
+    One-permutation MinHash built incrementally from text pieces
+
+    Feeding a document in any number of pieces gives the same signature as
+    minhash_signature() on the whole text, so streamed uploads can be
+    fingerprinted without holding the text.
+    """
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 5):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self._bins: List[Optional[int]] = [None] * num_perm
+        self._window: Deque[str] = deque(maxlen=shingle_size)
+        self._words = 0
+        self._partial = ""  # Trailing word that may continue in the next piece
+
+    def update(self, text: str):
+        """Add the next piece of the document"""
+        text = self._partial + text.lower()
+        self._partial = ""
+        for match in _WORD.finditer(text):
+            if match.end() == len(text):
+                self._partial = match.group()
+                break
+            self._add_word(match.group())
+
+    def _add_word(self, word: str):
+        self._window.append(word)
+        self._words += 1
+        if self._words >= self.shingle_size:
+            self._add_gram(" ".join(self._window))
+
+    def _add_gram(self, gram: str):
+        value = _gram_hash(gram)
+        slot, rest = value % self.num_perm, value // self.num_perm
+        if self._bins[slot] is None or rest < self._bins[slot]:
+            self._bins[slot] = rest
+
+    def signature(self) -> Optional[List[int]]:
+        """Signature of everything added so far (None if it has no words)"""
+        if self._partial:
+            self._add_word(self._partial)
+            self._partial = ""
+        if 0 < self._words < self.shingle_size:
+            self._add_gram(" ".join(self._window))  # Short document: one gram of all its words
+        bins = self._bins
+        if all(value is None for value in bins):
+            return None
+
+        # Rotation densification: borrow from the next non-empty bin, offset by the distance
+        offset = (1 << 64) // self.num_perm
+        signature = []
+        for slot in range(self.num_perm):
+            distance = 0
+            while bins[(slot + distance) % self.num_perm] is None:
+                distance += 1
+            signature.append(bins[(slot + distance) % self.num_perm] + distance * offset)
+        return signature
+
+
+def minhash_signature(text: str, num_perm: int = 128, shingle_size: int = 5) -> Optional[List[int]]:
+    """
+    One-permutation MinHash signature of text (None if it has no words)
+
+    Values are < 2**64 so signatures pack as unsigned 64-bit integers.
+    """
+    builder = MinHashBuilder(num_perm, shingle_size)
+    builder.update(text)
+    return builder.signature()
+
+
+def estimated_jaccard(a: List[int], b: List[int]) -> float:
+    """Fraction of signature positions that agree"""
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+class NearDuplicateIndex(SQLiteStore):
+    """SQLite MinHash signatures + LSH band buckets per (tenant, collection)"""
+
+    def __init__(self, db_path: str, num_perm: int = 128, bands: int = 16):
+        """
+        Initialize index
+
+        Args:
+            db_path: Path to the SQLite database file (created if missing)
+            num_perm: Signature length
+            bands: LSH bands (num_perm must be divisible by bands). More bands
+                find candidates at lower similarity; fewer bands, only very close ones.
+        """
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        super().__init__(db_path)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS signatures (
+                tenant_id TEXT NOT NULL,
+                collection_name TEXT NOT NULL,
+                document_id TEXT NOT NULL,
+                signature BLOB NOT NULL,
+                linked_to TEXT,
+                indexed_at REAL NOT NULL,
+                PRIMARY KEY (tenant_id, collection_name, document_id)
+            );
+            CREATE TABLE IF NOT EXISTS lsh_buckets (
+                tenant_id TEXT NOT NULL,
+                collection_name TEXT NOT NULL,
+                band INTEGER NOT NULL,
+                bucket TEXT NOT NULL,
+                document_id TEXT NOT NULL,
+                PRIMARY KEY (tenant_id, collection_name, band, bucket, document_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_lsh_document ON lsh_buckets (collection_name, document_id);
+        """)
+
+    def _buckets(self, signature: List[int]) -> List[str]:
+        return [
+            hashlib.blake2b(
+                struct.pack(f"<{self.rows}Q", *signature[band * self.rows:(band + 1) * self.rows]), digest_size=8
+            ).hexdigest()
+            for band in range(self.bands)
+        ]
+
+    def find(self, tenant_id: str, collection_name: str, signature: List[int],
+             threshold: float, exclude_document_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Most similar indexed document with estimated Jaccard >= threshold, or None
+
+        Returns:
+            {"document_id", "similarity", "canonical_document_id"} - canonical is
+            the stored document a linked match points to (else the match itself)
+        """
+        buckets = self._buckets(signature)
+        with self._lock:
+            candidates = set()
+            for band, bucket in enumerate(buckets):
+                for row in self._conn.execute(
+                    "SELECT document_id FROM lsh_buckets WHERE tenant_id = ? AND collection_name = ? AND band = ? AND bucket = ?",
+                    (tenant_id, collection_name, band, bucket)
+                ):
+                    candidates.add(row["document_id"])
+            candidates.discard(exclude_document_id)
+
+            best = None
+            for document_id in candidates:
+                row = self._conn.execute(
+                    "SELECT signature, linked_to FROM signatures WHERE tenant_id = ? AND collection_name = ? AND document_id = ?",
+                    (tenant_id, collection_name, document_id)
+                ).fetchone()
+                if row is None or len(row["signature"]) != 8 * self.num_perm:
+                    continue  # Indexed with another signature length
+                similarity = estimated_jaccard(signature, list(struct.unpack(f"<{self.num_perm}Q", row["signature"])))
+                if similarity >= threshold and (best is None or similarity > best["similarity"]):
+                    best = {
+                        "document_id": document_id,
+                        "similarity": round(similarity, 4),
+                        "canonical_document_id": row["linked_to"] or document_id
+                    }
+        return best
+
+    def record(self, tenant_id: str, collection_name: str, document_id: str,
+               signature: List[int], linked_to: Optional[str] = None):
+        """Index (or re-index) a document's signature; linked_to marks a document stored only as a link"""
+        buckets = self._buckets(signature)
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute(
+                    "DELETE FROM lsh_buckets WHERE tenant_id = ? AND collection_name = ? AND document_id = ?",
+                    (tenant_id, collection_name, document_id)
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO signatures (tenant_id, collection_name, document_id, signature, linked_to, indexed_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (tenant_id, collection_name, document_id, struct.pack(f"<{self.num_perm}Q", *signature),
+                     linked_to, time.time())
+                )
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO lsh_buckets (tenant_id, collection_name, band, bucket, document_id) VALUES (?, ?, ?, ?, ?)",
+                    [(tenant_id, collection_name, band, bucket, document_id) for band, bucket in enumerate(buckets)]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def links(self, collection_name: str, canonical_document_id: str) -> List[str]:
+        """Documents linked to a stored document instead of being ingested"""
+        with self._lock:
+            return [row["document_id"] for row in self._conn.execute(
+                "SELECT document_id FROM signatures WHERE collection_name = ? AND linked_to = ?",
+                (collection_name, canonical_document_id)
+            )]
+
+    def forget(self, collection_name: str, document_id: Optional[str] = None, tenant_id: Optional[str] = None) -> int:
+        """
+        Drop one document (plus documents linked to it) or a whole collection
+
+        tenant_id limits the drop to one tenant (default: every tenant)
+        """
+        tenant_clause, tenant_params = ("", ()) if tenant_id is None else (" AND tenant_id = ?", (tenant_id,))
+        with self._lock:
+            if document_id is None:
+                self._conn.execute(
+                    "DELETE FROM lsh_buckets WHERE collection_name = ?" + tenant_clause, (collection_name, *tenant_params)
+                )
+                cursor = self._conn.execute(
+                    "DELETE FROM signatures WHERE collection_name = ?" + tenant_clause, (collection_name, *tenant_params)
+                )
+                return cursor.rowcount
+            linked = [row["document_id"] for row in self._conn.execute(
+                "SELECT document_id FROM signatures WHERE collection_name = ? AND linked_to = ?" + tenant_clause,
+                (collection_name, document_id, *tenant_params)
+            )]
+            removed = 0
+            for doc_id in [document_id, *linked]:
+                self._conn.execute(
+                    "DELETE FROM lsh_buckets WHERE collection_name = ? AND document_id = ?" + tenant_clause,
+                    (collection_name, doc_id, *tenant_params)
+                )
+                removed += self._conn.execute(
+                    "DELETE FROM signatures WHERE collection_name = ? AND document_id = ?" + tenant_clause,
+                    (collection_name, doc_id, *tenant_params)
+                ).rowcount
+            return removed
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Local SQLite stores for the Ingestion Pipeline API v1.0.0
+
+Every store keeps one autocommit connection in WAL mode, shared by the
+asyncio tasks that call it through worker threads and guarded by a lock
+(multi-statement writes use explicit BEGIN/COMMIT under that lock).
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Tuple
+
+
+def open_sqlite(db_path: str, timeout: float = 5.0) -> Tuple[sqlite3.Connection, threading.Lock]:
+    """
+    Open (creating if missing) a store's database
+
+    Args:
+        db_path: Path to the SQLite database file (parent directories are created)
+        timeout: Seconds to wait for another process's write lock
+
+    Returns:
+        (connection, lock) - hold the lock for every use of the connection
+    """
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=timeout, check_same_thread=False, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn, threading.Lock()
+
+
+class SQLiteStore:
+    """Base class for a store backed by one SQLite file (self._conn, guarded by self._lock)"""
+
+    def __init__(self, db_path: str, timeout: float = 5.0):
+        self.db_path = db_path
+        self._conn, self._lock = open_sqlite(db_path, timeout=timeout)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
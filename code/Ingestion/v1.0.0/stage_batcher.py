@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Cross-document stage batching for the Ingestion Pipeline API v1.0.0
+
+Packs work items (chunk texts, metadata requests) coming from many documents
+into full provider batches, so the number of downstream round-trips scales
+with the total number of chunks instead of the number of documents.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, List, Optional
+
+
+class StageBatcher:
+    """Collects items from concurrent submitters and flushes them in full batches"""
+
+    def __init__(
+        self,
+        name: str,
+        batch_size: int,
+        flush_fn: Callable[[List[Any]], Awaitable[List[Any]]],
+        max_linger_ms: float = 50.0,
+        max_inflight_batches: int = 4
+    ):
+        """
+        Initialize batcher
+
+        Args:
+            name: Stage name (used in stats/logging)
+            batch_size: Maximum items per downstream call
+            flush_fn: Async callable taking a list of items and returning one result per item
+            max_linger_ms: How long a partial batch may wait for more items before flushing
+            max_inflight_batches: Maximum concurrent downstream calls
+        """
+        self.name = name
+        self.batch_size = batch_size
+        self.flush_fn = flush_fn
+        self.max_linger = max_linger_ms / 1000.0
+        self._semaphore = asyncio.Semaphore(max_inflight_batches)
+        self._pending: List[tuple] = []
+        self._oldest_pending: Optional[float] = None
+        self._flush_tasks: set = set()
+        self._linger_task: Optional[asyncio.Task] = None
+        self._closed = False
+
+        # Stats
+        self.batches_sent = 0
+        self.items_sent = 0
+
+    def submit(self, items: List[Any]) -> List[asyncio.Future]:
+        """
+        Queue items for batching
+
+        Returns:
+            One future per item, resolved with that item's result
+        """
+        if self._closed:
+            raise RuntimeError(f"{self.name} batcher is closed")
+
+        loop = asyncio.get_running_loop()
+        futures = []
+        for item in items:
+            future = loop.create_future()
+            self._pending.append((item, future))
+            futures.append(future)
+
+        if self._pending and self._oldest_pending is None:
+            self._oldest_pending = time.time()
+
+        # Flush every full batch immediately
+        while len(self._pending) >= self.batch_size:
+            self._dispatch(self._pending[:self.batch_size])
+            self._pending = self._pending[self.batch_size:]
+            self._oldest_pending = time.time() if self._pending else None
+
+        # Partial batch: wait up to max_linger for more items
+        if self._pending and (self._linger_task is None or self._linger_task.done()):
+            self._linger_task = asyncio.create_task(self._linger())
+
+        return futures
+
+    async def _linger(self):
+        """Flush a partial batch once it has waited max_linger"""
+        while self._pending:
+            wait = self.max_linger - (time.time() - (self._oldest_pending or time.time()))
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+            self.flush()
+
+    def flush(self):
+        """Dispatch whatever is pending, even if the batch is not full"""
+        if self._pending:
+            self._dispatch(self._pending)
+            self._pending = []
+            self._oldest_pending = None
+
+    def _dispatch(self, batch: List[tuple]):
+        task = asyncio.create_task(self._send(batch))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _send(self, batch: List[tuple]):
+        items = [item for item, _ in batch]
+        async with self._semaphore:
+            try:
+                results = await self.flush_fn(items)
+                if len(results) != len(items):
+                    raise ValueError(
+                        f"{self.name} returned {len(results)} results for {len(items)} items"
+                    )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+        self.batches_sent += 1
+        self.items_sent += len(items)
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def close(self):
+        """Flush remaining items and wait for all in-flight batches"""
+        self._closed = True
+        self.flush()
+        if self._linger_task and not self._linger_task.done():
+            self._linger_task.cancel()
+        if self._flush_tasks:
+            await asyncio.gather(*list(self._flush_tasks), return_exceptions=True)
+
+    def stats(self) -> dict:
+        """Get batching statistics"""
+        return {
+            "batches": self.batches_sent,
+            "items": self.items_sent,
+            "avg_batch_fill": round(self.items_sent / self.batches_sent, 2) if self.batches_sent else 0.0,
+            "batch_size": self.batch_size
+        }
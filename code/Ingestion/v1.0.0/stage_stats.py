@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Observed stage throughput for the Ingestion Pipeline API v1.0.0
+
+Keeps the stage timings of recently completed ingestions and turns them into
+milliseconds per chunk, which the dry-run planner multiplies by a document's
+planned chunk counts to estimate how long a real ingestion would take.
+Metadata and embedding times are divided by the chunks actually computed
+(after exact-duplicate reuse), the other stages by all chunks.
+"""
+
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+STAGES = ("chunking", "metadata", "embeddings", "storage")
+COMPUTED_STAGES = ("metadata", "embeddings")
+
+
+class StageThroughput:
+    """Sliding window of per-stage (time_ms, chunks) samples from completed ingestions"""
+
+    def __init__(self, window: int = 200):
+        """
+        Initialize tracker
+
+        Args:
+            window: Completed ingestions kept per stage
+        """
+        self._samples: Dict[str, Deque[Tuple[float, int]]] = {
+            stage: deque(maxlen=window) for stage in (*STAGES, "total")
+        }
+
+    def record(self, stages: Dict[str, Any], chunks_created: int, processing_time_ms: float):
+        """Add the stage timings of one completed ingestion (response.stages)"""
+        if chunks_created <= 0:
+            return
+        computed = (stages.get("dedup") or {}).get("computed", chunks_created)
+        for stage in STAGES:
+            info = stages.get(stage)
+            if not isinstance(info, dict) or not info.get("time_ms"):
+                continue
+            units = computed if stage in COMPUTED_STAGES else chunks_created
+            if units > 0:
+                self._samples[stage].append((float(info["time_ms"]), units))
+        self._samples["total"].append((processing_time_ms, chunks_created))
+
+    def ms_per_chunk(self, stage: str) -> Optional[float]:
+        """Average milliseconds per chunk over the window (None without samples)"""
+        samples = self._samples[stage]
+        chunks = sum(units for _, units in samples)
+        if not chunks:
+            return None
+        return sum(time_ms for time_ms, _ in samples) / chunks
+
+    def estimate(self, chunks: int, computed_chunks: int) -> Dict[str, Any]:
+        """
+        Estimated milliseconds per stage and in total for a document
+
+        Stages overlap (the orchestrator pipelines metadata ‖ embeddings →
+        storage per slice), so total_ms comes from observed end-to-end time
+        per chunk, not the sum of the stages.
+        """
+        estimate: Dict[str, Any] = {}
+        for stage in STAGES:
+            rate = self.ms_per_chunk(stage)
+            units = computed_chunks if stage in COMPUTED_STAGES else chunks
+            estimate[f"{stage}_ms"] = round(rate * units, 1) if rate is not None else None
+        total_rate = self.ms_per_chunk("total")
+        estimate["total_ms"] = round(total_rate * chunks, 1) if total_rate is not None else None
+        estimate["based_on_ingestions"] = len(self._samples["total"])
+        return estimate
+
+    def stats(self) -> Dict[str, Any]:
+        """Current ms-per-chunk rates"""
+        rates = {}
+        for stage in (*STAGES, "total"):
+            rate = self.ms_per_chunk(stage)
+            rates[stage] = round(rate, 3) if rate is not None else None
+        return {"ms_per_chunk": rates, "samples": len(self._samples["total"])}
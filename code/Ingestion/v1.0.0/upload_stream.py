@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Streamed document uploads for the Ingestion Pipeline API v1.0.0
+
+POST /v1/ingest/upload takes the document as the request body - raw
+(application/octet-stream, text/plain) or as the file part of a
+multipart/form-data body - and pipes its bytes to the chunking orchestrator
+as they arrive. Nothing here holds more than one network read of the
+document: UploadStream yields the document bytes (parsing multipart
+boundaries incrementally), and StreamedText measures the text as it passes
+(character count, version hash, MinHash signature).
+"""
+
+import codecs
+import hashlib
+import json
+import re
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from near_duplicate import MinHashBuilder
+
+_DISPOSITION_PARAM = re.compile(r'(\w+)="([^"]*)"')
+_TEXT_SENTINEL = "\x00streamed-text\x00"
+
+
+class UploadStream:
+    """Document bytes of a raw or multipart/form-data request body, read incrementally"""
+
+    def __init__(self, request, max_field_bytes: int = 65536):
+        """
+        Initialize stream
+
+        Args:
+            request: Starlette request whose body has not been read
+            max_field_bytes: Size limit of each multipart form field / part header block
+
+        Raises:
+            ValueError: multipart content type without a boundary
+        """
+        content_type = request.headers.get("content-type", "")
+        self.multipart = content_type.lower().startswith("multipart/form-data")
+        self.max_field_bytes = max_field_bytes
+        self.filename: Optional[str] = None
+        self._source = request.stream()
+        self._buffer = b""
+        self._fields_read = not self.multipart
+        self._delimiter = b""
+        if self.multipart:
+            boundary = re.search(r'boundary="?([^";]+)"?', content_type)
+            if not boundary:
+                raise ValueError("multipart/form-data body without a boundary")
+            self._delimiter = b"--" + boundary.group(1).encode("latin-1")
+
+    async def _fill(self) -> bool:
+        """Append the next network read to the buffer (False at the end of the body)"""
+        try:
+            self._buffer += await self._source.__anext__()
+        except StopAsyncIteration:
+            return False
+        return True
+
+    async def _read_until(self, marker: bytes) -> bytes:
+        """Consume and return the bytes before marker (the marker is consumed too)"""
+        while True:
+            pos = self._buffer.find(marker)
+            if pos >= 0:
+                data, self._buffer = self._buffer[:pos], self._buffer[pos + len(marker):]
+                return data
+            if len(self._buffer) > self.max_field_bytes + len(marker):
+                raise ValueError(f"multipart part header or field exceeds {self.max_field_bytes} bytes")
+            if not await self._fill():
+                raise ValueError("truncated multipart body")
+
+    async def fields(self) -> Dict[str, List[str]]:
+        """
+        Form fields sent before the file part (empty for raw bodies)
+
+        Leaves the stream at the start of the file content. Parts after the
+        file part are ignored.
+        """
+        if self._fields_read:
+            return {}
+        self._fields_read = True
+
+        fields: Dict[str, List[str]] = {}
+        await self._read_until(self._delimiter)  # Preamble
+        while True:
+            headers = await self._read_until(b"\r\n\r\n")
+            if headers.startswith(b"--"):
+                raise ValueError("multipart body has no file part")
+            disposition = {}
+            for line in headers.decode("utf-8", errors="replace").split("\r\n"):
+                name, _, value = line.partition(":")
+                if name.strip().lower() == "content-disposition":
+                    disposition = dict(_DISPOSITION_PARAM.findall(value))
+            if "filename" in disposition:
+                self.filename = disposition["filename"]
+                return fields
+            value = await self._read_until(b"\r\n" + self._delimiter)
+            fields.setdefault(disposition.get("name", ""), []).append(value.decode("utf-8"))
+
+    async def iter_bytes(self) -> AsyncIterator[bytes]:
+        """Yield the document bytes as they arrive"""
+        if not self.multipart:
+            if self._buffer:
+                yield self._buffer
+                self._buffer = b""
+            async for data in self._source:
+                yield data
+            return
+
+        await self.fields()
+        end = b"\r\n" + self._delimiter
+        keep = len(end) - 1  # Enough to hold a boundary split across reads
+        while True:
+            pos = self._buffer.find(end)
+            if pos >= 0:
+                if pos:
+                    yield self._buffer[:pos]
+                self._buffer = b""
+                return
+            if len(self._buffer) > keep:
+                yield self._buffer[:-keep]
+                self._buffer = self._buffer[-keep:]
+            if not await self._fill():
+                raise ValueError("truncated multipart body (file part not terminated)")
+
+
+class StreamedText:
+    """
+    Measures a UTF-8 document as its bytes stream past
+
+    The version hash equals the hash of json.dumps(version, sort_keys=True,
+    ensure_ascii=False) with the full text as version["text"]: the JSON is
+    split around the text value and each decoded piece is hashed in its
+    escaped form, which is the same byte sequence.
+    """
+
+    def __init__(self, version: Dict[str, Any], signature: Optional[MinHashBuilder] = None):
+        """
+        Initialize measurement
+
+        Args:
+            version: Version fields of the document (see document_version); "text" is replaced
+            signature: MinHash builder fed with the text (None = no signature)
+        """
+        version = dict(version, text=_TEXT_SENTINEL)
+        prefix, suffix = json.dumps(version, sort_keys=True, ensure_ascii=False).split(
+            json.dumps(_TEXT_SENTINEL, ensure_ascii=False)[1:-1]
+        )
+        self._hash = hashlib.sha256(prefix.encode("utf-8"))
+        self._suffix = suffix.encode("utf-8")
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._signature = signature
+        self.bytes = 0
+        self.characters = 0
+
+    def update(self, data: bytes, final: bool = False):
+        """
+        Add the next bytes of the document (final=True once the body has ended)
+
+        Raises:
+            UnicodeDecodeError: the body is not valid UTF-8
+        """
+        self.bytes += len(data)
+        text = self._decoder.decode(data, final=final)
+        if not text:
+            return
+        self.characters += len(text)
+        self._hash.update(json.dumps(text, ensure_ascii=False)[1:-1].encode("utf-8"))
+        if self._signature is not None:
+            self._signature.update(text)
+
+    def content_hash(self) -> str:
+        """Version hash of the complete document (call once, after update(final=True))"""
+        self._hash.update(self._suffix)
+        return self._hash.hexdigest()
+
+    def signature(self) -> Optional[List[int]]:
+        """MinHash signature of the complete document"""
+        return self._signature.signature() if self._signature is not None else None
@@ -0,0 +1,133 @@
+"""
+Shared Vector Codec
+Compact wire encodings for dense embedding vectors between PipeLineServices
+
+A 1024-dim vector as a JSON float array is ~20 KB of text that every hop
+re-parses into Python floats; as base64 little-endian float32 it is ~5.5 KB
+and decodes with one memcpy. Encodings:
+
+    float          - JSON array of numbers (default, unchanged wire format)
+    base64         - base64 of little-endian float32 (lossless for our models,
+                     same as OpenAI's encoding_format="base64")
+    base64_float16 - base64 of little-endian float16 (half again, ~3 significant
+                     digits; lossy, values beyond +-65504 are rejected)
+
+Usage:
+    from vector_codec import encode_vector, decode_vector
+
+    payload = {"dense_vector": encode_vector(vector, "base64")}
+    vector = decode_vector(payload["dense_vector"], "base64")  # List[float]
+"""
+
+import base64
+import binascii
+import struct
+from array import array
+from typing import Any, List, Sequence
+
+VECTOR_ENCODING_FLOAT = "float"
+VECTOR_ENCODING_BASE64 = "base64"
+VECTOR_ENCODING_BASE64_FLOAT16 = "base64_float16"
+
+VECTOR_ENCODINGS = (VECTOR_ENCODING_FLOAT, VECTOR_ENCODING_BASE64, VECTOR_ENCODING_BASE64_FLOAT16)
+
+# Encoding -> (struct format character, numpy dtype, bytes per value)
+_BINARY_FORMATS = {
+    VECTOR_ENCODING_BASE64: ("f", "<f4", 4),
+    VECTOR_ENCODING_BASE64_FLOAT16: ("e", "<f2", 2),
+}
+
+
+def check_encoding(encoding: str) -> str:
+    """Return encoding if supported (raises ValueError otherwise)"""
+    if encoding not in VECTOR_ENCODINGS:
+        raise ValueError(f"Unknown vector encoding '{encoding}' (supported: {', '.join(VECTOR_ENCODINGS)})")
+    return encoding
+
+
+def encode_vector(vector: Sequence[float], encoding: str) -> Any:
+    """
+    Encode a vector for the wire
+
+    Args:
+        vector: List of floats (or 1-d NumPy array)
+        encoding: One of VECTOR_ENCODINGS
+
+    Returns:
+        The vector unchanged as a list for "float", else a base64 string
+
+    Raises:
+        ValueError: Unknown encoding, or a value not representable as float16
+    """
+    check_encoding(encoding)
+    if encoding == VECTOR_ENCODING_FLOAT:
+        return vector.tolist() if hasattr(vector, "tolist") else list(vector)
+
+    char, _, _ = _BINARY_FORMATS[encoding]
+    try:
+        raw = struct.pack(f"<{len(vector)}{char}", *vector)
+    except (OverflowError, struct.error) as e:
+        raise ValueError(f"Vector not representable as {encoding}: {e}")
+    return base64.b64encode(raw).decode("ascii")
+
+
+def _decode_bytes(value: str, encoding: str) -> bytes:
+    """Validated raw bytes of a base64 vector"""
+    try:
+        raw = base64.b64decode(value, validate=True)
+    except (binascii.Error, ValueError) as e:
+        raise ValueError(f"Invalid base64 vector: {e}")
+    size = _BINARY_FORMATS[encoding][2]
+    if not raw:
+        raise ValueError("Empty vector")
+    if len(raw) % size:
+        raise ValueError(f"Vector of {len(raw)} bytes is not a whole number of {encoding} values")
+    return raw
+
+
+def decode_vector(value: Any, encoding: str) -> List[float]:
+    """
+    Decode a wire vector into a list of floats
+
+    Lists pass through unchanged whatever the encoding, so a batch may mix
+    encoded vectors with plain ones (e.g. vectors read back from storage).
+
+    Raises:
+        ValueError: Unknown encoding or malformed value
+    """
+    check_encoding(encoding)
+    if isinstance(value, list):
+        return value
+    if encoding == VECTOR_ENCODING_FLOAT or not isinstance(value, str):
+        raise ValueError(f"Expected a {encoding} vector, got {type(value).__name__}")
+
+    raw = _decode_bytes(value, encoding)
+    if encoding == VECTOR_ENCODING_BASE64:
+        values = array("f")
+        values.frombytes(raw)
+        if struct.pack("=f", 1.0) != struct.pack("<f", 1.0):
+            values.byteswap()  # Big-endian host
+        return values.tolist()
+    return list(struct.unpack(f"<{len(raw) // 2}e", raw))
+
+
+def decode_vector_array(value: Any, encoding: str):
+    """
+    Decode a wire vector straight into a float32 NumPy array (requires numpy)
+
+    Used where vectors go on to a NumPy consumer (pymilvus) without passing
+    through Python floats.
+
+    Raises:
+        ValueError: Unknown encoding or malformed value
+    """
+    import numpy as np
+
+    check_encoding(encoding)
+    if isinstance(value, list):
+        return np.asarray(value, dtype=np.float32)
+    if encoding == VECTOR_ENCODING_FLOAT or not isinstance(value, str):
+        raise ValueError(f"Expected a {encoding} vector, got {type(value).__name__}")
+
+    raw = _decode_bytes(value, encoding)
+    return np.frombuffer(raw, dtype=_BINARY_FORMATS[encoding][1]).astype(np.float32)